@@ -1,46 +1,61 @@
-from datetime import timedelta
-from typing import Dict
+from typing import Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.auth import create_access_token
-from app.config.database import get_db
-from app.crud.users import authenticate_user
-from app.schemas.users import UserLogin
+from app.auth.auth import (
+    create_access_token,
+    create_refresh_token,
+    oauth2_scheme,
+    revoke_token,
+    verify_token,
+)
+from app.config.database import get_async_db
+from app.crud.users import authenticate_user_async, get_user_with_role_async
+from app.schemas.users import TokenRefresh, UserLogin
 
 router = APIRouter()
 
 
+def _issue_tokens(data: Dict) -> Dict[str, str]:
+    return {
+        "access_token": create_access_token(data=data),
+        "refresh_token": create_refresh_token(data=data),
+        "token_type": "bearer",
+    }
+
+
 @router.post(
     "/login",
     response_model=Dict[str, str],
     summary="Authenticate user and return JWT token",
     description="Authenticate the user using their username and password in JSON "
-    "format. Returns a JWT access token if authentication is successful.",
+    "format. Returns a JWT access token and refresh token if authentication is "
+    "successful.",
 )
-def login(payload: UserLogin, db: Session = Depends(get_db)) -> Dict[str, str]:
+async def login(
+    payload: UserLogin, db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, str]:
     """
     Authenticate user using JSON credentials and return a JWT access token.
 
     Args:
         payload (UserLogin): User credentials (username and password).
-        db (Session): Database session.
+        db (AsyncSession): Async database session.
 
     Raises:
         HTTPException: If authentication fails.
 
     Returns:
-        Dict[str, str]: JWT access token and token type.
+        Dict[str, str]: JWT access token, refresh token and token type.
     """
-    user = authenticate_user(db, payload)
+    user = await authenticate_user_async(db, payload)
     if not user:
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
     data = {"sub": user.username, "role": user.role.name, "user_id": user.id}
-    access_token = create_access_token(data=data, expires_delta=timedelta(minutes=30))
-    return {"access_token": access_token, "token_type": "bearer"}
+    return _issue_tokens(data)
 
 
 @router.post(
@@ -50,28 +65,98 @@ def login(payload: UserLogin, db: Session = Depends(get_db)) -> Dict[str, str]:
     description="OAuth2-compatible login endpoint that uses form-encoded credentials "
     "for the Swagger UI. Returns a JWT access token if authentication is successful.",
 )
-def token(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+async def token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Dict[str, str]:
     """
     OAuth2-compatible login endpoint using form-encoded body for Swagger UI.
 
     Args:
         form_data (OAuth2PasswordRequestForm): Form with username and password.
-        db (Session): Database session.
+        db (AsyncSession): Async database session.
 
     Raises:
         HTTPException: If authentication fails.
 
     Returns:
-        Dict[str, str]: JWT access token and token type.
+        Dict[str, str]: JWT access token, refresh token and token type.
     """
-    user = authenticate_user(db, form_data)
+    user = await authenticate_user_async(db, form_data)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
 
     data = {"sub": user.username, "role": user.role.name, "user_id": user.id}
-    access_token = create_access_token(data=data)
-    return {"access_token": access_token, "token_type": "bearer"}
+    return _issue_tokens(data)
+
+
+@router.post(
+    "/refresh",
+    response_model=Dict[str, str],
+    summary="Exchange a refresh token for new tokens",
+    description="Returns a new access token and a new refresh token for the "
+    "user's current username and role. The presented refresh token is revoked, "
+    "so each one can be used only once.",
+)
+async def refresh(
+    payload: TokenRefresh, db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, str]:
+    """
+    Rotate a refresh token into a fresh access/refresh token pair.
+
+    The user is reloaded by the token's `user_id`, so a deleted user cannot
+    refresh and a changed role takes effect on the next refresh. Single use
+    relies on the revocation store, which is shared between API workers only
+    when `TOKEN_REVOCATION_REDIS_URL` is set; without it the app refuses to
+    start with more than one worker.
+
+    Args:
+        payload (TokenRefresh): The refresh token returned at login.
+        db (AsyncSession): Async database session.
+
+    Raises:
+        HTTPException: If the refresh token is invalid, expired or revoked,
+            or its user no longer exists.
+
+    Returns:
+        Dict[str, str]: JWT access token, refresh token and token type.
+    """
+    claims = verify_token(payload.refresh_token, token_type="refresh")
+    revoke_token(payload.refresh_token)
+
+    user_id = claims.get("user_id")
+    user = await get_user_with_role_async(db, user_id) if user_id else None
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
+        )
+
+    data = {"sub": user.username, "role": user.role.name, "user_id": user.id}
+    return _issue_tokens(data)
+
+
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Revoke the current tokens",
+    description="Revokes the bearer access token and, if given, the refresh token.",
+)
+def logout(
+    payload: Optional[TokenRefresh] = None, token: str = Depends(oauth2_scheme)
+) -> None:
+    """
+    Revoke the caller's access token and optional refresh token.
+
+    Args:
+        payload (Optional[TokenRefresh]): Refresh token to revoke as well.
+        token (str): Bearer access token of the request.
+
+    Raises:
+        HTTPException: If a token is invalid.
+    """
+    verify_token(token)
+    revoke_token(token)
+    if payload is not None:
+        revoke_token(payload.refresh_token)
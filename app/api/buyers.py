@@ -1,24 +1,29 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.auth.auth import get_current_user, require_role
 from app.auth.currentuser import CurrentUser
-from app.config.database import get_db
+from app.config.database import LazySessionRoute, get_db
 from app.core.logger import get_logger
+from app.crud.export import ExportFormat, export_response
+from app.crud.filters import filter_query
+from app.crud.pagination import next_cursor
 from app.crud.buyers import (
     create_buyer,
+    export_buyers_stmt,
     get_all_buyers,
     get_buyer,
+    search_buyers,
     soft_delete_buyer,
     update_buyer,
 )
-from app.schemas.buyers import Buyers, BuyersBase
+from app.schemas.buyers import Buyers, BuyersBase, BuyersFilter
 
 logger = get_logger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=LazySessionRoute)
 
 
 @router.get(
@@ -29,18 +34,26 @@ router = APIRouter()
     "Access is restricted to users with 'admin' or 'manager' roles.",
 )
 def fetch_all(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,  # Pagination
     limit: int = 10,  # Pagination
-    # filters: dict = {},  # Optional filters
+    cursor: Optional[str] = None,  # Keyset pagination
+    filters: BuyersFilter = Depends(filter_query(BuyersFilter)),  # Prefix filters
     current_user: CurrentUser = Depends(require_role(["admin", "manager"])),
 ) -> List[Buyers]:
     """
     Get a list of all buyers.
     Access restricted to users with 'admin' or 'manager' roles.
 
+    Pass the `X-Next-Cursor` response header back as `cursor` to fetch the
+    next page by keyset instead of by offset.
+
     Args:
+        response (Response): Outgoing response, used for the cursor header.
         db (Session): Database session.
+        cursor (Optional[str]): Keyset cursor from the previous page.
+        filters (BuyersFilter): Case-insensitive name/contact prefix filters.
         current_user (CurrentUser): Authenticated user with proper role.
 
     Returns:
@@ -48,7 +61,67 @@ def fetch_all(
     """
     logger.info("Fetching all buyers")
 
-    return get_all_buyers(db, skip=skip, limit=limit)
+    buyers = get_all_buyers(db, skip=skip, limit=limit, filters=filters, cursor=cursor)
+    if cursor_header := next_cursor(buyers, limit):
+        response.headers["X-Next-Cursor"] = cursor_header
+    return buyers
+
+
+@router.get(
+    "/search",
+    response_model=List[Buyers],
+    summary="Search buyers",
+    description="Search buyers by partial name or contact, most relevant first. "
+    "Authenticated access required.",
+)
+def search(
+    q: str = Query(..., min_length=2, description="Text to search for."),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> List[Buyers]:
+    """
+    Search buyers by partial name or contact.
+    Authenticated access required.
+
+    Args:
+        q (str): Partial name or contact to match.
+        limit (int): The maximum number of results to return.
+        db (Session): Database session.
+        current_user (CurrentUser): Authenticated user.
+
+    Returns:
+        List[Buyers]: Matching buyers, most relevant first.
+    """
+    logger.info(f"Searching buyers for {q!r}")
+    return search_buyers(db, q, limit)
+
+
+@router.get(
+    "/export",
+    summary="Export buyers",
+    description="Stream all matching buyers as NDJSON or CSV. "
+    "Admin or manager access required.",
+)
+def export(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    filters: BuyersFilter = Depends(filter_query(BuyersFilter)),
+    current_user: CurrentUser = Depends(require_role(["admin", "manager"])),
+):
+    """
+    Stream all matching active buyers as NDJSON (default) or CSV.
+    Admin or manager access required.
+
+    Args:
+        fmt (ExportFormat): "ndjson" or "csv", passed as `format`.
+        filters (BuyersFilter): Name/contact prefix filters.
+        current_user (CurrentUser): Authenticated user.
+
+    Returns:
+        StreamingResponse: The encoded buyers, streamed in batches.
+    """
+    logger.info(f"User {current_user.username} exported buyers as {fmt}")
+    return export_response(export_buyers_stmt(filters), fmt, "buyers")
 
 
 @router.get(
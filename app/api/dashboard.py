@@ -1,26 +1,48 @@
 from typing import Dict
 
 from fastapi import Depends, APIRouter
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config.database import get_db
+from app.config.database import get_async_db
 from app.core.logger import get_logger
-from app.crud.dashboard import total_sales_amount, total_plots_sold, remaining_inventory, monthly_sales_trend, pending_payments, sales_by_agent, revenue_by_location
+from app.crud.dashboard import (
+    dashboard_summary_async,
+    monthly_sales_trend_async,
+    pending_payments_async,
+    remaining_inventory_async,
+    revenue_by_location_async,
+    sales_by_agent_async,
+    total_plots_sold_async,
+    total_sales_amount_async,
+)
+from app.schemas.dashboard import DashboardSummary
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 
+@router.get(
+    "/summary",
+    summary="Get Dashboard Summary",
+    response_model=DashboardSummary,
+)
+async def get_summary(db: AsyncSession = Depends(get_async_db)):
+    """
+    Retrieves every dashboard metric in a single database round trip.
+    """
+    return await dashboard_summary_async(db)
+
+
 @router.get(
     "/total-sales",
     summary="Get Total Sales Amount",
     response_model=Dict[str, float],
 )
-def get_total_sales(db: Session = Depends(get_db)):
+async def get_total_sales(db: AsyncSession = Depends(get_async_db)):
     """
     Retrieves the total sales amount from all transactions.
     """
-    return {"total_sales_amount": total_sales_amount(db)}
+    return {"total_sales_amount": await total_sales_amount_async(db)}
 
 
 @router.get(
@@ -28,11 +50,11 @@ def get_total_sales(db: Session = Depends(get_db)):
     summary="Get Total Plots Sold",
     response_model=Dict[str, int],
 )
-def get_plots_sold(db: Session = Depends(get_db)):
+async def get_plots_sold(db: AsyncSession = Depends(get_async_db)):
     """
     Retrieves the number of plots that have been sold.
     """
-    return {"total_plots_sold": total_plots_sold(db)}
+    return {"total_plots_sold": await total_plots_sold_async(db)}
 
 
 @router.get(
@@ -40,11 +62,11 @@ def get_plots_sold(db: Session = Depends(get_db)):
     summary="Get Remaining Inventory",
     response_model=Dict[str, int],
 )
-def get_inventory(db: Session = Depends(get_db)):
+async def get_inventory(db: AsyncSession = Depends(get_async_db)):
     """
     Retrieves the number of plots remaining in inventory.
     """
-    return {"remaining_inventory": remaining_inventory(db)}
+    return {"remaining_inventory": await remaining_inventory_async(db)}
 
 
 @router.get(
@@ -52,11 +74,11 @@ def get_inventory(db: Session = Depends(get_db)):
     summary="Get Monthly Sales Trend",
     response_model=Dict[str, list],
 )
-def get_sales_trend(db: Session = Depends(get_db)):
+async def get_sales_trend(db: AsyncSession = Depends(get_async_db)):
     """
     Retrieves the monthly trend of sales for analytics.
     """
-    return {"monthly_sales": monthly_sales_trend(db)}
+    return {"monthly_sales": await monthly_sales_trend_async(db)}
 
 
 @router.get(
@@ -64,32 +86,32 @@ def get_sales_trend(db: Session = Depends(get_db)):
     summary="Get Pending Payments",
     response_model=Dict[str, float],
 )
-def get_pending_payments(db: Session = Depends(get_db)):
+async def get_pending_payments(db: AsyncSession = Depends(get_async_db)):
     """
     Retrieves the total amount of payments that are pending.
     """
-    return {"pending_payments": pending_payments(db)}
+    return {"pending_payments": await pending_payments_async(db)}
 
 
 @router.get(
     "/sales-by-agent",
     summary="Get Sales by Agent",
-    response_model=Dict[str, dict],
+    response_model=Dict[str, list],
 )
-def get_sales_by_agent(db: Session = Depends(get_db)):
+async def get_sales_by_agent(db: AsyncSession = Depends(get_async_db)):
     """
     Retrieves the sales performance of each sales agent.
     """
-    return {"sales_by_agent": sales_by_agent(db)}
+    return {"sales_by_agent": await sales_by_agent_async(db)}
 
 
 @router.get(
     "/revenue-by-location",
     summary="Get Revenue by Location",
-    response_model=Dict[str, dict],
+    response_model=Dict[str, list],
 )
-def get_revenue_by_location(db: Session = Depends(get_db)):
+async def get_revenue_by_location(db: AsyncSession = Depends(get_async_db)):
     """
     Retrieves the revenue generated categorized by location.
     """
-    return {"revenue_by_location": revenue_by_location(db)}
+    return {"revenue_by_location": await revenue_by_location_async(db)}
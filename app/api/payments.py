@@ -1,30 +1,42 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.auth.auth import get_current_user, require_role
 from app.auth.currentuser import CurrentUser
-from app.config.database import get_db
+from app.config.database import LazySessionRoute, get_db
 from app.core.logger import get_logger
+from app.crud.export import ExportFormat, export_response
+from app.crud.filters import filter_query
+from app.crud.pagination import next_cursor
 from app.crud.payments import (
     create_payment,
+    export_payments_stmt,
     get_all_payments,
     get_payment,
     read_deleted_payments,
     soft_delete_payments,
     update_payment,
 )
-from app.schemas.payments import PaymentBase, PaymentOut, PaymentUpdate
+from app.schemas.payments import (
+    PaymentBase,
+    PaymentFilter,
+    PaymentOut,
+    PaymentUpdate,
+)
 
 logger = get_logger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=LazySessionRoute)
 
 
 @router.get("/", response_model=List[PaymentOut], summary="List Payments")
 def list_payments(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    filters: PaymentFilter = Depends(filter_query(PaymentFilter)),
     db: Session = Depends(get_db),
     current_user: CurrentUser = Depends(require_role(["admin", "manager"])),
 ):
@@ -33,12 +45,36 @@ def list_payments(
 
     - Requires `admin` or `manager` role.
     - Supports pagination via `skip` and `limit`.
+    - Supports filtering by sale IDs, payment mode, and payment date and
+      amount ranges.
+    - Supports keyset pagination by passing the `X-Next-Cursor` response
+      header back as `cursor`.
     """
-    payments = get_all_payments(db, skip=skip, limit=limit)
-    logger.info(f"Retrieved {len(payments)} payments for user {current_user.email}")
+    payments = get_all_payments(
+        db, skip=skip, limit=limit, filters=filters, cursor=cursor
+    )
+    if cursor_header := next_cursor(payments, limit):
+        response.headers["X-Next-Cursor"] = cursor_header
+    logger.info(f"Retrieved {len(payments)} payments for user {current_user.username}")
     return payments
 
 
+@router.get("/export", summary="Export Payments")
+def export_payments(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    filters: PaymentFilter = Depends(filter_query(PaymentFilter)),
+    current_user: CurrentUser = Depends(require_role(["admin", "manager"])),
+):
+    """
+    Stream all matching active payments as NDJSON (default) or CSV.
+
+    - Requires `admin` or `manager` role.
+    - Accepts the same filters as the list endpoint.
+    """
+    logger.info(f"User {current_user.username} exported payments as {fmt}.")
+    return export_response(export_payments_stmt(filters), fmt, "payments")
+
+
 @router.get("/{payment_id}", response_model=PaymentOut, summary="Get Payment by ID")
 def retrieve_payment(
     payment_id: int,
@@ -53,7 +89,7 @@ def retrieve_payment(
     payment = get_payment(db, payment_id)
     if not payment:
         logger.warning(
-            f"Payment ID {payment_id} not found by user {current_user.email}"
+            f"Payment ID {payment_id} not found by user {current_user.username}"
         )
         raise HTTPException(status_code=404, detail="Payment not found")
     return payment
@@ -76,7 +112,7 @@ def create_new_payment(
     - Accessible by any authenticated user.
     """
     new_payment = create_payment(db, payment, current_user)
-    logger.info(f"Payment created by user {current_user.email}")
+    logger.info(f"Payment created by user {current_user.username}")
     return new_payment
 
 
@@ -135,7 +171,7 @@ def list_deleted_payments(
     """
     deleted_payments = read_deleted_payments(db)
     logger.info(
-        f"User {current_user.email} viewed {len(deleted_payments)} deleted payments"
+        f"User {current_user.username} viewed {len(deleted_payments)} deleted payments"
     )
     return deleted_payments
 
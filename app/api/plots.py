@@ -1,21 +1,34 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth.auth import get_current_user, require_role
 from app.auth.currentuser import CurrentUser
-from app.config.database import get_db
+from app.config.database import LazySessionRoute, get_async_db, get_db
+from app.crud.filters import filter_query
+from app.crud.pagination import next_cursor
 from app.crud.plots import (
+    bulk_create_plots,
+    bulk_update_plots,
     create_plot,
     delete_plot,
-    get_all_plots,
-    get_plot,
+    get_all_plots_async,
+    get_plot_async,
+    search_plots_async,
     update_plot,
 )
-from app.schemas.plots import Plot, PlotBase, PlotUpdate
+from app.schemas.plots import (
+    BulkPlotResult,
+    Plot,
+    PlotBase,
+    PlotBulkUpdate,
+    PlotFilter,
+    PlotUpdate,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=LazySessionRoute)
 
 
 @router.post("/", response_model=Plot, status_code=status.HTTP_201_CREATED)
@@ -40,10 +53,75 @@ def create(
     return plot
 
 
+@router.post("/bulk", response_model=BulkPlotResult)
+def create_bulk(
+    plots: List[PlotBase],
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_role(["admin", "manager"])),
+):
+    """
+    Create many plots in one transaction.
+    Accessible by authorized users (admin, manager).
+
+    Args:
+        plots (List[PlotBase]): Data for the new plots.
+        db (Session): Database session.
+        current_user (CurrentUser): Authenticated user.
+
+    Returns:
+        BulkPlotResult: The new plot IDs and the rejected items, in order.
+    """
+    return bulk_create_plots(db, plots, current_user.username)
+
+
+@router.patch("/bulk", response_model=BulkPlotResult)
+def update_bulk(
+    plots: List[PlotBulkUpdate],
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_role(["admin", "manager"])),
+):
+    """
+    Update many plots in one transaction.
+    Accessible by authorized users (admin, manager).
+
+    Args:
+        plots (List[PlotBulkUpdate]): Plot IDs and the data to update.
+        db (Session): Database session.
+        current_user (CurrentUser): Authenticated user.
+
+    Returns:
+        BulkPlotResult: The updated plot IDs and the rejected items, in order.
+    """
+    return bulk_update_plots(db, plots, current_user.username)
+
+
+@router.get("/search", response_model=List[Plot])
+async def search(
+    q: str = Query(..., min_length=2, description="Text to search for."),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Search plots by dimensions, assignee or area name.
+    Accessible by any authenticated user.
+
+    Args:
+        q (str): Partial text to match.
+        limit (int): The maximum number of results to return.
+        db (AsyncSession): Async database session.
+        current_user (CurrentUser): Authenticated user.
+
+    Returns:
+        List[Plot]: Matching plots, most relevant first.
+    """
+    return await search_plots_async(db, q, limit)
+
+
 @router.get("/{plot_id}", response_model=Plot)
-def get(
+async def get(
     plot_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """
@@ -52,39 +130,53 @@ def get(
 
     Args:
         plot_id (int): The ID of the plot.
-        db (Session): Database session.
+        db (AsyncSession): Async database session.
         current_user (CurrentUser): Authenticated user.
 
     Returns:
         Plot: Plot details.
     """
-    plot = get_plot(db, plot_id)
+    plot = await get_plot_async(db, plot_id)
     if not plot:
         raise HTTPException(status_code=404, detail="Plot not found")
     return plot
 
 
 @router.get("/", response_model=List[Plot])
-def get_all(
-    db: Session = Depends(get_db),
+async def get_all(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    filters: PlotFilter = Depends(filter_query(PlotFilter)),
     current_user: CurrentUser = Depends(get_current_user),
 ):
     """
-    Get a list of all plots with pagination.
+    Get a list of all plots with pagination and optional filters.
     Accessible by any authenticated user.
 
+    Pass the `X-Next-Cursor` response header back as `cursor` to fetch the
+    next page by keyset instead of by offset.
+
     Args:
+        response (Response): Outgoing response, used for the cursor header.
         skip (int): The number of records to skip.
         limit (int): The maximum number of records to return.
-        db (Session): Database session.
+        cursor (Optional[str]): Keyset cursor from the previous page.
+        filters (PlotFilter): Status, area and price range filters.
+        db (AsyncSession): Async database session.
         current_user (CurrentUser): Authenticated user.
 
     Returns:
         List[Plot]: List of plot records.
     """
-    return get_all_plots(db, skip=skip, limit=limit)
+    plots = await get_all_plots_async(
+        db, skip=skip, limit=limit, filters=filters, cursor=cursor
+    )
+    if cursor_header := next_cursor(plots, limit):
+        response.headers["X-Next-Cursor"] = cursor_header
+    return plots
 
 
 @router.put("/{plot_id}", response_model=Plot)
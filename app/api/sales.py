@@ -1,23 +1,42 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.auth.auth import get_current_user, require_role
 from app.auth.currentuser import CurrentUser
-from app.config.database import get_db
+from app.config.database import LazySessionRoute, get_db
 from app.core.logger import get_logger
-from app.crud.sales import create_sale, get_all_sales, get_sale, update_sale
-from app.schemas.sales import Sales, SalesBase, SaleUpdate
+from app.crud.export import (
+    ColumnarFormat,
+    ExportFormat,
+    columnar_response,
+    export_response,
+)
+from app.crud.filters import filter_query
+from app.crud.pagination import next_cursor
+from app.crud.sales import (
+    create_sale,
+    export_sales_stmt,
+    get_all_sales,
+    get_sale,
+    sales_ledger_stmt,
+    update_sale,
+)
+from app.schemas.sales import Sales, SalesBase, SalesFilter, SaleUpdate
 
 logger = get_logger(__name__)
-router = APIRouter(prefix="/sales", tags=["Sales"])
+router = APIRouter(route_class=LazySessionRoute)
 
 
 @router.get("/", response_model=List[Sales], summary="List Sales")
 def list_sales(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    filters: SalesFilter = Depends(filter_query(SalesFilter)),
     db: Session = Depends(get_db),
     current_user: CurrentUser = Depends(require_role(["admin", "manager"])),
 ):
@@ -26,12 +45,68 @@ def list_sales(
 
     - Requires `admin` or `manager` role.
     - Supports pagination via `skip` and `limit`.
+    - Supports filtering by plot, buyer and associate IDs, payment mode,
+      and sale date and amount ranges.
+    - Supports keyset pagination by passing the `X-Next-Cursor` response
+      header back as `cursor`.
     """
-    sales = get_all_sales(db, skip=skip, limit=limit)
-    logger.info(f"User {current_user.email} retrieved {len(sales)} sales.")
+    sales = get_all_sales(db, skip=skip, limit=limit, filters=filters, cursor=cursor)
+    if cursor_header := next_cursor(sales, limit):
+        response.headers["X-Next-Cursor"] = cursor_header
+    logger.info(f"User {current_user.username} retrieved {len(sales)} sales.")
     return sales
 
 
+@router.get("/export", summary="Export Sales")
+def export_sales(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    filters: SalesFilter = Depends(filter_query(SalesFilter)),
+    current_user: CurrentUser = Depends(require_role(["admin", "manager"])),
+):
+    """
+    Stream all matching sales as NDJSON (default) or CSV.
+
+    - Requires `admin` or `manager` role.
+    - Accepts the same filters as the list endpoint.
+    - Rows are streamed in batches, so the whole ledger can be exported
+      without paging.
+    """
+    logger.info(f"User {current_user.username} exported sales as {fmt}.")
+    return export_response(export_sales_stmt(filters), fmt, "sales")
+
+
+@router.get("/ledger", summary="Export Sales Ledger")
+def export_sales_ledger(
+    fmt: ColumnarFormat = Query("parquet", alias="format"),
+    updated_since: Optional[datetime] = None,
+    filters: SalesFilter = Depends(filter_query(SalesFilter)),
+    current_user: CurrentUser = Depends(require_role(["admin", "manager"])),
+):
+    """
+    Stream the sales ledger as Parquet (default) or an Arrow IPC stream.
+
+    - Requires `admin` or `manager` role.
+    - Each row joins a sale with its plot, buyer, associate and payment
+      totals; amounts are exact decimals.
+    - Pass `updated_since` to export only sales updated after that time;
+      rows are ordered by `update_dt`, so the last one is the next
+      `updated_since`. Sales count as updated when any of their payments
+      changes.
+    - `update_dt` is the write transaction's start time, so a later commit
+      can carry an earlier timestamp: pass a watermark lagging the last
+      `update_dt` by more than the longest write (a few minutes is ample)
+      and de-duplicate rows by `sale_id`.
+    - Accepts the same filters as the list endpoint.
+    """
+    logger.info(
+        f"User {current_user.username} exported the sales ledger as {fmt} "
+        f"(updated since {updated_since})."
+    )
+    return columnar_response(
+        sales_ledger_stmt(filters, updated_since), fmt, "sales_ledger"
+    )
+
+
 @router.get("/{sale_id}", response_model=Sales, summary="Get Sale by ID")
 def get_sale_by_id(
     sale_id: int,
@@ -46,7 +121,7 @@ def get_sale_by_id(
     """
     sale = get_sale(db, sale_id)
     if not sale:
-        logger.warning(f"Sale ID {sale_id} not found by user {current_user.email}")
+        logger.warning(f"Sale ID {sale_id} not found by user {current_user.username}")
         raise HTTPException(status_code=404, detail="Sale not found")
     return sale
 
@@ -68,7 +143,7 @@ def create_new_sale(
     - Requires any authenticated user.
     """
     new_sale = create_sale(db, sale, current_user)
-    logger.info(f"Sale created by user {current_user.email}")
+    logger.info(f"Sale created by user {current_user.username}")
     return new_sale
 
 
@@ -89,7 +164,7 @@ def update_existing_sale(
     if not updated_sale:
         logger.warning(f"Attempted to update non-existent sale ID {sale_id}")
         raise HTTPException(status_code=404, detail="Sale not found")
-    logger.info(f"Sale ID {sale_id} updated by user {current_user.email}")
+    logger.info(f"Sale ID {sale_id} updated by user {current_user.username}")
     return updated_sale
 
 
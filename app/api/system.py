@@ -0,0 +1,194 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.auth.auth import require_role
+from app.auth.currentuser import CurrentUser
+from app.auth.tokens import token_cache
+from app.config.database import (
+    LazySessionRoute,
+    async_pool_metrics,
+    get_db,
+    pool_metrics,
+)
+from app.core.metrics import request_checkouts
+from app.crud.dashboard import dashboard_cache
+from app.crud.lookups import lookup_stats, reload_lookups
+from app.crud.rollups import check_rollups, rebuild_rollups
+
+router = APIRouter(route_class=LazySessionRoute)
+
+
+@router.get(
+    "/pool",
+    response_model=Dict[str, Dict[str, int]],
+    summary="Connection pool metrics",
+    description="Live pool state and cumulative checkout/checkin counters for the "
+    "sync and async engines, plus checkouts per request. Only accessible by users "
+    "with the 'admin' role.",
+)
+def get_pool_metrics(
+    current_user: CurrentUser = Depends(require_role(["admin"])),
+) -> Dict[str, Dict[str, int]]:
+    """
+    Report connection pool usage so pool_size/max_overflow can be sized.
+
+    Args:
+        current_user (CurrentUser): Authenticated user with admin role.
+
+    Returns:
+        Dict[str, Dict[str, int]]: Pool metrics keyed by engine, and the
+        per-request checkout counters under "requests".
+    """
+    return {
+        "sync": pool_metrics.snapshot(),
+        "async": async_pool_metrics.snapshot(),
+        "requests": request_checkouts.snapshot(),
+    }
+
+
+@router.get(
+    "/rollups",
+    response_model=Dict[str, Any],
+    summary="Check dashboard rollups",
+    description="Compare the dashboard rollup tables against a full recompute "
+    "from sales and payments. Only accessible by users with the 'admin' role.",
+)
+def get_rollup_consistency(
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_role(["admin"])),
+) -> Dict[str, Any]:
+    """
+    Verify that the incrementally maintained rollups match the source tables.
+
+    Args:
+        db (Session): Database session.
+        current_user (CurrentUser): Authenticated user with admin role.
+
+    Returns:
+        Dict[str, Any]: Consistency flag and the list of mismatching rows.
+    """
+    mismatches = check_rollups(db)
+    return {"consistent": not mismatches, "mismatches": mismatches}
+
+
+@router.post(
+    "/rollups/rebuild",
+    response_model=Dict[str, Any],
+    summary="Rebuild dashboard rollups",
+    description="Recompute every dashboard rollup table from sales and payments. "
+    "Only accessible by users with the 'admin' role.",
+)
+def rebuild_rollup_tables(
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_role(["admin"])),
+) -> Dict[str, Any]:
+    """
+    Rebuild the dashboard rollups, e.g. after a manual data fix.
+
+    Args:
+        db (Session): Database session.
+        current_user (CurrentUser): Authenticated user with admin role.
+
+    Returns:
+        Dict[str, Any]: Consistency result after the rebuild.
+    """
+    rebuild_rollups(db)
+    db.commit()
+    dashboard_cache.invalidate()
+    mismatches = check_rollups(db)
+    return {"consistent": not mismatches, "mismatches": mismatches}
+
+
+@router.get(
+    "/cache",
+    response_model=Dict[str, Any],
+    summary="Dashboard cache statistics",
+    description="Hit/miss counters of the dashboard query cache. "
+    "Only accessible by users with the 'admin' role.",
+)
+def get_cache_stats(
+    current_user: CurrentUser = Depends(require_role(["admin"])),
+) -> Dict[str, Any]:
+    """
+    Report dashboard cache effectiveness.
+
+    Args:
+        current_user (CurrentUser): Authenticated user with admin role.
+
+    Returns:
+        Dict[str, Any]: Cache counters.
+    """
+    return dashboard_cache.stats()
+
+
+@router.get(
+    "/lookups",
+    response_model=Dict[str, Dict[str, Any]],
+    summary="Lookup table cache statistics",
+    description="Size, version and hit/miss counters of the cached role, "
+    "designation and area lookup tables. Only accessible by users with the "
+    "'admin' role.",
+)
+def get_lookup_stats(
+    current_user: CurrentUser = Depends(require_role(["admin"])),
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Report lookup cache state.
+
+    Args:
+        current_user (CurrentUser): Authenticated user with admin role.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Stats keyed by lookup table.
+    """
+    return lookup_stats()
+
+
+@router.post(
+    "/lookups/reload",
+    response_model=Dict[str, Dict[str, Any]],
+    summary="Reload lookup tables",
+    description="Reload the cached role, designation and area lookup tables, "
+    "e.g. after editing them directly in the database. Only accessible by "
+    "users with the 'admin' role.",
+)
+def reload_lookup_tables(
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_role(["admin"])),
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Force a reload of every lookup table in this process.
+
+    Args:
+        db (Session): Database session.
+        current_user (CurrentUser): Authenticated user with admin role.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Stats keyed by lookup table after the reload.
+    """
+    reload_lookups(db)
+    return lookup_stats()
+
+
+@router.get(
+    "/tokens",
+    response_model=Dict[str, int],
+    summary="Token cache statistics",
+    description="Size and hit/miss counters of the verified token cache. "
+    "Only accessible by users with the 'admin' role.",
+)
+def get_token_cache_stats(
+    current_user: CurrentUser = Depends(require_role(["admin"])),
+) -> Dict[str, int]:
+    """
+    Report how often the auth dependency skips JWT verification.
+
+    Args:
+        current_user (CurrentUser): Authenticated user with admin role.
+
+    Returns:
+        Dict[str, int]: Token cache counters.
+    """
+    return token_cache.stats()
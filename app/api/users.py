@@ -5,11 +5,17 @@ from sqlalchemy.orm import Session
 
 from app.auth.auth import get_current_user, require_role
 from app.auth.currentuser import CurrentUser
-from app.config.database import get_db
-from app.crud.users import create_user, get_all_user, get_user, update_user
-from app.schemas.users import UserCredential, Users
+from app.config.database import LazySessionRoute, get_db
+from app.crud.users import (
+    bulk_create_users,
+    create_user,
+    get_all_user,
+    get_user,
+    update_user,
+)
+from app.schemas.users import BulkUserResult, UserCredential, Users
 
-router = APIRouter()
+router = APIRouter(route_class=LazySessionRoute)
 
 
 @router.get(
@@ -103,6 +109,34 @@ def create(
     return create_user(db, payload, current_user)
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkUserResult,
+    summary="Register many users",
+    description="Register a list of users in one request. Rows that cannot be "
+    "created are reported individually. Only accessible to users with the "
+    "'admin' role.",
+)
+def create_bulk(
+    payload: List[UserCredential],
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_role(["admin"])),
+) -> BulkUserResult:
+    """
+    Register many users at once.
+    Only accessible to admin users.
+
+    Args:
+        payload (List[UserCredential]): New users' data.
+        db (Session): SQLAlchemy session.
+        current_user (CurrentUser): Admin user performing the operation.
+
+    Returns:
+        BulkUserResult: Number of created users and the rejected rows.
+    """
+    return bulk_create_users(db, payload, current_user)
+
+
 @router.put(
     "/{id}",
     response_model=Users,
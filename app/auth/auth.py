@@ -1,17 +1,19 @@
+import os
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Callable, Dict, List, Optional
 
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
 
 from app.auth.currentuser import CurrentUser
-from app.config.database import get_db
+from app.auth.tokens import revocations, token_cache, token_key
 
 SECRET_KEY = "your-secret-key"
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
@@ -24,7 +26,8 @@ def create_access_token(
 
     Args:
         data (Dict[str, Any]): The data to encode in the token.
-        expires_delta (Optional[timedelta], optional): Custom expiration time. Defaults to 30 minutes.
+        expires_delta (Optional[timedelta], optional): Custom expiration time.
+            Defaults to `ACCESS_TOKEN_EXPIRE_MINUTES`.
 
     Returns:
         str: Encoded JWT token.
@@ -33,39 +36,92 @@ def create_access_token(
     expire = datetime.now(timezone.utc) + (
         expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex, "type": "access"})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def verify_token(token: str) -> Dict[str, Any]:
+def create_refresh_token(data: Dict[str, Any]) -> str:
+    """
+    Create a long-lived JWT that can only be exchanged for new access tokens.
+
+    Args:
+        data (Dict[str, Any]): The data to encode in the token.
+
+    Returns:
+        str: Encoded JWT refresh token.
+    """
+    to_encode = data.copy()
+    expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex, "type": "refresh"})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def verify_token(token: str, token_type: str = "access") -> Dict[str, Any]:
     """
     Decode and verify a JWT token.
 
+    Verified payloads are cached by token hash until they expire, so repeat
+    requests skip the signature check; the revocation set is consulted on
+    every call.
+
     Args:
         token (str): The token to verify.
+        token_type (str): Expected `type` claim, "access" or "refresh".
 
     Raises:
-        HTTPException: If the token is invalid or expired.
+        HTTPException: If the token is invalid, expired, revoked or of the
+            wrong type.
 
     Returns:
         Dict[str, Any]: Decoded token payload.
     """
+    key = token_key(token)
+    payload = token_cache.get(key)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except jwt.PyJWTError:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        token_cache.set(key, payload)
+
+    # Tokens issued before revocation support carry no jti or type
+    if payload.get("type", "access") != token_type:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    if "jti" in payload and revocations.is_revoked(payload["jti"]):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    return payload
+
+
+def revoke_token(token: str) -> None:
+    """
+    Revoke a token until it would have expired.
+
+    Args:
+        token (str): The access or refresh token to revoke.
+
+    Raises:
+        HTTPException: If the token is invalid or carries no token ID.
+    """
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
+    if "jti" not in payload:
+        raise HTTPException(status_code=400, detail="Token cannot be revoked")
 
+    revocations.revoke(payload["jti"], payload["exp"])
+    token_cache.discard(token_key(token))
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> CurrentUser:
+
+def get_current_user(token: str = Depends(oauth2_scheme)) -> CurrentUser:
     """
     Extract the current authenticated user from the JWT token.
 
+    Needs no database session, so authentication alone never checks a
+    connection out of the pool.
+
     Args:
         token (str, optional): JWT token provided via OAuth2 scheme.
-        db (Session): Database session for future validation if needed.
 
     Raises:
         HTTPException: If the token is invalid or required fields are missing.
@@ -0,0 +1,151 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol
+
+# Verified access token payloads kept per process
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+# Optional Redis (or Redis-compatible) URL shared by all API workers for
+# revocations; without it revocations are local to each process.
+TOKEN_REVOCATION_REDIS_URL = os.getenv("TOKEN_REVOCATION_REDIS_URL")
+# Number of API worker processes, as read by uvicorn and gunicorn
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+
+def token_key(token: str) -> str:
+    """Hash a token so raw credentials are never used as cache keys."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenCache:
+    """
+    LRU cache of verified token payloads keyed by token hash.
+
+    Entries are dropped once the token's `exp` has passed, so the cache can
+    never extend a token's lifetime.
+
+    Args:
+        maxsize (int): Maximum number of cached payloads.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None or payload["exp"] <= time.time():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def set(self, key: str, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class RevocationStore(Protocol):
+    """Set of revoked token IDs (`jti`), each kept until the token expires."""
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        """Revoke `jti` until the Unix time `expires_at`."""
+
+    def is_revoked(self, jti: str) -> bool:
+        """Return True if `jti` has been revoked and has not expired yet."""
+
+
+class InMemoryRevocationStore:
+    """Process-local revocation set with expiry-based pruning."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._revoked: Dict[str, float] = {}
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._revoked[jti] = expires_at
+            expired = [key for key, exp in self._revoked.items() if exp <= now]
+            for key in expired:
+                del self._revoked[key]
+
+    def is_revoked(self, jti: str) -> bool:
+        with self._lock:
+            expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+
+class RedisRevocationStore:
+    """
+    Revocation set shared through Redis, one expiring key per revoked token.
+
+    Requires the optional `redis` package.
+
+    Args:
+        url (str): Redis connection URL.
+    """
+
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        ttl = int(expires_at - time.time()) + 1
+        if ttl > 0:
+            self._client.set(f"revoked:{jti}", 1, ex=ttl)
+
+    def is_revoked(self, jti: str) -> bool:
+        return bool(self._client.exists(f"revoked:{jti}"))
+
+
+def _revocation_store() -> RevocationStore:
+    """
+    Pick the revocation store for this process.
+
+    The in-memory store only sees revocations made by its own process, so
+    logout and single-use refresh tokens would not hold across workers: a
+    refresh token replayed against another worker would still be accepted.
+    With more than one worker a shared Redis store is therefore required.
+
+    Raises:
+        RuntimeError: If several workers run without
+            `TOKEN_REVOCATION_REDIS_URL`.
+    """
+    if TOKEN_REVOCATION_REDIS_URL:
+        return RedisRevocationStore(TOKEN_REVOCATION_REDIS_URL)
+    if WEB_CONCURRENCY > 1:
+        raise RuntimeError(
+            "TOKEN_REVOCATION_REDIS_URL must be set when running more than one "
+            "API worker; revocations are otherwise local to each process"
+        )
+    return InMemoryRevocationStore()
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+revocations: RevocationStore = _revocation_store()
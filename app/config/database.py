@@ -1,9 +1,16 @@
+import functools
+import inspect
 import os
-from typing import Generator
+from typing import Any, AsyncGenerator, Callable, Generator, Optional
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from fastapi.routing import APIRoute
+from sqlalchemy import DDL, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.schema import CreateIndex
+
+from app.core.metrics import PoolMetrics
 
 # Load environment variables from .env file
 load_dotenv()
@@ -15,37 +22,196 @@ DB_NAME = os.getenv("POSTGRES_DB")
 DB_HOST = os.getenv("POSTGRES_HOST", "db")
 DB_PORT = os.getenv("POSTGRES_PORT", "5432")
 
-# SQLAlchemy database URL
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+# Engine profile from environment (defaults are sized for a single API worker)
+DB_ECHO = _env_flag("DB_ECHO", "false")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+DB_POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", "true")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+ENGINE_OPTIONS = {
+    "echo": DB_ECHO,
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
+# SQLAlchemy database URLs (blocking psycopg2 and asyncio asyncpg drivers)
 DATABASE_URL = (
     f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
+ASYNC_DATABASE_URL = (
+    f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
 
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL, echo=True)
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"},
+    **ENGINE_OPTIONS,
+)
+pool_metrics = PoolMetrics(engine)
 
-# Create session factory
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# Create session factory. Committed objects keep their loaded state, so
+# writes can be returned without another SELECT (see `Base` below).
+SessionLocal = sessionmaker(
+    bind=engine, autoflush=False, autocommit=False, expire_on_commit=False
+)
+
+# Create asyncio engine and session factory for non-blocking handlers.
+# expire_on_commit is disabled because expired attributes cannot be lazily
+# reloaded outside of an awaitable context.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args={
+        "server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+    },
+    **ENGINE_OPTIONS,
+)
+async_pool_metrics = PoolMetrics(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 
 class Base(DeclarativeBase):
     """
     Base class for SQLAlchemy models.
     All models should inherit from this.
+
+    `eager_defaults` fetches SQL-generated values such as `create_dt` and
+    `update_dt` with RETURNING in the INSERT/UPDATE itself instead of
+    leaving them expired until the next access.
+    """
+
+    __mapper_args__ = {"eager_defaults": True}
+
+
+# Trigram operator classes used by the search indexes
+event.listen(
+    Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
+
+
+def _create_missing_indexes(target, connection, tables=(), **kw) -> None:
+    """
+    Create model indexes missing from tables that already existed.
+
+    `create_all` only creates indexes together with their table, so an
+    index added to a model later would never reach an existing database.
     """
+    for table in tables or target.sorted_tables:
+        for index in table.indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+
 
-    pass
+event.listen(Base.metadata, "after_create", _create_missing_indexes)
+
+
+class LazySession:
+    """
+    Proxy for a `Session` that is only created when it is first used.
+
+    Requests that never reach the database (cache hits, validation or
+    permission failures) never create a session. The connection itself is
+    checked out by the session on its first statement and returned by
+    `release()`.
+
+    Args:
+        factory (Callable[[], Session]): Creates the underlying session.
+    """
+
+    def __init__(self, factory: Callable[[], Session]) -> None:
+        self._factory = factory
+        self._session: Optional[Session] = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    def release(self) -> None:
+        """
+        Close the session if it was opened, returning its connection.
+
+        Loaded attributes of the returned objects stay readable, so the
+        response can still be serialized afterwards.
+        """
+        if self._session is not None:
+            self._session.close()
+
+
+def _release_sessions(values: dict) -> None:
+    for value in values.values():
+        if isinstance(value, LazySession):
+            value.release()
+
+
+def _release_sessions_after(call: Callable) -> Callable:
+    if inspect.iscoroutinefunction(call):
+
+        @functools.wraps(call)
+        async def async_endpoint(**values):
+            try:
+                return await call(**values)
+            finally:
+                _release_sessions(values)
+
+        return async_endpoint
+
+    @functools.wraps(call)
+    def endpoint(**values):
+        try:
+            return call(**values)
+        finally:
+            _release_sessions(values)
+
+    return endpoint
+
+
+class LazySessionRoute(APIRoute):
+    """
+    Route that releases the endpoint's `LazySession` as soon as it returns.
+
+    Without it the connection would be held until the `get_db` teardown,
+    i.e. through response validation and serialization.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any) -> None:
+        super().__init__(path, _release_sessions_after(endpoint), **kwargs)
 
 
 def get_db() -> Generator[Session, None, None]:
     """
-    Dependency to provide a database session.
+    Dependency to provide a lazily opened database session.
     Ensures the session is closed after use.
 
     Yields:
-        Session: SQLAlchemy DB session.
+        Session: SQLAlchemy DB session (a `LazySession` proxy).
     """
-    db: Session = SessionLocal()
+    db = LazySession(SessionLocal)
     try:
         yield db
     finally:
-        db.close()
+        db.release()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to provide an asyncio database session.
+    Ensures the session is closed after use.
+
+    Yields:
+        AsyncSession: SQLAlchemy asyncio DB session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
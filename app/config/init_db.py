@@ -2,17 +2,28 @@ import csv
 import os
 
 import pandas as pd
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.config.database import Base, SessionLocal, engine
+from app.crud.lookups import reload_lookups
+from app.crud.rollups import rebuild_rollups
 from app.crud.users import get_password_hash
 from app.models.areas import Areas
 from app.models.buyers import Buyers
+from app.models.csv_import import CsvImportProgress
 from app.models.images import Images
 from app.models.payments import Payments
 from app.models.plots import Plots
 from app.models.sales import Sales
 from app.models.users import Designations, Roles, Users
 
+CSV_DATA_PATH = "app/config/data"
+# Rows per INSERT batch when importing CSV data; bounds memory on large files
+CSV_CHUNK_SIZE = int(os.getenv("CSV_CHUNK_SIZE", "10000"))
+# Columns seeded with ON CONFLICT, which needs a unique index on each
+SEED_KEYS = ((Roles, "name"), (Designations, "title"), (Areas, "name"))
+
 
 def read_csv(filepath: str) -> list[dict]:
     """Reads a CSV file and returns a list of dictionaries."""
@@ -23,10 +34,103 @@ def read_csv(filepath: str) -> list[dict]:
         return list(csv.DictReader(f))
 
 
+def seed_table(db, model, key: str, rows: list[dict]) -> tuple[int, int]:
+    """
+    Idempotently inserts `rows` into `model`'s table in one transaction.
+
+    Rows are de-duplicated on `key` and written with
+    `INSERT ... ON CONFLICT (key) DO NOTHING`, so existing entries are
+    skipped by the unique constraint instead of being looked up one by one.
+
+    Returns:
+        tuple[int, int]: Number of rows inserted and skipped.
+    """
+    unique_rows = list({row[key]: row for row in rows if row[key]}.values())
+    if not unique_rows:
+        return 0, len(rows)
+
+    stmt = (
+        pg_insert(model)
+        .on_conflict_do_nothing(index_elements=[key])
+        .returning(getattr(model, key))
+    )
+    inserted = len(db.scalars(stmt, unique_rows).all())
+    db.commit()
+    return inserted, len(rows) - inserted
+
+
+def _merge_duplicates(db, model, key: str) -> int:
+    """
+    Folds rows sharing a `key` value into the one with the lowest ID.
+
+    Foreign keys pointing at the removed rows are moved to the kept row.
+    Rollup rows keyed by a removed row are deleted; the caller rebuilds
+    the rollups.
+
+    Returns:
+        int: Number of rows removed.
+    """
+    table = model.__table__
+    column = table.c[key]
+    ranked = (
+        select(table.c.id, func.min(table.c.id).over(partition_by=column).label("keep"))
+        .where(column.is_not(None))
+        .subquery()
+    )
+    duplicates = (
+        select(ranked.c.id, ranked.c.keep).where(ranked.c.id != ranked.c.keep)
+    ).subquery()
+    for referencing in Base.metadata.sorted_tables:
+        for fk in referencing.foreign_keys:
+            if fk.column.table is not table:
+                continue
+            if fk.parent.primary_key:
+                db.execute(
+                    delete(referencing).where(fk.parent.in_(select(duplicates.c.id)))
+                )
+            else:
+                db.execute(
+                    update(referencing)
+                    .where(fk.parent == duplicates.c.id)
+                    .values({fk.parent.name: duplicates.c.keep})
+                )
+    return db.execute(
+        delete(table).where(table.c.id.in_(select(duplicates.c.id)))
+    ).rowcount
+
+
+def ensure_seed_keys(db) -> None:
+    """
+    Adds the unique indexes behind `seed_table`'s conflict targets.
+
+    `create_all` does not alter tables that already exist, so databases
+    created before the constraints were declared may lack them and may
+    already hold duplicates. Duplicates are merged first (see
+    `_merge_duplicates`), then each index is created if missing. The
+    index takes the name PostgreSQL gives the declared constraint, so it
+    is skipped on databases that have the constraint.
+    """
+    merged = 0
+    for model, key in SEED_KEYS:
+        removed = _merge_duplicates(db, model, key)
+        if removed:
+            print(f"Merged {removed} duplicate rows of {model.__tablename__}.{key}.")
+        merged += removed
+        table = model.__tablename__
+        index = f"{table}_{key}_key"
+        db.execute(
+            text(f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {table} ({key})")
+        )
+    if merged:
+        rebuild_rollups(db)
+    db.commit()
+
+
 def init() -> None:
     """
     Initializes the database:
     - Creates all tables
+    - Adds missing unique keys of the seeded tables
     - Inserts static roles and designations
     - Creates an initial admin user (if not present)
     """
@@ -36,33 +140,35 @@ def init() -> None:
     db = SessionLocal()
     base_path = "app/config/data"
     try:
+        ensure_seed_keys(db)
+
         # Insert static roles from roles.csv
-        roles_data = read_csv(f"{base_path}/roles.csv")
-        for row in roles_data:
-            role_name = row["name"].strip()
-            if role_name and not db.query(Roles).filter_by(name=role_name).first():
-                db.add(Roles(name=role_name))
-        print("Inserted roles from CSV.")
+        roles = [
+            {"name": row["name"].strip()} for row in read_csv(f"{base_path}/roles.csv")
+        ]
+        inserted, skipped = seed_table(db, Roles, "name", roles)
+        print(f"Roles from CSV: {inserted} inserted, {skipped} skipped.")
 
         # Insert static designations from designations.csv
-        designations_data = read_csv(f"{base_path}/designations.csv")
-        for row in designations_data:
-            title = row["title"].strip()
-            if title and not db.query(Designations).filter_by(title=title).first():
-                db.add(Designations(title=title))
-        print("Inserted designations from CSV.")
+        designations = [
+            {"title": row["title"].strip()}
+            for row in read_csv(f"{base_path}/designations.csv")
+        ]
+        inserted, skipped = seed_table(db, Designations, "title", designations)
+        print(f"Designations from CSV: {inserted} inserted, {skipped} skipped.")
 
         # Insert static areas from areas.csv
-        areas_data = read_csv(f"{base_path}/areas.csv")
-        for row in areas_data:
-            name = row.get("name", "").strip()
-            city = row.get("city", "").strip()
-            state = row.get("state", "").strip()
-            if name and not db.query(Areas).filter_by(name=name).first():
-                db.add(Areas(name=name, city=city, state=state))
-        print("Inserted areas from CSV.")
-
-        db.commit()
+        areas = [
+            {
+                "name": row.get("name", "").strip(),
+                "city": row.get("city", "").strip(),
+                "state": row.get("state", "").strip(),
+            }
+            for row in read_csv(f"{base_path}/areas.csv")
+        ]
+        inserted, skipped = seed_table(db, Areas, "name", areas)
+        print(f"Areas from CSV: {inserted} inserted, {skipped} skipped.")
+        reload_lookups(db)
 
         # Create initial admin user
         if not db.query(Users).filter_by(username="admin").first():
@@ -92,48 +198,121 @@ def init() -> None:
         print("DB initialization complete.")
 
 
-def load_csv_to_db():
-    db = SessionLocal()
-    base_path = "app/config/data"
-    try:
-        # Load CSVs
-        plots_df = pd.read_csv(f"{base_path}/plots.csv")
-        associates_df = pd.read_csv(f"{base_path}/users.csv")
-        buyers_df = pd.read_csv(f"{base_path}/buyers.csv")
-        sales_df = pd.read_csv(
-            f"{base_path}/sales.csv", parse_dates=["sale_date", "payment_timeframe"]
-        )
-        payments_df = pd.read_csv(
-            f"{base_path}/payments.csv", parse_dates=["payment_date"]
+def _read_checkpoint(db) -> dict[str, int]:
+    """Returns the rows already imported per CSV file by an earlier run."""
+    return dict(
+        db.execute(select(CsvImportProgress.filename, CsvImportProgress.rows_done))
+    )
+
+
+def _write_checkpoint(db, filename: str, rows_done: int) -> None:
+    """Records a file's progress in the current transaction, with its chunk."""
+    stmt = pg_insert(CsvImportProgress).values(filename=filename, rows_done=rows_done)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CsvImportProgress.filename],
+            set_={"rows_done": stmt.excluded.rows_done},
         )
+    )
 
-        # Insert Plots
-        for _, row in plots_df.iterrows():
-            db.add(Plots(**row.to_dict()))
 
-        # Insert Associates
-        associates_df["hashed_password"] = get_password_hash("password")
-        associates_df = associates_df.drop("password", axis=1)
-        for _, row in associates_df.iterrows():
-            db.add(Users(**row.to_dict()))
+def _validate_chunk(model, chunk: pd.DataFrame, filename: str) -> list[dict]:
+    """
+    Checks a CSV chunk against the model's table and converts it to rows.
+
+    Raises:
+        ValueError: If the chunk has unknown columns or nulls in required ones.
+    """
+    columns = model.__table__.columns
+    unknown = set(chunk.columns) - set(columns.keys())
+    if unknown:
+        raise ValueError(f"{filename}: unknown columns {sorted(unknown)}")
 
-        # Insert Buyers
-        for _, row in buyers_df.iterrows():
-            db.add(Buyers(**row.to_dict()))
+    for column in columns:
+        required = not column.nullable and not column.primary_key
+        if required and column.default is None and column.key in chunk:
+            if chunk[column.key].isna().any():
+                raise ValueError(f"{filename}: missing values for {column.key}")
 
-        # Insert Sales
-        for _, row in sales_df.iterrows():
-            db.add(Sales(**row.to_dict()))
+    # NaN/NaT become NULL; object dtype hands psycopg2 plain Python values
+    return chunk.astype(object).where(chunk.notna(), None).to_dict("records")
+
+
+def load_csv_file(
+    db,
+    model,
+    filename: str,
+    done: dict[str, int],
+    parse_dates: list[str] | None = None,
+    transform=None,
+) -> int:
+    """
+    Streams a CSV file into `model`'s table in chunks of `CSV_CHUNK_SIZE` rows.
 
-        # Insert Payments
-        for _, row in payments_df.iterrows():
-            db.add(Payments(**row.to_dict()))
+    Each chunk is validated, inserted with a single executemany INSERT and
+    committed together with the file's progress in `csv_import_progress`,
+    so an interrupted import resumes after the last committed chunk and
+    never inserts a chunk twice.
 
+    Returns:
+        int: Number of rows inserted by this call.
+    """
+    skip = done.get(filename, 0)
+    reader = pd.read_csv(
+        f"{CSV_DATA_PATH}/{filename}",
+        chunksize=CSV_CHUNK_SIZE,
+        parse_dates=parse_dates or False,
+        skiprows=range(1, skip + 1),
+    )
+    inserted = 0
+    for chunk in reader:
+        if transform is not None:
+            chunk = transform(chunk)
+        rows = _validate_chunk(model, chunk, filename)
+        inserted += len(rows)
+        db.execute(insert(model), rows)
+        _write_checkpoint(db, filename, skip + inserted)
         db.commit()
+        done[filename] = skip + inserted
+
+    print(f"Imported {inserted} rows from {filename} ({skip} already present).")
+    return inserted
+
+
+def load_csv_to_db():
+    Base.metadata.create_all(bind=engine, tables=[CsvImportProgress.__table__])
+    db = SessionLocal()
+    try:
+        done = _read_checkpoint(db)
+        hashed_password = get_password_hash("password")
+
+        def _hash_passwords(chunk: pd.DataFrame) -> pd.DataFrame:
+            return chunk.drop("password", axis=1).assign(
+                hashed_password=hashed_password
+            )
+
+        # Parents first so foreign keys resolve
+        load_csv_file(db, Plots, "plots.csv", done)
+        load_csv_file(db, Users, "users.csv", done, transform=_hash_passwords)
+        load_csv_file(db, Buyers, "buyers.csv", done)
+        load_csv_file(
+            db,
+            Sales,
+            "sales.csv",
+            done,
+            parse_dates=["sale_date", "payment_timeframe"],
+        )
+        load_csv_file(db, Payments, "payments.csv", done, parse_dates=["payment_date"])
         print("Database initialized with CSV data.")
+
+        rebuild_rollups(db)
+        db.execute(delete(CsvImportProgress))
+        db.commit()
+        print("Rebuilt dashboard rollups.")
     except Exception as e:
         db.rollback()
         print("Error occurred:", e)
+        print("Re-run to resume from the last imported chunk.")
     finally:
         db.close()
 
@@ -0,0 +1,69 @@
+"""
+Bulk user provisioning from a CSV or JSON file.
+
+Usage:
+    python -m app.config.provision_users users.csv
+    python -m app.config.provision_users users.json --created-by admin
+
+CSV files need the columns username, full_name, email, password, role and
+designation; JSON files hold a list of objects with the same keys.
+"""
+
+import argparse
+import csv
+import json
+
+from pydantic import ValidationError
+
+from app.auth.currentuser import CurrentUser
+from app.config.database import SessionLocal
+from app.core.passwords import shutdown_password_pool
+from app.crud.users import bulk_create_users
+from app.schemas.users import BulkUserError, UserCredential
+
+
+def read_user_rows(path: str) -> list[dict]:
+    """Reads user rows from a `.json` list or a CSV file."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        return list(csv.DictReader(f))
+
+
+def provision(path: str, created_by: str = "system") -> None:
+    """Creates the users listed in `path` and prints a per-row report."""
+    users, errors = [], []
+    for index, row in enumerate(read_user_rows(path)):
+        try:
+            users.append((index, UserCredential(**row)))
+        except ValidationError as e:
+            errors.append(
+                BulkUserError(index=index, username=row.get("username"), detail=str(e))
+            )
+
+    db = SessionLocal()
+    try:
+        current_user = CurrentUser(user_id=0, username=created_by, role="admin")
+        result = bulk_create_users(db, [user for _, user in users], current_user)
+    finally:
+        db.close()
+        shutdown_password_pool()
+
+    # Map indexes of the validated subset back to file rows
+    for error in result.errors:
+        error.index = users[error.index][0]
+    errors = sorted(errors + result.errors, key=lambda error: error.index)
+
+    print(f"Created {result.created} users, rejected {len(errors)}.")
+    for error in errors:
+        print(f"  row {error.index} ({error.username}): {error.detail}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("path", help="CSV or JSON file with the users to create.")
+    parser.add_argument(
+        "--created-by", default="system", help="Username recorded as creator."
+    )
+    args = parser.parse_args()
+    provision(args.path, args.created_by)
@@ -0,0 +1,178 @@
+# app/core/cache.py
+import functools
+import inspect
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Protocol, Tuple
+
+
+class CacheBackend(Protocol):
+    """
+    Storage used by `QueryCache`. Implementations must be thread-safe.
+
+    The generation counters live in the backend too, so a backend shared by
+    several processes also shares their invalidations.
+    """
+
+    def get(self, key: str) -> Optional[Tuple[int, Any]]:
+        """Return the stored (generation, value) pair, or None if absent/expired."""
+
+    def set(self, key: str, entry: Tuple[int, Any], ttl: float) -> None:
+        """Store a (generation, value) pair for `ttl` seconds."""
+
+    def clear(self) -> None:
+        """Drop every entry."""
+
+    def generation(self, namespace: str) -> int:
+        """Return the current generation of `namespace`, 0 if never bumped."""
+
+    def bump_generation(self, namespace: str) -> int:
+        """Atomically increment the generation of `namespace` and return it."""
+
+    def __len__(self) -> int:
+        """Return the number of stored entries."""
+
+
+class InMemoryBackend:
+    """Process-local dictionary backend with per-entry expiry."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Tuple[int, Any]]] = {}
+        self._generations: Dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[Tuple[int, Any]]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry
+
+    def set(self, key: str, entry: Tuple[int, Any], ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def bump_generation(self, namespace: str) -> int:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            return self._generations[namespace]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class QueryCache:
+    """
+    TTL cache for read-only query functions with explicit invalidation.
+
+    Every entry is tagged with the cache generation current when its query
+    started. `invalidate()` bumps the generation, so a result computed
+    concurrently with a write is never stored or served afterwards. The
+    generation is kept in the backend, so with a shared backend a write in
+    one process invalidates the entries of every process.
+
+    Args:
+        namespace (str): Prefix for the cache keys.
+        ttl (float): Seconds an entry stays valid without invalidation.
+        backend (Optional[CacheBackend]): Storage, in-process by default.
+    """
+
+    def __init__(
+        self, namespace: str, ttl: float, backend: Optional[CacheBackend] = None
+    ) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        self.backend = backend if backend is not None else InMemoryBackend()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _key(self, func: Callable) -> str:
+        return f"{self.namespace}:{func.__name__.removesuffix('_async')}"
+
+    def _lookup(self, key: str) -> Tuple[bool, Any, int]:
+        """Return whether `key` is cached, its value and the current generation."""
+        generation = self.backend.generation(self.namespace)
+        entry = self.backend.get(key)
+        with self._lock:
+            if entry is not None and entry[0] == generation:
+                self.hits += 1
+                return True, entry[1], generation
+            self.misses += 1
+            return False, None, generation
+
+    def _store(self, key: str, generation: int, value: Any) -> None:
+        if generation != self.backend.generation(self.namespace):
+            return
+        self.backend.set(key, (generation, value), self.ttl)
+
+    def cached(self, func: Callable) -> Callable:
+        """
+        Decorate a query function taking only a session argument.
+
+        Sync and `_async` variants of the same query share one cache entry.
+        """
+        key = self._key(func)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(db):
+                found, value, generation = self._lookup(key)
+                if found:
+                    return value
+                value = await func(db)
+                self._store(key, generation, value)
+                return value
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(db):
+            found, value, generation = self._lookup(key)
+            if found:
+                return value
+            value = func(db)
+            self._store(key, generation, value)
+            return value
+
+        return wrapper
+
+    def invalidate(self) -> None:
+        """Discard every cached entry. Call after committing a relevant write."""
+        self.backend.bump_generation(self.namespace)
+        with self._lock:
+            self.invalidations += 1
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters for monitoring.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, invalidations, entry count and TTL.
+        """
+        with self._lock:
+            return {
+                "namespace": self.namespace,
+                "ttl": self.ttl,
+                "entries": len(self.backend),
+                "generation": self.backend.generation(self.namespace),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,139 @@
+# app/core/metrics.py
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Checkouts made by the current request, across every engine
+_request_checkouts: ContextVar[Optional[List[int]]] = ContextVar(
+    "request_checkouts", default=None
+)
+
+
+class RequestCheckouts:
+    """
+    Counts pool checkouts per HTTP request.
+
+    `start()` is called by a middleware before the request is handled; every
+    checkout made while handling it, on any engine, is added to that
+    request's counter. Checkouts made while a streamed response body is
+    sent happen after the request is finished and are not counted.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.requests_without_checkout = 0
+        self.requests_with_multiple_checkouts = 0
+        self.max_checkouts = 0
+
+    def start(self) -> List[int]:
+        """Begin counting for the current request and return its counter."""
+        counter = [0]
+        _request_checkouts.set(counter)
+        return counter
+
+    def finish(self, counter: List[int]) -> None:
+        """Fold a finished request's counter into the totals."""
+        checkouts = counter[0]
+        with self._lock:
+            self.requests += 1
+            self.requests_without_checkout += checkouts == 0
+            self.requests_with_multiple_checkouts += checkouts > 1
+            self.max_checkouts = max(self.max_checkouts, checkouts)
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Return the per-request checkout counters.
+
+        Returns:
+            Dict[str, int]: Request totals and the highest checkouts per request.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "requests_without_checkout": self.requests_without_checkout,
+                "requests_with_multiple_checkouts": (
+                    self.requests_with_multiple_checkouts
+                ),
+                "max_checkouts": self.max_checkouts,
+            }
+
+
+request_checkouts = RequestCheckouts()
+
+
+class PoolMetrics:
+    """
+    Collects connection pool checkout/checkin counters for an engine.
+
+    Counters are updated from SQLAlchemy pool events, so they cover every
+    session and raw connection that goes through the pool.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.peak_checked_out = 0
+        self.hold_seconds = 0.0
+
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, proxy) -> None:
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        with self._lock:
+            self.checkouts += 1
+            in_use = self.checkouts - self.checkins
+            self.peak_checked_out = max(self.peak_checked_out, in_use)
+        counter = _request_checkouts.get()
+        if counter is not None:
+            counter[0] += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        with self._lock:
+            self.checkins += 1
+            if checked_out_at is not None:
+                self.hold_seconds += time.perf_counter() - checked_out_at
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Return the current counters together with the live pool state.
+
+        Returns:
+            Dict[str, int]: Pool size, checked-out and overflow connections,
+            the cumulative event counters and the average time a connection
+            was held per checkout in microseconds.
+        """
+        pool = self.engine.pool
+        with self._lock:
+            return {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "idle": pool.checkedin(),
+                "peak_checked_out": self.peak_checked_out,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "avg_hold_us": int(self.hold_seconds * 1e6 / max(self.checkins, 1)),
+            }
@@ -0,0 +1,93 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from passlib.context import CryptContext
+
+# bcrypt cost factor; hashes made with a different cost are rehashed on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Processes shared by all requests of this API worker
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+# Hash/verify jobs an API worker may have queued or running at once
+PASSWORD_HASH_CONCURRENCY = int(
+    os.getenv("PASSWORD_HASH_CONCURRENCY", str(PASSWORD_HASH_WORKERS * 2))
+)
+
+# Pinning min/max to the configured cost makes `needs_update` flag any hash
+# created with another cost factor.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_slots = asyncio.Semaphore(PASSWORD_HASH_CONCURRENCY)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    # Forked children would inherit the parent's engines, pooled connections
+    # and event loop state; spawned ones only import this module.
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def hash_password(password: str) -> str:
+    """Hash `password` with bcrypt in the calling thread."""
+    return pwd_context.hash(password)
+
+
+def verify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify `password` in the calling thread.
+
+    Returns:
+        Tuple[bool, Optional[str]]: Whether it matched, and a replacement hash
+        when the stored one uses an outdated cost factor.
+    """
+    return pwd_context.verify_and_update(password, hashed)
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash many passwords in parallel across the hashing process pool."""
+    if not passwords:
+        return []
+    chunksize = max(1, len(passwords) // (PASSWORD_HASH_WORKERS * 4))
+    return list(_get_executor().map(hash_password, passwords, chunksize=chunksize))
+
+
+async def _run(func, *args):
+    async with _slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    """Async variant of `hash_password`, run in the hashing process pool."""
+    return await _run(hash_password, password)
+
+
+async def verify_and_update_async(
+    password: str, hashed: str
+) -> Tuple[bool, Optional[str]]:
+    """Async variant of `verify_and_update`, run in the hashing process pool."""
+    return await _run(verify_and_update, password, hashed)
+
+
+def shutdown_password_pool() -> None:
+    """Stop the hashing processes, e.g. on application shutdown."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -1,8 +1,80 @@
+from typing import Optional
+
+from sqlalchemy import Select, Update, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth.currentuser import CurrentUser
+from app.crud.filters import FilterSpec, apply_filters
+from app.crud.pagination import paginate
+from app.crud.search import match_any, relevance
 from app.models.buyers import Buyers as BuyersModel
-from app.schemas.buyers import BuyersBase
+from app.schemas.buyers import BuyersBase, BuyersFilter
+
+BUYER_FILTERS: FilterSpec = {
+    "name": (BuyersModel.name, "prefix"),
+    "contact": (BuyersModel.contact, "prefix"),
+}
+
+
+def _buyer_stmt(buyer_id: int) -> Select:
+    return select(BuyersModel).where(
+        BuyersModel.id == buyer_id, BuyersModel.is_deleted == False
+    )
+
+
+def _update_buyer_stmt(buyer_id: int, **values) -> Update:
+    return (
+        update(BuyersModel)
+        .where(BuyersModel.id == buyer_id, BuyersModel.is_deleted == False)
+        .values(**values)
+        .returning(BuyersModel)
+    )
+
+
+def _all_buyers_stmt(
+    skip: int,
+    limit: int,
+    filters: Optional[BuyersFilter] = None,
+    cursor: Optional[str] = None,
+) -> Select:
+    stmt = select(BuyersModel).where(
+        BuyersModel.is_deleted == False
+    )  # Exclude soft-deleted records
+
+    # Apply filters if provided
+    stmt = apply_filters(stmt, filters, BUYER_FILTERS)
+
+    # Apply pagination
+    return paginate(stmt, BuyersModel.id, skip, limit, cursor)
+
+
+def _search_buyers_stmt(query: str, limit: int) -> Select:
+    columns = (BuyersModel.name, BuyersModel.contact)
+    return (
+        select(BuyersModel)
+        .where(BuyersModel.is_deleted == False, match_any(query, *columns))
+        .order_by(relevance(query, *columns).desc(), BuyersModel.id)
+        .limit(limit)
+    )
+
+
+def export_buyers_stmt(filters: Optional[BuyersFilter] = None) -> Select:
+    """
+    Build the column select used to export active buyers, ordered by ID.
+
+    Args:
+        filters (Optional[BuyersFilter]): Name/contact prefix filters.
+
+    Returns:
+        Select: Select of the buyers table columns.
+    """
+    stmt = (
+        select(*BuyersModel.__table__.columns)
+        .where(BuyersModel.is_deleted == False)
+        .order_by(BuyersModel.id)
+    )
+    return apply_filters(stmt, filters, BUYER_FILTERS)
 
 
 def create_buyer(db: Session, buyer: BuyersBase, current_user: CurrentUser):
@@ -24,7 +96,6 @@ def create_buyer(db: Session, buyer: BuyersBase, current_user: CurrentUser):
 
     db.add(db_buyer)
     db.commit()
-    db.refresh(db_buyer)
     return db_buyer
 
 
@@ -39,43 +110,45 @@ def get_buyer(db: Session, buyer_id: int) -> BuyersModel | None:
     Returns:
         BuyersModel | None: Buyer object if found, else None.
     """
-    return (
-        db.query(BuyersModel)
-        .filter(BuyersModel.id == buyer_id, BuyersModel.is_deleted == False)
-        .first()
-    )
+    return db.scalars(_buyer_stmt(buyer_id)).first()
 
 
 def get_all_buyers(
-    db: Session, skip: int = 0, limit: int = 10, filters: dict = None
+    db: Session,
+    skip: int = 0,
+    limit: int = 10,
+    filters: Optional[BuyersFilter] = None,
+    cursor: Optional[str] = None,
 ) -> list[BuyersModel]:
     """
     Fetch all buyers from the database with pagination and optional filters.
 
     Args:
         db (Session): DB session.
-        skip (int): The number of records to skip (pagination).
+        skip (int): The number of records to skip (ignored when `cursor` is given).
         limit (int): The number of records to return.
-        filters (dict): Filters to apply to the query, e.g. {"name": "buyer name"}.
+        filters (Optional[BuyersFilter]): Name/contact prefix filters.
+        cursor (Optional[str]): Keyset cursor returned with the previous page.
 
     Returns:
         list[BuyersModel]: List of buyers with applied filters and pagination.
     """
-    query = db.query(BuyersModel).filter(
-        BuyersModel.is_deleted == False
-    )  # Exclude soft-deleted records
+    return db.scalars(_all_buyers_stmt(skip, limit, filters, cursor)).all()
 
-    # Apply filters if provided
-    if filters:
-        for field, value in filters.items():
-            query = query.filter(
-                getattr(BuyersModel, field).ilike(f"%{value}%")
-            )  # Case-insensitive search
 
-    # Apply pagination
-    query = query.offset(skip).limit(limit)
+def search_buyers(db: Session, query: str, limit: int = 20) -> list[BuyersModel]:
+    """
+    Search buyers by partial name or contact, best matches first.
+
+    Args:
+        db (Session): DB session.
+        query (str): Text to look for in the buyer's name or contact.
+        limit (int): The maximum number of results to return.
 
-    return query.all()
+    Returns:
+        list[BuyersModel]: Matching buyers ordered by trigram similarity.
+    """
+    return db.scalars(_search_buyers_stmt(query, limit)).all()
 
 
 def update_buyer(
@@ -93,22 +166,17 @@ def update_buyer(
     Returns:
         BuyersModel | None: Updated buyer or None if not found.
     """
-    buyer = get_buyer(db, buyer_id)
-    if not buyer:
-        return None
-
     update_data = {
         key: value
-        for key, value in buyer_update.dict(exclude_unset=True).items()
+        for key, value in buyer_update.dict(
+            exclude_unset=True, exclude={"resource_type"}
+        ).items()
         if value not in (None, "")
     }
-
-    for field, value in update_data.items():
-        setattr(buyer, field, value)
-
-    buyer.updated_by = current_user.username
+    buyer = db.scalars(
+        _update_buyer_stmt(buyer_id, **update_data, updated_by=current_user.username)
+    ).first()
     db.commit()
-    db.refresh(buyer)
     return buyer
 
 
@@ -126,12 +194,27 @@ def soft_delete_buyer(
     Returns:
         BuyersModel | None: The deleted buyer, or None if not found.
     """
-    buyer = get_buyer(db, buyer_id)
-    if not buyer:
-        return None
-
-    buyer.is_deleted = True
-    buyer.updated_by = current_user.username
+    buyer = db.scalars(
+        _update_buyer_stmt(buyer_id, is_deleted=True, updated_by=current_user.username)
+    ).first()
     db.commit()
-    db.refresh(buyer)
     return buyer
+
+
+# Async variants for handlers running on the asyncio engine
+
+
+async def get_buyer_async(db: AsyncSession, buyer_id: int) -> BuyersModel | None:
+    """Async variant of `get_buyer`."""
+    return (await db.scalars(_buyer_stmt(buyer_id))).first()
+
+
+async def get_all_buyers_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    filters: Optional[BuyersFilter] = None,
+    cursor: Optional[str] = None,
+) -> list[BuyersModel]:
+    """Async variant of `get_all_buyers`."""
+    return (await db.scalars(_all_buyers_stmt(skip, limit, filters, cursor))).all()
@@ -1,19 +1,115 @@
-from sqlalchemy import func
+import os
+
+from sqlalchemy import JSON, Select, distinct, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.models import sales, plots, payments, users
+from app.core.cache import QueryCache
+from app.models import areas, plots, rollups, sales, users
+
+# Dashboard results are cached per process and invalidated by the sales,
+# payments and plots writers after they commit.
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "60"))
+dashboard_cache = QueryCache("dashboard", ttl=DASHBOARD_CACHE_TTL)
+
+
+def _total_sales_amount_stmt() -> Select:
+    return select(func.sum(rollups.SalesMonthlyRollup.total_sales))
+
+
+def _total_plots_sold_stmt() -> Select:
+    return select(func.count(distinct(sales.Sales.plot_id)))
+
+
+def _remaining_inventory_stmt() -> Select:
+    return select(func.count(plots.Plots.id)).where(plots.Plots.status == "available")
+
+
+def _monthly_sales_trend_stmt() -> Select:
+    rollup = rollups.SalesMonthlyRollup
+    return (
+        select(rollup.month.label("month"), rollup.total_sales.label("total_sales"))
+        .where(rollup.sale_count > 0)
+        .order_by(rollup.month)
+    )
+
+
+def _pending_payments_stmt() -> Select:
+    return select(func.sum(rollups.PaymentsMonthlyRollup.pending_balance))
+
+
+def _sales_by_agent_stmt() -> Select:
+    rollup = rollups.SalesAgentRollup
+    return (
+        select(users.Users.full_name.label("agent"), rollup.total_sales)
+        .join(users.Users, users.Users.id == rollup.associate_id)
+        .where(rollup.sale_count > 0)
+        .order_by(rollup.total_sales.desc())
+    )
 
 
+def _revenue_by_location_stmt() -> Select:
+    rollup = rollups.SalesAreaRollup
+    return (
+        select(areas.Areas.name.label("location"), rollup.total_revenue)
+        .join(areas.Areas, areas.Areas.id == rollup.area_id)
+        .where(rollup.sale_count > 0)
+        .order_by(rollup.total_revenue.desc())
+    )
+
+
+def _json_rows(stmt: Select, order_by) -> Select:
+    """Collapse the rows of `stmt` into a single JSON array, preserving order."""
+    rows = stmt.order_by(None).subquery()
+    row = func.json_build_object(
+        *(item for c in rows.c for item in (literal_column(f"'{c.name}'"), c))
+    )
+    ordered = aggregate_order_by(row, order_by(rows))
+    return select(
+        func.coalesce(func.json_agg(ordered), literal_column("'[]'::json"), type_=JSON)
+    )
+
+
+def _summary_stmt() -> Select:
+    return select(
+        _total_sales_amount_stmt().scalar_subquery().label("total_sales_amount"),
+        _total_plots_sold_stmt().scalar_subquery().label("total_plots_sold"),
+        _remaining_inventory_stmt().scalar_subquery().label("remaining_inventory"),
+        _pending_payments_stmt().scalar_subquery().label("pending_payments"),
+        _json_rows(_monthly_sales_trend_stmt(), lambda rows: rows.c.month)
+        .scalar_subquery()
+        .label("monthly_sales"),
+        _json_rows(_sales_by_agent_stmt(), lambda rows: rows.c.total_sales.desc())
+        .scalar_subquery()
+        .label("sales_by_agent"),
+        _json_rows(
+            _revenue_by_location_stmt(), lambda rows: rows.c.total_revenue.desc()
+        )
+        .scalar_subquery()
+        .label("revenue_by_location"),
+    )
+
+
+def _summary_from_row(row) -> dict:
+    summary = dict(row._mapping)
+    summary["total_sales_amount"] = summary["total_sales_amount"] or 0.0
+    summary["pending_payments"] = summary["pending_payments"] or 0.0
+    return summary
+
+
+@dashboard_cache.cached
 def total_sales_amount(db: Session) -> float:
     """
-    Calculate the total sales amount from all sale records.
+    Calculate the total sales amount from the monthly sales rollup.
 
     Returns:
         float: The sum of all sale_amount values, or 0 if none exist.
     """
-    return db.query(func.sum(sales.Sales.sale_amount)).scalar() or 0.0
+    return db.execute(_total_sales_amount_stmt()).scalar() or 0.0
 
 
+@dashboard_cache.cached
 def total_plots_sold(db: Session) -> int:
     """
     Count the total number of distinct plots that have been sold.
@@ -21,89 +117,122 @@ def total_plots_sold(db: Session) -> int:
     Returns:
         int: Number of unique sold plot IDs.
     """
-    return db.query(sales.Sales.plot_id).distinct().count()
+    return db.execute(_total_plots_sold_stmt()).scalar()
 
 
+@dashboard_cache.cached
 def remaining_inventory(db: Session) -> int:
     """
-    Count the number of plots available in inventory (not archived or sold).
+    Count the number of plots available in inventory (not sold).
 
     Returns:
-        int: Number of plots with 'available' status and not archived.
+        int: Number of plots with 'available' status.
     """
-    return (
-        db.query(plots.Plots)
-        .filter(plots.Plots.status == "available", plots.Plots.archived.is_(False))
-        .count()
-    )
+    return db.execute(_remaining_inventory_stmt()).scalar()
 
 
+@dashboard_cache.cached
 def monthly_sales_trend(db: Session):
     """
-    Retrieve monthly aggregated sales amounts.
+    Retrieve monthly aggregated sales amounts from the monthly sales rollup.
 
     Returns:
-        List[Tuple[datetime, float]]: A list of (month, total_sales) tuples.
+        List[dict]: A list of {month, total_sales} rows.
     """
-    return (
-        db.query(
-            func.date_trunc("month", sales.Sales.sale_date).label("month"),
-            func.sum(sales.Sales.sale_amount).label("total_sales"),
-        )
-        .group_by("month")
-        .order_by("month")
-        .all()
-    )
+    return [dict(row._mapping) for row in db.execute(_monthly_sales_trend_stmt())]
 
 
+@dashboard_cache.cached
 def pending_payments(db: Session) -> float:
     """
-    Calculate the total pending payment amount.
+    Calculate the total pending payment amount from the payments rollup.
 
     Returns:
         float: Sum of remaining balances from non-deleted payments.
     """
-    return (
-        db.query(func.sum(payments.Payments.remaining_balance))
-        .filter(payments.Payments.is_deleted.is_(False))
-        .scalar()
-        or 0.0
-    )
+    return db.execute(_pending_payments_stmt()).scalar() or 0.0
 
 
+@dashboard_cache.cached
 def sales_by_agent(db: Session):
     """
-    Aggregate total sales per sales associate.
+    Retrieve total sales per sales associate from the agent rollup.
 
     Returns:
-        List[Tuple[str, float]]: A list of (agent_name, total_sales) tuples.
+        List[dict]: A list of {agent, total_sales} rows.
     """
-    return (
-        db.query(
-            users.Users.name.label("agent"),
-            func.sum(sales.Sales.sale_amount).label("total_sales"),
-        )
-        .join(sales.Sales.associate)
-        .group_by(users.name)
-        .order_by(func.sum(sales.Sales.sale_amount).desc())
-        .all()
-    )
+    return [dict(row._mapping) for row in db.execute(_sales_by_agent_stmt())]
 
 
+@dashboard_cache.cached
 def revenue_by_location(db: Session):
     """
-    Aggregate total revenue by plot location.
+    Retrieve total revenue by plot location from the area rollup.
 
     Returns:
-        List[Tuple[str, float]]: A list of (location, total_sales) tuples.
+        List[dict]: A list of {location, total_revenue} rows.
     """
-    return (
-        db.query(
-            plots.Plots.location.label("location"),
-            func.sum(sales.Sales.sale_amount).label("total_revenue"),
-        )
-        .join(sales.Sales.plot)
-        .group_by(plots.Plots.location)
-        .order_by(func.sum(sales.Sales.sale_amount).desc())
-        .all()
-    )
+    return [dict(row._mapping) for row in db.execute(_revenue_by_location_stmt())]
+
+
+@dashboard_cache.cached
+def dashboard_summary(db: Session) -> dict:
+    """
+    Compute every dashboard metric in a single database round trip.
+
+    Returns:
+        dict: Totals, inventory, pending payments and the monthly, per-agent
+        and per-location breakdowns keyed by metric name.
+    """
+    return _summary_from_row(db.execute(_summary_stmt()).one())
+
+
+# Async variants for handlers running on the asyncio engine
+
+
+@dashboard_cache.cached
+async def total_sales_amount_async(db: AsyncSession) -> float:
+    """Async variant of `total_sales_amount`."""
+    return (await db.execute(_total_sales_amount_stmt())).scalar() or 0.0
+
+
+@dashboard_cache.cached
+async def total_plots_sold_async(db: AsyncSession) -> int:
+    """Async variant of `total_plots_sold`."""
+    return (await db.execute(_total_plots_sold_stmt())).scalar()
+
+
+@dashboard_cache.cached
+async def remaining_inventory_async(db: AsyncSession) -> int:
+    """Async variant of `remaining_inventory`."""
+    return (await db.execute(_remaining_inventory_stmt())).scalar()
+
+
+@dashboard_cache.cached
+async def monthly_sales_trend_async(db: AsyncSession):
+    """Async variant of `monthly_sales_trend`."""
+    return [dict(row._mapping) for row in await db.execute(_monthly_sales_trend_stmt())]
+
+
+@dashboard_cache.cached
+async def pending_payments_async(db: AsyncSession) -> float:
+    """Async variant of `pending_payments`."""
+    return (await db.execute(_pending_payments_stmt())).scalar() or 0.0
+
+
+@dashboard_cache.cached
+async def sales_by_agent_async(db: AsyncSession):
+    """Async variant of `sales_by_agent`."""
+    return [dict(row._mapping) for row in await db.execute(_sales_by_agent_stmt())]
+
+
+@dashboard_cache.cached
+async def revenue_by_location_async(db: AsyncSession):
+    """Async variant of `revenue_by_location`."""
+    return [dict(row._mapping) for row in await db.execute(_revenue_by_location_stmt())]
+
+
+@dashboard_cache.cached
+async def dashboard_summary_async(db: AsyncSession) -> dict:
+    """Async variant of `dashboard_summary`."""
+    return _summary_from_row((await db.execute(_summary_stmt())).one())
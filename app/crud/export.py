@@ -0,0 +1,218 @@
+import csv
+import io
+import json
+from typing import Iterator, List, Literal, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Numeric, Row, Select
+from sqlalchemy.types import TypeEngine
+
+from app.config.database import SessionLocal
+
+# Rows fetched from the server-side cursor and encoded per chunk
+EXPORT_BATCH_SIZE = 1000
+# Rows per Arrow record batch / Parquet row group
+COLUMNAR_BATCH_SIZE = 10000
+
+ExportFormat = Literal["ndjson", "csv"]
+ColumnarFormat = Literal["parquet", "arrow"]
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def _encode_ndjson(columns: Sequence[str], rows: Sequence[Row]) -> str:
+    return "".join(
+        json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows
+    )
+
+
+def _encode_csv(rows: Sequence) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def stream_export(stmt: Select, fmt: ExportFormat) -> Iterator[str]:
+    """
+    Stream the rows of a column select as NDJSON lines or CSV.
+
+    Rows come from a server-side cursor in batches of `EXPORT_BATCH_SIZE`
+    and are encoded batch by batch, so memory stays flat however large the
+    table is. The export opens its own session: the request session is
+    already released by the time the response body is sent.
+
+    Args:
+        stmt (Select): Select of plain columns (not ORM entities).
+        fmt (ExportFormat): "ndjson" or "csv".
+
+    Yields:
+        str: Encoded chunks of rows, preceded by a header row for CSV.
+    """
+    with SessionLocal() as db:
+        result = db.execute(
+            stmt,
+            execution_options={"stream_results": True, "yield_per": EXPORT_BATCH_SIZE},
+        )
+        columns = list(result.keys())
+        if fmt == "csv":
+            yield _encode_csv([columns])
+        for rows in result.partitions():
+            if fmt == "csv":
+                yield _encode_csv(rows)
+            else:
+                yield _encode_ndjson(columns, rows)
+
+
+def export_response(stmt: Select, fmt: ExportFormat, name: str) -> StreamingResponse:
+    """
+    Build a streaming download of `stmt` in the requested format.
+
+    Args:
+        stmt (Select): Select of plain columns (not ORM entities).
+        fmt (ExportFormat): "ndjson" or "csv".
+        name (str): Base name of the downloaded file.
+
+    Returns:
+        StreamingResponse: Response streaming the encoded rows.
+    """
+    return StreamingResponse(
+        stream_export(stmt, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+def _arrow_type(sql_type: TypeEngine) -> pa.DataType:
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    if isinstance(sql_type, Numeric):
+        return pa.decimal128(sql_type.precision or 38, sql_type.scale or 0)
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def arrow_schema(stmt: Select) -> pa.Schema:
+    """
+    Derive the Arrow schema of a column select from its SQL types.
+
+    `Numeric(p, s)` columns map to `decimal128(p, s)`, so amounts keep
+    their exact value instead of going through float or string.
+
+    Args:
+        stmt (Select): Select of plain, labelled columns.
+
+    Returns:
+        pa.Schema: One field per selected column.
+    """
+    return pa.schema(
+        pa.field(column.name, _arrow_type(column.type))
+        for column in stmt.selected_columns
+    )
+
+
+class _ChunkSink:
+    """Write-only file object whose bytes are handed out as they are written."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_columnar(stmt: Select, fmt: ColumnarFormat) -> Iterator[bytes]:
+    """
+    Stream the rows of a column select as Parquet or an Arrow IPC stream.
+
+    Rows are read from a server-side cursor in record batches of
+    `COLUMNAR_BATCH_SIZE` (one Parquet row group each), and the encoded
+    bytes are sent after every batch.
+
+    Args:
+        stmt (Select): Select of plain, labelled columns.
+        fmt (ColumnarFormat): "parquet" or "arrow".
+
+    Yields:
+        bytes: Encoded file contents, in order.
+    """
+    schema = arrow_schema(stmt)
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    with SessionLocal() as db:
+        result = db.execute(
+            stmt,
+            execution_options={
+                "stream_results": True,
+                "yield_per": COLUMNAR_BATCH_SIZE,
+            },
+        )
+        for rows in result.partitions():
+            columns = zip(*rows)
+            writer.write_batch(
+                pa.record_batch(
+                    [
+                        pa.array(values, type=field.type)
+                        for values, field in zip(columns, schema)
+                    ],
+                    schema=schema,
+                )
+            )
+            yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def columnar_response(
+    stmt: Select, fmt: ColumnarFormat, name: str
+) -> StreamingResponse:
+    """
+    Build a streaming Parquet or Arrow download of `stmt`.
+
+    Args:
+        stmt (Select): Select of plain, labelled columns.
+        fmt (ColumnarFormat): "parquet" or "arrow".
+        name (str): Base name of the downloaded file.
+
+    Returns:
+        StreamingResponse: Response streaming the encoded file.
+    """
+    return StreamingResponse(
+        stream_columnar(stmt, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
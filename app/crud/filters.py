@@ -0,0 +1,93 @@
+import inspect
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from fastapi import Query
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, Select, func
+from sqlalchemy.orm import InstrumentedAttribute
+
+# Filter field name -> (column, operator)
+FilterSpec = Dict[str, Tuple[InstrumentedAttribute, str]]
+
+FilterModel = TypeVar("FilterModel", bound=BaseModel)
+
+
+def filter_query(model: Type[FilterModel]) -> Callable[..., FilterModel]:
+    """
+    Build a FastAPI dependency that reads a filter model from the query string.
+
+    Every field becomes its own optional query parameter (lists repeat the
+    parameter, e.g. `?status=sold&status=booked`), so the filters sit next to
+    the pagination parameters in the endpoint and the OpenAPI docs.
+
+    Args:
+        model (Type[FilterModel]): Filter model whose fields are all optional.
+
+    Returns:
+        Callable[..., FilterModel]: Dependency returning the populated model.
+    """
+    parameters = [
+        inspect.Parameter(
+            name,
+            inspect.Parameter.KEYWORD_ONLY,
+            default=Query(None, description=field.description),
+            annotation=field.annotation,
+        )
+        for name, field in model.model_fields.items()
+    ]
+
+    def dependency(**values: Any) -> FilterModel:
+        return model(**values)
+
+    dependency.__signature__ = inspect.Signature(parameters)
+    return dependency
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards in `value` so it is matched literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _condition(column: InstrumentedAttribute, op: str, value: Any) -> ColumnElement:
+    if op == "eq":
+        return column == value
+    if op == "in":
+        return column.in_(value)
+    if op == "gte":
+        return column >= value
+    if op == "lte":
+        return column <= value
+    if op == "prefix":
+        # Matches the lower(column) text_pattern_ops indexes on the models
+        pattern = f"{escape_like(value.lower())}%"
+        return func.lower(column).like(pattern, escape="\\")
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+
+def apply_filters(
+    stmt: Select, filters: Optional[BaseModel], spec: FilterSpec
+) -> Select:
+    """
+    Translate a typed filter model into index-friendly WHERE clauses.
+
+    Only fields that are set on `filters` are applied. Equality, `IN` and
+    range comparisons run against the raw column type; prefix search uses
+    `lower(column) LIKE 'value%'` so a functional btree index can serve it.
+
+    Args:
+        stmt (Select): Base query.
+        filters (Optional[BaseModel]): Filter values from the request.
+        spec (FilterSpec): Mapping of filter field to column and operator.
+
+    Returns:
+        Select: Query with the filter conditions applied.
+    """
+    if filters is None:
+        return stmt
+
+    for field, value in filters.model_dump(exclude_none=True).items():
+        if value == [] or field not in spec:
+            continue
+        column, op = spec[field]
+        stmt = stmt.where(_condition(column, op, value))
+    return stmt
@@ -0,0 +1,146 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from app.models.areas import Areas as AreasModel
+from app.models.users import Designations as DesignationsModel
+from app.models.users import Roles as RolesModel
+
+# Unknown names trigger a reload at most this often, so rows added by another
+# process become visible without letting bad input hammer the database.
+MISS_RELOAD_INTERVAL = 5.0  # seconds
+
+
+class LookupTable:
+    """
+    Process-wide name <-> ID map of a small, rarely changing table.
+
+    The map is loaded in full, and `version` is bumped on every load so
+    callers can tell when it changed. Writers to the table call
+    `invalidate()` after committing; the next lookup reloads it.
+
+    Args:
+        name (str): Name reported in the stats.
+        id_column (InstrumentedAttribute): Primary key column.
+        name_column (InstrumentedAttribute): Unique name column.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        id_column: InstrumentedAttribute,
+        name_column: InstrumentedAttribute,
+    ) -> None:
+        self.name = name
+        self.id_column = id_column
+        self.name_column = name_column
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._loaded = False
+        self._loaded_at = 0.0
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    def _stmt(self) -> Select:
+        return select(self.id_column, self.name_column)
+
+    def _fill(self, rows) -> None:
+        ids = {name: id_ for id_, name in rows if name is not None}
+        with self._lock:
+            self._ids = ids
+            self._names = {id_: name for name, id_ in ids.items()}
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+            self.version += 1
+            self.loads += 1
+
+    def _should_reload(self, found: bool) -> bool:
+        with self._lock:
+            if found:
+                self.hits += 1
+                return False
+            self.misses += 1
+            return (
+                not self._loaded
+                or time.monotonic() - self._loaded_at >= MISS_RELOAD_INTERVAL
+            )
+
+    def load(self, db: Session) -> None:
+        """Reload the whole table."""
+        self._fill(db.execute(self._stmt()).all())
+
+    async def load_async(self, db: AsyncSession) -> None:
+        """Async variant of `load`."""
+        self._fill((await db.execute(self._stmt())).all())
+
+    def invalidate(self) -> None:
+        """Mark the map stale. Call after committing a write to the table."""
+        with self._lock:
+            self._loaded = False
+
+    def id_for(self, db: Session, name: str) -> Optional[int]:
+        """
+        Resolve a name to its ID, reloading the table if it is not known yet.
+
+        Returns:
+            Optional[int]: The ID, or None if no row has that name.
+        """
+        if self._should_reload(self._loaded and name in self._ids):
+            self.load(db)
+        return self._ids.get(name)
+
+    def name_for(self, db: Session, id_: int) -> Optional[str]:
+        """Resolve an ID to its name, reloading the table if it is not known."""
+        if self._should_reload(self._loaded and id_ in self._names):
+            self.load(db)
+        return self._names.get(id_)
+
+    async def name_for_async(self, db: AsyncSession, id_: int) -> Optional[str]:
+        """Async variant of `name_for`."""
+        if self._should_reload(self._loaded and id_ in self._names):
+            await self.load_async(db)
+        return self._names.get(id_)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return counters for monitoring.
+
+        Returns:
+            Dict[str, Any]: Size, version, hits, misses and loads.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._ids),
+                "loaded": self._loaded,
+                "version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+            }
+
+
+roles_lookup = LookupTable("roles", RolesModel.id, RolesModel.name)
+designations_lookup = LookupTable(
+    "designations", DesignationsModel.id, DesignationsModel.title
+)
+areas_lookup = LookupTable("areas", AreasModel.id, AreasModel.name)
+
+LOOKUP_TABLES = (roles_lookup, designations_lookup, areas_lookup)
+
+
+def reload_lookups(db: Session) -> None:
+    """Load every lookup table, e.g. at startup or after a manual data fix."""
+    for table in LOOKUP_TABLES:
+        table.load(db)
+
+
+def lookup_stats() -> Dict[str, Dict[str, Any]]:
+    """Return the stats of every lookup table keyed by table name."""
+    return {table.name: table.stats() for table in LOOKUP_TABLES}
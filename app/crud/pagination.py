@@ -0,0 +1,86 @@
+import base64
+import binascii
+import json
+from typing import Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import Select
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Encode the key of the last row of a page as an opaque cursor.
+
+    Args:
+        last_id (int): ID of the last row returned.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): Cursor received from the client.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+
+    Returns:
+        int: ID of the last row of the previous page.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(padded))["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(
+    stmt: Select,
+    id_column: InstrumentedAttribute,
+    skip: int,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Select:
+    """
+    Apply keyset pagination when a cursor is given, offset pagination otherwise.
+
+    Both modes order by `id_column` so pages are stable while rows are added.
+
+    Args:
+        stmt (Select): Base query.
+        id_column (InstrumentedAttribute): Primary key column to page on.
+        skip (int): Offset, used only without a cursor.
+        limit (int): Page size.
+        cursor (Optional[str]): Cursor from the previous page.
+
+    Returns:
+        Select: Paginated query.
+    """
+    stmt = stmt.order_by(id_column).limit(limit)
+    if cursor:
+        return stmt.where(id_column > decode_cursor(cursor))
+    return stmt.offset(skip)
+
+
+def next_cursor(rows: Sequence, limit: int) -> Optional[str]:
+    """
+    Build the cursor for the page after `rows`.
+
+    Args:
+        rows (Sequence): Rows of the current page, ordered by ID.
+        limit (int): Requested page size.
+
+    Returns:
+        Optional[str]: Cursor for the next page, or None on the last page.
+    """
+    if limit and len(rows) == limit:
+        return encode_cursor(rows[-1].id)
+    return None
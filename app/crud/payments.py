@@ -1,10 +1,82 @@
-from typing import Dict, List, Optional
+from typing import List, Optional
 
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth.currentuser import CurrentUser
+from app.crud.dashboard import dashboard_cache
+from app.crud.filters import FilterSpec, apply_filters
+from app.crud.pagination import paginate
+from app.crud.rollups import apply_payment
 from app.models.payments import Payments as PaymentsModel
-from app.schemas.payments import PaymentBase, PaymentUpdate
+from app.models.sales import Sales as SalesModel
+from app.schemas.payments import PaymentBase, PaymentFilter, PaymentUpdate
+
+# Payment fields that feed the dashboard rollups
+ROLLUP_FIELDS = ("payment_date", "remaining_balance")
+
+PAYMENT_FILTERS: FilterSpec = {
+    "sale_id": (PaymentsModel.sale_id, "in"),
+    "payment_mode": (PaymentsModel.payment_mode, "eq"),
+    "payment_date_from": (PaymentsModel.payment_date, "gte"),
+    "payment_date_to": (PaymentsModel.payment_date, "lte"),
+    "amount_paid_min": (PaymentsModel.amount_paid, "gte"),
+    "amount_paid_max": (PaymentsModel.amount_paid, "lte"),
+}
+
+
+def _payment_stmt(payment_id: int) -> Select:
+    return select(PaymentsModel).where(
+        PaymentsModel.id == payment_id, PaymentsModel.is_deleted.is_(False)
+    )
+
+
+def _lock_payment(db: Session, payment_id: int) -> Optional[PaymentsModel]:
+    # Locked until commit, so concurrent writers cannot both subtract the
+    # same old values from the rollups
+    return db.scalars(
+        _payment_stmt(payment_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).first()
+
+
+def _touch_sale(db: Session, sale_id: int) -> None:
+    # The sales ledger carries payment totals, so a payment change must move
+    # its sale past the incremental export watermark
+    db.execute(
+        update(SalesModel).where(SalesModel.id == sale_id).values(update_dt=func.now())
+    )
+
+
+def _all_payments_stmt(
+    skip: int,
+    limit: int,
+    filters: Optional[PaymentFilter] = None,
+    cursor: Optional[str] = None,
+) -> Select:
+    stmt = select(PaymentsModel).where(PaymentsModel.is_deleted.is_(False))
+    stmt = apply_filters(stmt, filters, PAYMENT_FILTERS)
+    return paginate(stmt, PaymentsModel.id, skip, limit, cursor)
+
+
+def export_payments_stmt(filters: Optional[PaymentFilter] = None) -> Select:
+    """
+    Build the column select used to export active payments, ordered by ID.
+
+    Args:
+        filters (Optional[PaymentFilter]): Optional typed filters.
+
+    Returns:
+        Select: Select of the payments table columns.
+    """
+    stmt = (
+        select(*PaymentsModel.__table__.columns)
+        .where(PaymentsModel.is_deleted.is_(False))
+        .order_by(PaymentsModel.id)
+    )
+    return apply_filters(stmt, filters, PAYMENT_FILTERS)
 
 
 def create_payment(
@@ -23,8 +95,10 @@ def create_payment(
     """
     db_payment = PaymentsModel(**payment.dict(exclude={"resource_type"}))
     db.add(db_payment)
+    apply_payment(db, payment.payment_date, payment.remaining_balance)
+    _touch_sale(db, payment.sale_id)
     db.commit()
-    db.refresh(db_payment)
+    dashboard_cache.invalidate()
     return db_payment
 
 
@@ -39,39 +113,30 @@ def get_payment(db: Session, payment_id: int) -> Optional[PaymentsModel]:
     Returns:
         Optional[PaymentsModel]: The payment if found, otherwise None.
     """
-    return (
-        db.query(PaymentsModel)
-        .filter(PaymentsModel.id == payment_id, PaymentsModel.is_deleted.is_(False))
-        .first()
-    )
+    return db.scalars(_payment_stmt(payment_id)).first()
 
 
 def get_all_payments(
     db: Session,
     skip: int = 0,
     limit: int = 100,
-    filters: Optional[Dict[str, str]] = None,
+    filters: Optional[PaymentFilter] = None,
+    cursor: Optional[str] = None,
 ) -> List[PaymentsModel]:
     """
     Retrieve a paginated list of payments, with optional filters.
 
     Args:
         db (Session): SQLAlchemy session.
-        skip (int): Number of records to skip.
+        skip (int): Number of records to skip (ignored when `cursor` is given).
         limit (int): Max number of records to return.
-        filters (Optional[Dict[str, str]]): Optional field-based filters.
+        filters (Optional[PaymentFilter]): Optional typed filters.
+        cursor (Optional[str]): Keyset cursor returned with the previous page.
 
     Returns:
         List[PaymentsModel]: List of payment records.
     """
-    query = db.query(PaymentsModel).filter(PaymentsModel.is_deleted.is_(False))
-
-    if filters:
-        for field, value in filters.items():
-            if hasattr(PaymentsModel, field):
-                query = query.filter(getattr(PaymentsModel, field).ilike(f"%{value}%"))
-
-    return query.offset(skip).limit(limit).all()
+    return db.scalars(_all_payments_stmt(skip, limit, filters, cursor)).all()
 
 
 def update_payment(
@@ -92,7 +157,7 @@ def update_payment(
     Returns:
         Optional[PaymentsModel]: Updated payment record, or None if not found.
     """
-    db_payment = get_payment(db, payment_id)
+    db_payment = _lock_payment(db, payment_id)
     if not db_payment:
         return None
 
@@ -102,11 +167,18 @@ def update_payment(
         if value not in (None, "")
     }
 
+    before = {field: getattr(db_payment, field) for field in ROLLUP_FIELDS}
     for field, value in update_data.items():
         setattr(db_payment, field, value)
 
+    after = {field: getattr(db_payment, field) for field in ROLLUP_FIELDS}
+    if after != before:
+        apply_payment(db, **before, sign=-1)
+        apply_payment(db, **after)
+    _touch_sale(db, db_payment.sale_id)
+
     db.commit()
-    db.refresh(db_payment)
+    dashboard_cache.invalidate()
     return db_payment
 
 
@@ -126,13 +198,15 @@ def soft_delete_payments(
     Returns:
         Optional[PaymentsModel]: The updated payment record, or None if not found.
     """
-    db_payment = get_payment(db, payment_id)
+    db_payment = _lock_payment(db, payment_id)
     if not db_payment or db_payment.is_deleted:
         return None
 
     db_payment.is_deleted = True
+    apply_payment(db, db_payment.payment_date, db_payment.remaining_balance, sign=-1)
+    _touch_sale(db, db_payment.sale_id)
     db.commit()
-    db.refresh(db_payment)
+    dashboard_cache.invalidate()
     return db_payment
 
 
@@ -147,3 +221,24 @@ def read_deleted_payments(db: Session) -> List[PaymentsModel]:
         List[PaymentsModel]: List of soft-deleted payment records.
     """
     return db.query(PaymentsModel).filter(PaymentsModel.is_deleted.is_(True)).all()
+
+
+# Async variants for handlers running on the asyncio engine
+
+
+async def get_payment_async(
+    db: AsyncSession, payment_id: int
+) -> Optional[PaymentsModel]:
+    """Async variant of `get_payment`."""
+    return (await db.scalars(_payment_stmt(payment_id))).first()
+
+
+async def get_all_payments_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[PaymentFilter] = None,
+    cursor: Optional[str] = None,
+) -> List[PaymentsModel]:
+    """Async variant of `get_all_payments`."""
+    return (await db.scalars(_all_payments_stmt(skip, limit, filters, cursor))).all()
@@ -1,14 +1,70 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
+from sqlalchemy import Select, Update, column, insert, or_, select, update, values
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.logger import get_logger
+from app.crud.dashboard import dashboard_cache
+from app.crud.filters import FilterSpec, apply_filters
+from app.crud.pagination import paginate
+from app.crud.search import match_any, relevance
+from app.models.areas import Areas as AreasModel
+from app.models.images import Images as ImagesModel
 from app.models.plots import Plots as PlotsModel
-from app.schemas.plots import PlotBase, PlotUpdate
+from app.schemas.plots import (
+    BulkPlotItem,
+    BulkPlotResult,
+    PlotBase,
+    PlotBulkUpdate,
+    PlotFilter,
+    PlotUpdate,
+)
 
 logger = get_logger(__name__)
 
+PLOT_FILTERS: FilterSpec = {
+    "status": (PlotsModel.status, "in"),
+    "area_id": (PlotsModel.area_id, "in"),
+    "price_min": (PlotsModel.price, "gte"),
+    "price_max": (PlotsModel.price, "lte"),
+}
+
+
+def _plot_stmt(plot_id: int) -> Select:
+    return select(PlotsModel).where(PlotsModel.id == plot_id)
+
+
+def _update_plot_stmt(plot_id: int, **values) -> Update:
+    return (
+        update(PlotsModel)
+        .where(PlotsModel.id == plot_id)
+        .values(**values)
+        .returning(PlotsModel)
+    )
+
+
+def _all_plots_stmt(
+    skip: int,
+    limit: int,
+    filters: Optional[PlotFilter] = None,
+    cursor: Optional[str] = None,
+) -> Select:
+    stmt = apply_filters(select(PlotsModel), filters, PLOT_FILTERS)
+    return paginate(stmt, PlotsModel.id, skip, limit, cursor)
+
+
+def _search_plots_stmt(query: str, limit: int) -> Select:
+    columns = (PlotsModel.dimensions, PlotsModel.assigned_to)
+    matching_areas = select(AreasModel.id).where(match_any(query, AreasModel.name))
+    return (
+        select(PlotsModel)
+        .where(or_(match_any(query, *columns), PlotsModel.area_id.in_(matching_areas)))
+        .order_by(relevance(query, *columns).desc(), PlotsModel.id)
+        .limit(limit)
+    )
+
 
 def create_plot(db: Session, plot_data: PlotBase, user: str) -> PlotsModel:
     """
@@ -30,7 +86,7 @@ def create_plot(db: Session, plot_data: PlotBase, user: str) -> PlotsModel:
         db_plot = PlotsModel(**new_plot)
         db.add(db_plot)
         db.commit()
-        db.refresh(db_plot)
+        dashboard_cache.invalidate()
         logger.info(f"Plot created successfully by {user}: ID {db_plot.id}")
         return db_plot
     except SQLAlchemyError as e:
@@ -39,6 +95,160 @@ def create_plot(db: Session, plot_data: PlotBase, user: str) -> PlotsModel:
         raise
 
 
+def _existing_ids(db: Session, id_column, ids: Set[int]) -> Set[int]:
+    if not ids:
+        return set()
+    return set(db.scalars(select(id_column).where(id_column.in_(ids))))
+
+
+def _existing_references(db: Session, plots: list) -> Tuple[Set[int], Set[int]]:
+    """Return which of the areas and images referenced by `plots` exist."""
+    # Bulk updates cannot move plots between areas and carry no area_id
+    area_ids = {
+        plot.area_id for plot in plots if getattr(plot, "area_id", None) is not None
+    }
+    image_ids = {plot.image_id for plot in plots if plot.image_id is not None}
+    return (
+        _existing_ids(db, AreasModel.id, area_ids),
+        _existing_ids(db, ImagesModel.id, image_ids),
+    )
+
+
+def _reference_error(
+    row: dict, area_ids: Set[int], image_ids: Set[int]
+) -> Optional[str]:
+    """Return why `row` points at a missing area or image, if it does."""
+    area_id = row.get("area_id")
+    if area_id is not None and area_id not in area_ids:
+        return f"Area not found: {area_id}"
+    image_id = row.get("image_id")
+    if image_id is not None and image_id not in image_ids:
+        return f"Image not found: {image_id}"
+    return None
+
+
+def bulk_create_plots(db: Session, plots: List[PlotBase], user: str) -> BulkPlotResult:
+    """
+    Create many plots in one transaction, reporting rejected items.
+
+    Referenced areas and images are checked with one query each; the
+    remaining rows are written with a single multi-row
+    `INSERT ... RETURNING id`.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        plots (List[PlotBase]): Plots to create.
+        user (str): Username of the creator.
+
+    Returns:
+        BulkPlotResult: The new plot IDs and the rejected items, in order.
+    """
+    items = [BulkPlotItem(index=index) for index in range(len(plots))]
+    area_ids, image_ids = _existing_references(db, plots)
+    rows: List[Tuple[int, dict]] = []
+    for index, plot in enumerate(plots):
+        row = plot.dict(exclude={"resource_type"})
+        items[index].detail = _reference_error(row, area_ids, image_ids)
+        if items[index].detail is None:
+            row.update(created_by=user, updated_by=user)
+            rows.append((index, row))
+
+    if rows:
+        try:
+            new_ids = db.scalars(
+                insert(PlotsModel).returning(
+                    PlotsModel.id, sort_by_parameter_order=True
+                ),
+                [row for _, row in rows],
+            ).all()
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Error bulk creating plots: {e}")
+            raise
+        dashboard_cache.invalidate()
+        for (index, _), plot_id in zip(rows, new_ids, strict=True):
+            items[index].id = plot_id
+
+    logger.info(f"{len(rows)} of {len(plots)} plots bulk created by {user}")
+    return BulkPlotResult(succeeded=len(rows), items=items)
+
+
+def _bulk_update_stmt(fields: Tuple[str, ...], rows: List[dict], user: str) -> Update:
+    """Build `UPDATE plots ... FROM (VALUES ...)` setting `fields` per row."""
+    table = PlotsModel.__table__
+    data = values(
+        column("id", table.c.id.type),
+        *(column(field, table.c[field].type) for field in fields),
+        name="data",
+    ).data([(row["id"], *(row[field] for field in fields)) for row in rows])
+    return (
+        update(PlotsModel)
+        .where(PlotsModel.id == data.c.id)
+        .values(**{field: data.c[field] for field in fields}, updated_by=user)
+        .returning(PlotsModel.id)
+    )
+
+
+def bulk_update_plots(
+    db: Session, plots: List[PlotBulkUpdate], user: str
+) -> BulkPlotResult:
+    """
+    Update many plots in one transaction, reporting rejected items.
+
+    As in `update_plot`, fields that are unset, None or empty are left
+    unchanged. Items changing the same set of fields are written with one
+    `UPDATE ... FROM (VALUES ...)` statement.
+
+    Args:
+        db (Session): SQLAlchemy session.
+        plots (List[PlotBulkUpdate]): Plot IDs and the data to update.
+        user (str): Username performing the update.
+
+    Returns:
+        BulkPlotResult: The updated plot IDs and the rejected items, in order.
+    """
+    items = [BulkPlotItem(index=index, id=plot.id) for index, plot in enumerate(plots)]
+    area_ids, image_ids = _existing_references(db, plots)
+    groups: Dict[Tuple[str, ...], List[Tuple[int, dict]]] = {}
+    seen: Set[int] = set()
+    for index, plot in enumerate(plots):
+        row = {
+            key: value
+            for key, value in plot.dict(exclude_unset=True).items()
+            if value not in (None, "")
+        }
+        if plot.id in seen:
+            items[index].detail = f"Duplicate plot ID in request: {plot.id}"
+        else:
+            items[index].detail = _reference_error(row, area_ids, image_ids)
+        seen.add(plot.id)
+        if items[index].detail is None:
+            fields = tuple(sorted(key for key in row if key != "id"))
+            groups.setdefault(fields, []).append((index, row))
+
+    updated: Set[int] = set()
+    try:
+        for fields, rows in groups.items():
+            stmt = _bulk_update_stmt(fields, [row for _, row in rows], user)
+            updated.update(db.scalars(stmt))
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Error bulk updating plots: {e}")
+        raise
+    if updated:
+        dashboard_cache.invalidate()
+
+    for rows in groups.values():
+        for index, row in rows:
+            if row["id"] not in updated:
+                items[index].detail = "Plot not found"
+
+    logger.info(f"{len(updated)} of {len(plots)} plots bulk updated by {user}")
+    return BulkPlotResult(succeeded=len(updated), items=items)
+
+
 def get_plot(db: Session, plot_id: int) -> Optional[PlotsModel]:
     """
     Retrieve a plot by its ID.
@@ -51,23 +261,31 @@ def get_plot(db: Session, plot_id: int) -> Optional[PlotsModel]:
         Optional[Plots]: Plot instance if found, else None.
     """
     logger.debug(f"Fetching plot with ID: {plot_id}")
-    return db.query(PlotsModel).filter(PlotsModel.id == plot_id).first()
+    return db.scalars(_plot_stmt(plot_id)).first()
 
 
-def get_all_plots(db: Session, skip: int = 0, limit: int = 10) -> List[PlotsModel]:
+def get_all_plots(
+    db: Session,
+    skip: int = 0,
+    limit: int = 10,
+    filters: Optional[PlotFilter] = None,
+    cursor: Optional[str] = None,
+) -> List[PlotsModel]:
     """
-    Retrieve all plots with pagination.
+    Retrieve all plots with pagination and optional filters.
 
     Args:
         db (Session): SQLAlchemy session.
-        skip (int): Number of records to skip.
+        skip (int): Number of records to skip (ignored when `cursor` is given).
         limit (int): Max number of records to return.
+        filters (Optional[PlotFilter]): Optional typed filters.
+        cursor (Optional[str]): Keyset cursor returned with the previous page.
 
     Returns:
         List[Plots]: List of plot records.
     """
     logger.debug(f"Fetching plots: skip={skip}, limit={limit}")
-    return db.query(PlotsModel).offset(skip).limit(limit).all()
+    return db.scalars(_all_plots_stmt(skip, limit, filters, cursor)).all()
 
 
 def update_plot(
@@ -85,24 +303,21 @@ def update_plot(
     Returns:
         Optional[Plots]: Updated plot if found and updated, else None.
     """
-    plot = get_plot(db, plot_id)
-    if not plot:
-        logger.warning(f"Plot ID {plot_id} not found for update by {user}")
-        return None
-
     logger.debug(f"Updating plot ID {plot_id} by {user}")
     update_data = {
         key: value
         for key, value in plot_data.dict(exclude_unset=True).items()
         if value not in (None, "")
     }
-
-    for field, value in update_data.items():
-        setattr(plot, field, value)
-
-    plot.updated_by = user
+    plot = db.scalars(
+        _update_plot_stmt(plot_id, **update_data, updated_by=user)
+    ).first()
     db.commit()
-    db.refresh(plot)
+    if not plot:
+        logger.warning(f"Plot ID {plot_id} not found for update by {user}")
+        return None
+
+    dashboard_cache.invalidate()
     logger.info(f"Plot ID {plot_id} updated successfully by {user}")
     return plot
 
@@ -123,8 +338,48 @@ def delete_plot(db: Session, plot_id: int, user: str) -> bool:
     if plot:
         db.delete(plot)
         db.commit()
+        dashboard_cache.invalidate()
         logger.info(f"Plot ID {plot_id} deleted by {user}")
         return True
 
     logger.warning(f"Plot ID {plot_id} not found for deletion by {user}")
     return False
+
+
+# Async variants for handlers running on the asyncio engine
+
+
+async def get_plot_async(db: AsyncSession, plot_id: int) -> Optional[PlotsModel]:
+    """Async variant of `get_plot`."""
+    logger.debug(f"Fetching plot with ID: {plot_id}")
+    return (await db.scalars(_plot_stmt(plot_id))).first()
+
+
+async def get_all_plots_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    filters: Optional[PlotFilter] = None,
+    cursor: Optional[str] = None,
+) -> List[PlotsModel]:
+    """Async variant of `get_all_plots`."""
+    logger.debug(f"Fetching plots: skip={skip}, limit={limit}")
+    return (await db.scalars(_all_plots_stmt(skip, limit, filters, cursor))).all()
+
+
+async def search_plots_async(
+    db: AsyncSession, query: str, limit: int = 20
+) -> List[PlotsModel]:
+    """
+    Search plots by dimensions, assignee or area name, best matches first.
+
+    Args:
+        db (AsyncSession): Async SQLAlchemy session.
+        query (str): Text to search for.
+        limit (int): Max number of results to return.
+
+    Returns:
+        List[Plots]: Matching plots ordered by trigram similarity.
+    """
+    logger.debug(f"Searching plots: query={query!r}, limit={limit}")
+    return (await db.scalars(_search_plots_stmt(query, limit))).all()
@@ -0,0 +1,198 @@
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from sqlalchemy import Select, delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.logger import get_logger
+from app.models.payments import Payments as PaymentsModel
+from app.models.plots import Plots as PlotsModel
+from app.models.rollups import (
+    PaymentsMonthlyRollup,
+    SalesAgentRollup,
+    SalesAreaRollup,
+    SalesMonthlyRollup,
+)
+from app.models.sales import Sales as SalesModel
+
+logger = get_logger(__name__)
+
+
+def _month_of(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _bump(db: Session, model, key: Dict, deltas: Dict) -> None:
+    """Add `deltas` to the rollup row identified by `key`, creating it if needed."""
+    stmt = pg_insert(model).values(**key, **deltas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(key),
+        set_={
+            column: getattr(model, column) + stmt.excluded[column] for column in deltas
+        },
+    )
+    db.execute(stmt)
+
+
+def apply_sale(
+    db: Session,
+    sale_date: date,
+    associate_id: int,
+    plot_id: int,
+    sale_amount: Decimal,
+    sign: int = 1,
+) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) a sale's contribution to the sales rollups.
+
+    Runs inside the caller's transaction so the rollups commit together with
+    the sale itself.
+
+    Args:
+        db (Session): SQLAlchemy session.
+        sale_date (date): Date of the sale.
+        associate_id (int): Associate who handled the sale.
+        plot_id (int): Plot that was sold.
+        sale_amount (Decimal): Amount of the sale.
+        sign (int): 1 to add the sale, -1 to remove it.
+    """
+    amount = sign * Decimal(sale_amount)
+    _bump(
+        db,
+        SalesMonthlyRollup,
+        {"month": _month_of(sale_date)},
+        {"total_sales": amount, "sale_count": sign},
+    )
+    _bump(
+        db,
+        SalesAgentRollup,
+        {"associate_id": associate_id},
+        {"total_sales": amount, "sale_count": sign},
+    )
+    area_id = db.scalar(select(PlotsModel.area_id).where(PlotsModel.id == plot_id))
+    if area_id is not None:
+        _bump(
+            db,
+            SalesAreaRollup,
+            {"area_id": area_id},
+            {"total_revenue": amount, "sale_count": sign},
+        )
+
+
+def apply_payment(
+    db: Session, payment_date: date, remaining_balance: Decimal, sign: int = 1
+) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) an active payment's pending balance.
+
+    Args:
+        db (Session): SQLAlchemy session.
+        payment_date (date): Date of the payment.
+        remaining_balance (Decimal): Remaining balance recorded on the payment.
+        sign (int): 1 to add the payment, -1 to remove it.
+    """
+    _bump(
+        db,
+        PaymentsMonthlyRollup,
+        {"month": _month_of(payment_date)},
+        {
+            "pending_balance": sign * Decimal(remaining_balance),
+            "payment_count": sign,
+        },
+    )
+
+
+# Full recompute queries, used to rebuild and to verify the rollups
+
+
+def _recompute_statements() -> Dict[type, Select]:
+    month = func.date_trunc("month", SalesModel.sale_date).cast(
+        SalesModel.sale_date.type
+    )
+    payment_month = func.date_trunc("month", PaymentsModel.payment_date).cast(
+        PaymentsModel.payment_date.type
+    )
+    return {
+        SalesMonthlyRollup: select(
+            month.label("month"),
+            func.sum(SalesModel.sale_amount).label("total_sales"),
+            func.count(SalesModel.id).label("sale_count"),
+        ).group_by(month),
+        SalesAgentRollup: select(
+            SalesModel.associate_id.label("associate_id"),
+            func.sum(SalesModel.sale_amount).label("total_sales"),
+            func.count(SalesModel.id).label("sale_count"),
+        ).group_by(SalesModel.associate_id),
+        SalesAreaRollup: select(
+            PlotsModel.area_id.label("area_id"),
+            func.sum(SalesModel.sale_amount).label("total_revenue"),
+            func.count(SalesModel.id).label("sale_count"),
+        )
+        .join(SalesModel.plot)
+        .group_by(PlotsModel.area_id),
+        PaymentsMonthlyRollup: select(
+            payment_month.label("month"),
+            func.sum(PaymentsModel.remaining_balance).label("pending_balance"),
+            func.count(PaymentsModel.id).label("payment_count"),
+        )
+        .where(PaymentsModel.is_deleted.is_(False))
+        .group_by(payment_month),
+    }
+
+
+def rebuild_rollups(db: Session) -> None:
+    """
+    Replace every rollup table with a full recompute from the source tables.
+
+    Args:
+        db (Session): SQLAlchemy session. The caller commits.
+    """
+    for model, stmt in _recompute_statements().items():
+        db.execute(delete(model))
+        columns = [c.name for c in stmt.selected_columns]
+        db.execute(insert(model).from_select(columns, stmt))
+    logger.info("Dashboard rollups rebuilt from source tables")
+
+
+def check_rollups(db: Session) -> List[Dict[str, Optional[str]]]:
+    """
+    Compare every rollup table against a full recompute.
+
+    Rollup rows whose counts have dropped to zero are treated as absent.
+
+    Args:
+        db (Session): SQLAlchemy session.
+
+    Returns:
+        List[Dict[str, Optional[str]]]: One entry per mismatching row with the
+        table, key, stored value and expected value. Empty when consistent.
+    """
+    mismatches = []
+    for model, stmt in _recompute_statements().items():
+        key_names = [c.name for c in model.__table__.primary_key.columns]
+        value_names = [
+            c.name for c in model.__table__.columns if c.name not in key_names
+        ]
+
+        def index(rows):
+            return {
+                tuple(row[k] for k in key_names): tuple(row[v] for v in value_names)
+                for row in rows
+                if row[value_names[-1]]
+            }
+
+        stored = index(db.execute(select(model.__table__)).mappings())
+        expected = index(db.execute(stmt).mappings())
+        for key in stored.keys() | expected.keys():
+            if stored.get(key) != expected.get(key):
+                mismatches.append(
+                    {
+                        "table": model.__tablename__,
+                        "key": str(key),
+                        "stored": str(stored.get(key)),
+                        "expected": str(expected.get(key)),
+                    }
+                )
+    return mismatches
@@ -1,10 +1,146 @@
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import List, Optional
 
+from sqlalchemy import Numeric, Select, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.auth.currentuser import CurrentUser
+from app.crud.dashboard import dashboard_cache
+from app.crud.filters import FilterSpec, apply_filters
+from app.crud.pagination import paginate
+from app.crud.rollups import apply_sale
+from app.models.buyers import Buyers as BuyersModel
+from app.models.payments import Payments as PaymentsModel
+from app.models.plots import Plots as PlotsModel
 from app.models.sales import Sales as SalesModel
-from app.schemas.sales import SalesBase, SaleUpdate
+from app.models.users import Users as UsersModel
+from app.schemas.sales import SalesBase, SalesFilter, SaleUpdate
+
+# Sale fields that feed the dashboard rollups
+ROLLUP_FIELDS = ("sale_date", "associate_id", "plot_id", "sale_amount")
+
+SALES_FILTERS: FilterSpec = {
+    "plot_id": (SalesModel.plot_id, "in"),
+    "buyer_id": (SalesModel.buyer_id, "in"),
+    "associate_id": (SalesModel.associate_id, "in"),
+    "payment_mode": (SalesModel.payment_mode, "eq"),
+    "sale_date_from": (SalesModel.sale_date, "gte"),
+    "sale_date_to": (SalesModel.sale_date, "lte"),
+    "sale_amount_min": (SalesModel.sale_amount, "gte"),
+    "sale_amount_max": (SalesModel.sale_amount, "lte"),
+}
+
+
+def _sale_stmt(sale_id: int) -> Select:
+    return select(SalesModel).where(SalesModel.id == sale_id)
+
+
+def _lock_sale(db: Session, sale_id: int) -> Optional[SalesModel]:
+    # Locked until commit, so concurrent writers cannot both subtract the
+    # same old values from the rollups
+    return db.scalars(
+        _sale_stmt(sale_id).with_for_update().execution_options(populate_existing=True)
+    ).first()
+
+
+def _all_sales_stmt(
+    skip: int,
+    limit: int,
+    filters: Optional[SalesFilter] = None,
+    cursor: Optional[str] = None,
+) -> Select:
+    stmt = apply_filters(select(SalesModel), filters, SALES_FILTERS)
+    return paginate(stmt, SalesModel.id, skip, limit, cursor)
+
+
+def export_sales_stmt(filters: Optional[SalesFilter] = None) -> Select:
+    """
+    Build the column select used to export sales, ordered by ID.
+
+    Args:
+        filters (Optional[SalesFilter]): Optional typed filters.
+
+    Returns:
+        Select: Select of the sales table columns.
+    """
+    stmt = select(*SalesModel.__table__.columns).order_by(SalesModel.id)
+    return apply_filters(stmt, filters, SALES_FILTERS)
+
+
+def sales_ledger_stmt(
+    filters: Optional[SalesFilter] = None,
+    updated_since: Optional[datetime] = None,
+) -> Select:
+    """
+    Build the denormalized sales ledger used for analytics exports.
+
+    One row per sale with its plot, buyer and associate details and the
+    totals of its active payments. Rows are ordered by `update_dt`, so the
+    last exported `update_dt` can be passed back as `updated_since` to
+    fetch only the sales changed since. Payment writes also bump their
+    sale's `update_dt`, so changed totals are picked up too.
+
+    `update_dt` is the start time of the writing transaction, so a sale
+    committed after an export can carry an earlier timestamp. Clients
+    should pass a watermark that lags the last exported `update_dt` by
+    more than the longest write transaction and de-duplicate rows by
+    `sale_id`.
+
+    Args:
+        filters (Optional[SalesFilter]): Optional typed filters.
+        updated_since (Optional[datetime]): Only include sales updated
+            after this time.
+
+    Returns:
+        Select: Select of labelled ledger columns.
+    """
+    paid = (
+        select(
+            PaymentsModel.sale_id,
+            cast(func.sum(PaymentsModel.amount_paid), Numeric(18, 4)).label(
+                "amount_paid"
+            ),
+            func.count(PaymentsModel.id).label("payment_count"),
+            func.max(PaymentsModel.payment_date).label("last_payment_date"),
+        )
+        .where(PaymentsModel.is_deleted.is_(False))
+        .group_by(PaymentsModel.sale_id)
+        .subquery()
+    )
+    stmt = (
+        select(
+            SalesModel.id.label("sale_id"),
+            SalesModel.sale_date,
+            SalesModel.sale_amount,
+            SalesModel.payment_mode,
+            SalesModel.payment_timeframe,
+            SalesModel.plot_id,
+            PlotsModel.area_id,
+            PlotsModel.dimensions.label("plot_dimensions"),
+            PlotsModel.status.label("plot_status"),
+            PlotsModel.price.label("plot_price"),
+            SalesModel.buyer_id,
+            BuyersModel.name.label("buyer_name"),
+            BuyersModel.contact.label("buyer_contact"),
+            SalesModel.associate_id,
+            UsersModel.username.label("associate_username"),
+            UsersModel.full_name.label("associate_name"),
+            func.coalesce(paid.c.amount_paid, 0).label("amount_paid"),
+            func.coalesce(paid.c.payment_count, 0).label("payment_count"),
+            paid.c.last_payment_date,
+            SalesModel.create_dt,
+            SalesModel.update_dt,
+        )
+        .join(PlotsModel, PlotsModel.id == SalesModel.plot_id)
+        .join(BuyersModel, BuyersModel.id == SalesModel.buyer_id)
+        .join(UsersModel, UsersModel.id == SalesModel.associate_id)
+        .outerjoin(paid, paid.c.sale_id == SalesModel.id)
+        .order_by(SalesModel.update_dt, SalesModel.id)
+    )
+    if updated_since is not None:
+        stmt = stmt.where(SalesModel.update_dt > updated_since)
+    return apply_filters(stmt, filters, SALES_FILTERS)
 
 
 def create_sale(db: Session, sale: SalesBase, current_user: CurrentUser) -> SalesModel:
@@ -25,8 +161,9 @@ def create_sale(db: Session, sale: SalesBase, current_user: CurrentUser) -> Sale
     db_sale = SalesModel(**sale_data)
 
     db.add(db_sale)
+    apply_sale(db, **{field: sale_data[field] for field in ROLLUP_FIELDS})
     db.commit()
-    db.refresh(db_sale)
+    dashboard_cache.invalidate()
     return db_sale
 
 
@@ -41,35 +178,30 @@ def get_sale(db: Session, sale_id: int) -> Optional[SalesModel]:
     Returns:
         Optional[SalesModel]: Sale record if found, else None.
     """
-    return db.query(SalesModel).filter(SalesModel.id == sale_id).first()
+    return db.scalars(_sale_stmt(sale_id)).first()
 
 
 def get_all_sales(
     db: Session,
     skip: int = 0,
     limit: int = 100,
-    filters: Optional[Dict[str, str]] = None,
+    filters: Optional[SalesFilter] = None,
+    cursor: Optional[str] = None,
 ) -> List[SalesModel]:
     """
     Retrieve all sales records, with optional filters and pagination.
 
     Args:
         db (Session): SQLAlchemy session.
-        skip (int): Number of records to skip (for pagination).
+        skip (int): Number of records to skip (ignored when `cursor` is given).
         limit (int): Max number of records to return.
-        filters (Optional[Dict[str, str]]): Optional filters (field-value pairs).
+        filters (Optional[SalesFilter]): Optional typed filters.
+        cursor (Optional[str]): Keyset cursor returned with the previous page.
 
     Returns:
         List[SalesModel]: List of sales records.
     """
-    query = db.query(SalesModel)
-
-    if filters:
-        for field, value in filters.items():
-            if hasattr(SalesModel, field):
-                query = query.filter(getattr(SalesModel, field).ilike(f"%{value}%"))
-
-    return query.offset(skip).limit(limit).all()
+    return db.scalars(_all_sales_stmt(skip, limit, filters, cursor)).all()
 
 
 def update_sale(
@@ -90,7 +222,7 @@ def update_sale(
     Returns:
         Optional[SalesModel]: Updated sale record, or None if not found.
     """
-    db_sale = get_sale(db, sale_id)
+    db_sale = _lock_sale(db, sale_id)
     if not db_sale:
         return None
 
@@ -100,15 +232,40 @@ def update_sale(
         if value not in (None, "")
     }
 
+    before = {field: getattr(db_sale, field) for field in ROLLUP_FIELDS}
     for field, value in update_data.items():
         setattr(db_sale, field, value)
 
+    after = {field: getattr(db_sale, field) for field in ROLLUP_FIELDS}
+    if after != before:
+        apply_sale(db, **before, sign=-1)
+        apply_sale(db, **after)
+
     db_sale.updated_by = current_user.username
     db.commit()
-    db.refresh(db_sale)
+    dashboard_cache.invalidate()
     return db_sale
 
 
+# Async variants for handlers running on the asyncio engine
+
+
+async def get_sale_async(db: AsyncSession, sale_id: int) -> Optional[SalesModel]:
+    """Async variant of `get_sale`."""
+    return (await db.scalars(_sale_stmt(sale_id))).first()
+
+
+async def get_all_sales_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    filters: Optional[SalesFilter] = None,
+    cursor: Optional[str] = None,
+) -> List[SalesModel]:
+    """Async variant of `get_all_sales`."""
+    return (await db.scalars(_all_sales_stmt(skip, limit, filters, cursor))).all()
+
+
 # def delete_sale(db: Session, sale_id: int, current_user: CurrentUser):
 #     db_sale = get_sale(db, sale_id)
 #     if not db_sale:
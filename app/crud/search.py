@@ -0,0 +1,37 @@
+from sqlalchemy import ColumnElement, func, or_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.crud.filters import escape_like
+
+
+def match_any(term: str, *columns: InstrumentedAttribute) -> ColumnElement:
+    """
+    Build a case-insensitive substring match against any of `columns`.
+
+    `column ILIKE '%term%'` is served by the `gin_trgm_ops` indexes on the
+    models, so it does not fall back to a sequential scan.
+
+    Args:
+        term (str): Search text from the request.
+        *columns (InstrumentedAttribute): Text columns to search.
+
+    Returns:
+        ColumnElement: OR of the per-column conditions.
+    """
+    pattern = f"%{escape_like(term)}%"
+    return or_(*(column.ilike(pattern, escape="\\") for column in columns))
+
+
+def relevance(term: str, *columns: InstrumentedAttribute) -> ColumnElement:
+    """
+    Rank rows by their best trigram similarity to `term` across `columns`.
+
+    Args:
+        term (str): Search text from the request.
+        *columns (InstrumentedAttribute): Text columns to rank on.
+
+    Returns:
+        ColumnElement: Similarity score between 0 and 1.
+    """
+    scores = [func.coalesce(func.similarity(column, term), 0) for column in columns]
+    return func.greatest(*scores) if len(scores) > 1 else scores[0]
@@ -1,15 +1,35 @@
+from typing import List, Optional, Tuple
+
 from fastapi import HTTPException
-from passlib.context import CryptContext
+from psycopg2.errorcodes import UNIQUE_VIOLATION
+from sqlalchemy import Select, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
 from app.auth.currentuser import CurrentUser
-from app.models.users import Designations as DesignationsModel
-from app.models.users import Roles as RolesModel
+from app.core.logger import get_logger
+from app.core.passwords import (
+    hash_password,
+    hash_passwords,
+    pwd_context,
+    verify_and_update_async,
+)
+from app.crud.dashboard import dashboard_cache
+from app.crud.lookups import designations_lookup, roles_lookup
 from app.models.users import Users as UsersModel
-from app.schemas.users import UserLogin, UsersBase
+from app.schemas.users import (
+    BulkUserError,
+    BulkUserResult,
+    UserCredential,
+    UserLogin,
+    UsersBase,
+)
+
+# Rows per INSERT statement in `bulk_create_users`
+BULK_INSERT_BATCH_SIZE = 500
 
-# Initialize password hashing context using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = get_logger(__name__)
 
 
 def get_password_hash(password: str) -> str:
@@ -22,7 +42,7 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: The hashed password.
     """
-    return pwd_context.hash(password)
+    return hash_password(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -52,6 +72,46 @@ def model_to_dict(obj) -> dict:
     return {column.name: getattr(obj, column.name) for column in obj.__table__.columns}
 
 
+def _user_stmt(user_id: int) -> Select:
+    return select(UsersModel).filter_by(id=user_id)
+
+
+def _all_users_stmt() -> Select:
+    return select(UsersModel)
+
+
+def _user_by_username_stmt(username: str) -> Select:
+    return (
+        select(UsersModel)
+        .options(joinedload(UsersModel.role))
+        .where(UsersModel.username == username)
+    )
+
+
+def _user_with_role_stmt(user_id: int) -> Select:
+    return (
+        select(UsersModel)
+        .options(joinedload(UsersModel.role))
+        .where(UsersModel.id == user_id)
+    )
+
+
+def _user_with_lookups(db: Session, user: UsersModel) -> dict:
+    user_dict = model_to_dict(user)
+    user_dict["role"] = roles_lookup.name_for(db, user.role_id)
+    user_dict["designation"] = designations_lookup.name_for(db, user.designation_id)
+    return user_dict
+
+
+async def _user_with_lookups_async(db: AsyncSession, user: UsersModel) -> dict:
+    user_dict = model_to_dict(user)
+    user_dict["role"] = await roles_lookup.name_for_async(db, user.role_id)
+    user_dict["designation"] = await designations_lookup.name_for_async(
+        db, user.designation_id
+    )
+    return user_dict
+
+
 def create_user(db: Session, user: UsersBase, current_user: CurrentUser) -> dict:
     """
     Creates a new user in the database.
@@ -66,14 +126,14 @@ def create_user(db: Session, user: UsersBase, current_user: CurrentUser) -> dict
     Raises:
         HTTPException: If the role or designation is not found.
     """
-    # Fetch the role and designation from the database
-    role = db.query(RolesModel).filter_by(name=user.role).first()
-    designation = db.query(DesignationsModel).filter_by(title=user.designation).first()
+    # Resolve the role and designation from the lookup cache
+    role_id = roles_lookup.id_for(db, user.role)
+    designation_id = designations_lookup.id_for(db, user.designation)
 
     # Ensure role and designation are valid
-    if not role:
+    if role_id is None:
         raise HTTPException(status_code=404, detail="Role not found")
-    if not designation:
+    if designation_id is None:
         raise HTTPException(status_code=404, detail="Designation not found")
 
     # Prepare user data for insertion
@@ -81,22 +141,125 @@ def create_user(db: Session, user: UsersBase, current_user: CurrentUser) -> dict
     user_data["created_by"] = current_user.username
     user_data["updated_by"] = current_user.username
     user_data["hashed_password"] = get_password_hash(user.password)
-    user_data["designation_id"] = designation.id
-    user_data["role_id"] = role.id
+    user_data["designation_id"] = designation_id
+    user_data["role_id"] = role_id
 
     # Create and save the user
     db_user = UsersModel(**user_data)
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
 
     # Convert user object to dictionary and add role/designation info
     db_user_dict = model_to_dict(db_user)
-    db_user_dict["role"] = role.name
-    db_user_dict["designation"] = designation.title
+    db_user_dict["role"] = user.role
+    db_user_dict["designation"] = user.designation
     return db_user_dict
 
 
+def _insert_user_batch(
+    db: Session, batch: List[Tuple[int, dict]], errors: List[BulkUserError]
+) -> int:
+    """Insert a batch, falling back to row by row to pinpoint failing rows."""
+    try:
+        db.execute(insert(UsersModel), [row for _, row in batch])
+        db.commit()
+        return len(batch)
+    except IntegrityError:
+        db.rollback()
+
+    created = 0
+    for index, row in batch:
+        try:
+            with db.begin_nested():
+                db.execute(insert(UsersModel), [row])
+            created += 1
+        except IntegrityError as e:
+            # The database error names constraints and echoes other rows' values
+            logger.warning(f"Bulk user row {index} rejected: {e.orig}")
+            detail = (
+                "Username or email already exists"
+                if e.orig.pgcode == UNIQUE_VIOLATION
+                else "Row conflicts with existing data"
+            )
+            errors.append(
+                BulkUserError(index=index, username=row["username"], detail=detail)
+            )
+    db.commit()
+    return created
+
+
+def bulk_create_users(
+    db: Session, users: List[UserCredential], current_user: CurrentUser
+) -> BulkUserResult:
+    """
+    Creates many users at once, reporting rejected rows instead of failing.
+
+    Roles and designations are resolved from the lookup cache, existing
+    usernames and emails are checked in one query, passwords are hashed in parallel
+    in the password hashing process pool and the rows are inserted in
+    batches of `BULK_INSERT_BATCH_SIZE`.
+
+    Args:
+        db (Session): The database session.
+        users (List[UserCredential]): The users to create.
+        current_user (CurrentUser): The current user performing the operation.
+
+    Returns:
+        BulkUserResult: Number of created users and the rejected rows.
+    """
+    errors: List[BulkUserError] = []
+    role_ids = {u.role: roles_lookup.id_for(db, u.role) for u in users}
+    designation_ids = {
+        u.designation: designations_lookup.id_for(db, u.designation) for u in users
+    }
+    usernames = [u.username for u in users]
+    emails = [u.email for u in users]
+    taken = set()
+    for username, email in db.execute(
+        select(UsersModel.username, UsersModel.email).where(
+            or_(UsersModel.username.in_(usernames), UsersModel.email.in_(emails))
+        )
+    ):
+        taken.update((("username", username), ("email", email)))
+
+    accepted: List[Tuple[int, UserCredential]] = []
+    for index, user in enumerate(users):
+        if role_ids[user.role] is None:
+            detail = f"Role not found: {user.role}"
+        elif designation_ids[user.designation] is None:
+            detail = f"Designation not found: {user.designation}"
+        elif ("username", user.username) in taken:
+            detail = f"Username already exists: {user.username}"
+        elif ("email", user.email) in taken:
+            detail = f"Email already exists: {user.email}"
+        else:
+            taken.update((("username", user.username), ("email", user.email)))
+            accepted.append((index, user))
+            continue
+        errors.append(BulkUserError(index=index, username=user.username, detail=detail))
+
+    hashes = hash_passwords([user.password for _, user in accepted])
+    rows = []
+    for (index, user), hashed_password in zip(accepted, hashes, strict=True):
+        row = user.dict(exclude={"resource_type", "designation", "role", "password"})
+        row.update(
+            hashed_password=hashed_password,
+            role_id=role_ids[user.role],
+            designation_id=designation_ids[user.designation],
+            created_by=current_user.username,
+            updated_by=current_user.username,
+        )
+        rows.append((index, row))
+
+    created = 0
+    for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+        batch = rows[start : start + BULK_INSERT_BATCH_SIZE]
+        created += _insert_user_batch(db, batch, errors)
+
+    errors.sort(key=lambda error: error.index)
+    return BulkUserResult(created=created, errors=errors)
+
+
 def get_user(db: Session, user_id: int) -> dict:
     """
     Retrieves a user by their ID.
@@ -110,20 +273,12 @@ def get_user(db: Session, user_id: int) -> dict:
     Raises:
         HTTPException: If the user is not found.
     """
-    user = (
-        db.query(UsersModel)
-        .options(joinedload(UsersModel.role), joinedload(UsersModel.designation))
-        .filter_by(id=user_id)
-        .first()
-    )
+    user = db.scalars(_user_stmt(user_id)).first()
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user_dict = model_to_dict(user)
-    user_dict["role"] = user.role.name
-    user_dict["designation"] = user.designation.title
-    return user_dict
+    return _user_with_lookups(db, user)
 
 
 def get_all_user(db: Session) -> list:
@@ -136,20 +291,8 @@ def get_all_user(db: Session) -> list:
     Returns:
         list: A list of user data dictionaries with role and designation info.
     """
-    users = (
-        db.query(UsersModel)
-        .options(joinedload(UsersModel.role), joinedload(UsersModel.designation))
-        .all()
-    )
-
-    user_data = []
-    for user in users:
-        user_dict = model_to_dict(user)
-        user_dict["role"] = user.role.name
-        user_dict["designation"] = user.designation.title
-        user_data.append(user_dict)
-
-    return user_data
+    users = db.scalars(_all_users_stmt()).all()
+    return [_user_with_lookups(db, user) for user in users]
 
 
 def update_user(
@@ -167,33 +310,65 @@ def update_user(
     Returns:
         dict: The updated user data with role and designation info.
     Raises:
-        HTTPException: If the user is not found or update fails.
+        HTTPException: If the user is not found or update fails, or 403 if
+            a non-admin tries to change a role or designation.
     """
-    user = db.query(UsersModel).filter(UsersModel.id == user_id).first()
-
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
     update_data = {
         key: value
         for key, value in user_update.dict(exclude_unset=True).items()
         if value not in (None, "")
     }
 
+    values = {"updated_by": current_user.username}
+    current_ids = None
+    if not current_user.is_admin() and ({"role", "designation"} & update_data.keys()):
+        # The schema requires both fields, so non-admins may resend their
+        # current values but never change them
+        current_ids = db.execute(
+            select(UsersModel.role_id, UsersModel.designation_id).where(
+                UsersModel.id == user_id
+            )
+        ).first()
+        if current_ids is None:
+            raise HTTPException(status_code=404, detail="User not found")
     for field, value in update_data.items():
         if field == "password":
-            setattr(user, "hashed_password", get_password_hash(value))
-        else:
-            setattr(user, field, value)
-
-    user.updated_by = current_user.username
+            values["hashed_password"] = get_password_hash(value)
+        elif field == "role":
+            role_id = roles_lookup.id_for(db, value)
+            if role_id is None:
+                raise HTTPException(status_code=404, detail="Role not found")
+            if current_ids is not None and role_id != current_ids.role_id:
+                raise HTTPException(
+                    status_code=403, detail="Only admins can change a user's role"
+                )
+            values["role_id"] = role_id
+        elif field == "designation":
+            designation_id = designations_lookup.id_for(db, value)
+            if designation_id is None:
+                raise HTTPException(status_code=404, detail="Designation not found")
+            if current_ids is not None and designation_id != current_ids.designation_id:
+                raise HTTPException(
+                    status_code=403,
+                    detail="Only admins can change a user's designation",
+                )
+            values["designation_id"] = designation_id
+        elif field != "resource_type":
+            values[field] = value
+
+    user = db.scalars(
+        update(UsersModel)
+        .where(UsersModel.id == user_id)
+        .values(**values)
+        .returning(UsersModel)
+    ).first()
+    if not user:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="User not found")
     db.commit()
-    db.refresh(user)
+    dashboard_cache.invalidate()
 
-    user_dict = model_to_dict(user)
-    user_dict["role"] = user.role.name
-    user_dict["designation"] = user.designation.title
-    return user_dict
+    return _user_with_lookups(db, user)
 
 
 def get_user_by_username(db: Session, username: str) -> UsersModel:
@@ -207,13 +382,7 @@ def get_user_by_username(db: Session, username: str) -> UsersModel:
     Returns:
         UsersModel: The user model instance.
     """
-    user = (
-        db.query(UsersModel)
-        .options(joinedload(UsersModel.role))
-        .filter(UsersModel.username == username)
-        .first()
-    )
-    return user
+    return db.scalars(_user_by_username_stmt(username)).first()
 
 
 def authenticate_user(db: Session, user: UserLogin) -> dict:
@@ -235,3 +404,69 @@ def authenticate_user(db: Session, user: UserLogin) -> dict:
         return None
 
     return db_user  # model_to_dict(db_user)
+
+
+# Async variants for handlers running on the asyncio engine
+
+
+async def get_user_async(db: AsyncSession, user_id: int) -> dict:
+    """Async variant of `get_user`."""
+    user = (await db.scalars(_user_stmt(user_id))).first()
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return await _user_with_lookups_async(db, user)
+
+
+async def get_all_user_async(db: AsyncSession) -> list:
+    """Async variant of `get_all_user`."""
+    users = (await db.scalars(_all_users_stmt())).all()
+    return [await _user_with_lookups_async(db, user) for user in users]
+
+
+async def get_user_by_username_async(db: AsyncSession, username: str) -> UsersModel:
+    """Async variant of `get_user_by_username`."""
+    return (await db.scalars(_user_by_username_stmt(username))).first()
+
+
+async def get_user_with_role_async(
+    db: AsyncSession, user_id: int
+) -> Optional[UsersModel]:
+    """
+    Load a user together with their current role.
+
+    Args:
+        db (AsyncSession): Async database session.
+        user_id (int): ID of the user.
+
+    Returns:
+        Optional[UsersModel]: The user, or None if it no longer exists.
+    """
+    return (await db.scalars(_user_with_role_stmt(user_id))).first()
+
+
+async def authenticate_user_async(
+    db: AsyncSession, user: UserLogin
+) -> Optional[UsersModel]:
+    """
+    Async variant of `authenticate_user`.
+
+    bcrypt runs in the password hashing process pool so logins do not block
+    the event loop. A hash made with an outdated cost factor is replaced
+    with one using the configured cost.
+    """
+    db_user = await get_user_by_username_async(db, user.username)
+    if not db_user:
+        return None
+
+    valid, new_hash = await verify_and_update_async(
+        user.password, db_user.hashed_password
+    )
+    if not valid:
+        return None
+
+    if new_hash:
+        db_user.hashed_password = new_hash
+        await db.commit()
+    return db_user
@@ -1,11 +1,24 @@
 import logging
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 
-from app.api import auth_router, buyers, payments, plots, sales, users, dashboard
-from app.config.database import Base, engine
+from app.api import (
+    auth_router,
+    buyers,
+    dashboard,
+    payments,
+    plots,
+    sales,
+    system,
+    users,
+)
+from app.config.database import Base, SessionLocal, engine
+from app.core.metrics import request_checkouts
+from app.core.passwords import shutdown_password_pool
+from app.crud.lookups import reload_lookups
 
 # Setting up logging
 logging.basicConfig(
@@ -14,7 +27,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+def warm_lookups() -> None:
+    """Load the role, designation and area lookup tables before serving."""
+    db = SessionLocal()
+    try:
+        reload_lookups(db)
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the lookup caches on startup and stop the hashing pool on shutdown."""
+    warm_lookups()
+    yield
+    shutdown_password_pool()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Add GZipMiddleware for compressing responses of size > 1400 bytes
 app.add_middleware(GZipMiddleware, minimum_size=1400)
@@ -26,8 +57,29 @@ app.add_middleware(
     allow_credentials=True,  # Allow cookies and credentials
     allow_methods=["*"],  # Allow all HTTP methods (GET, POST, etc.)
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["X-Next-Cursor"],  # Let browsers read pagination cursors
 )
 
+
+@app.middleware("http")
+async def count_pool_checkouts(request: Request, call_next):
+    """
+    Report the pool checkouts made by each request in `X-DB-Checkouts`.
+
+    Only checkouts made before the response starts are counted. Streamed
+    bodies (the exports) do their database work after that, so their
+    responses, recognisable by having no `Content-Length`, get no header.
+    """
+    counter = request_checkouts.start()
+    try:
+        response = await call_next(request)
+    finally:
+        request_checkouts.finish(counter)
+    if "content-length" in response.headers:
+        response.headers["X-DB-Checkouts"] = str(counter[0])
+    return response
+
+
 # Include routers for authentication, users, and buyers
 app.include_router(auth_router.router, prefix="/auth", tags=["auth"])
 app.include_router(users.router, prefix="/users", tags=["users"])
@@ -36,6 +88,7 @@ app.include_router(plots.router, prefix="/plots", tags=["plots"])
 app.include_router(payments.router, prefix="/payments", tags=["payments"])
 app.include_router(sales.router, prefix="/sales", tags=["sales"])
 app.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+app.include_router(system.router, prefix="/system", tags=["system"])
 
 # Create all database tables defined in the Base class
 Base.metadata.create_all(bind=engine)
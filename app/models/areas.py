@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.config.database import Base
@@ -18,8 +18,17 @@ class Areas(Base):
     __tablename__ = "areas"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    name: Mapped[str | None] = mapped_column(String, nullable=True)
+    name: Mapped[str | None] = mapped_column(String, nullable=True, unique=True)
     city: Mapped[str | None] = mapped_column(String, nullable=True)
     state: Mapped[str | None] = mapped_column(String, nullable=True)
 
     plots = relationship("Plots", back_populates="area")
+
+
+# Lets plot search match on the area (location) name
+Index(
+    "ix_areas_name_trgm",
+    Areas.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, String, func
+from sqlalchemy import Boolean, DateTime, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.config.database import Base
@@ -39,3 +39,30 @@ class Buyers(Base):
     updated_by: Mapped[str | None] = mapped_column(String, nullable=True)
 
     sales = relationship("Sales", back_populates="buyer")
+
+
+# Serve the case-insensitive prefix filters (`lower(column) LIKE 'value%'`)
+Index(
+    "ix_buyers_name_lower",
+    func.lower(Buyers.name).label("name_lower"),
+    postgresql_ops={"name_lower": "text_pattern_ops"},
+)
+Index(
+    "ix_buyers_contact_lower",
+    func.lower(Buyers.contact).label("contact_lower"),
+    postgresql_ops={"contact_lower": "text_pattern_ops"},
+)
+
+# Serve the trigram search (`column ILIKE '%term%'` ranked by similarity)
+Index(
+    "ix_buyers_name_trgm",
+    Buyers.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+)
+Index(
+    "ix_buyers_contact_trgm",
+    Buyers.contact,
+    postgresql_using="gin",
+    postgresql_ops={"contact": "gin_trgm_ops"},
+)
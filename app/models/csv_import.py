@@ -0,0 +1,22 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.config.database import Base
+
+
+class CsvImportProgress(Base):
+    """
+    Rows imported so far per CSV data file, for resuming an interrupted import.
+
+    Written in the same transaction as each imported chunk, so the progress
+    can never disagree with the rows actually committed.
+
+    Attributes:
+        filename (str): Name of the CSV file (primary key).
+        rows_done (int): Number of data rows imported from the file.
+    """
+
+    __tablename__ = "csv_import_progress"
+
+    filename: Mapped[str] = mapped_column(String, primary_key=True)
+    rows_done: Mapped[int] = mapped_column(Integer, default=0)
@@ -23,7 +23,7 @@ class Payments(Base):
     __tablename__ = "payments"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    sale_id: Mapped[int] = mapped_column(Integer, ForeignKey("sales.id"))
+    sale_id: Mapped[int] = mapped_column(Integer, ForeignKey("sales.id"), index=True)
     amount_paid: Mapped[Decimal] = mapped_column(Numeric(15, 4))
     payment_date: Mapped[date] = mapped_column(Date)
     payment_mode: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, Numeric, String, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -34,9 +34,9 @@ class Plots(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     # plot_number: Mapped[int] = mapped_column()
-    area_id: Mapped[int] = mapped_column(Integer, ForeignKey("areas.id"))
+    area_id: Mapped[int] = mapped_column(Integer, ForeignKey("areas.id"), index=True)
     dimensions: Mapped[str | None] = mapped_column(String, nullable=True)
-    status: Mapped[str | None] = mapped_column(String, nullable=True)
+    status: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
     price: Mapped[Decimal] = mapped_column(Numeric(15, 4))
     assigned_to: Mapped[str | None] = mapped_column(String, nullable=True)
     image_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("images.id"))
@@ -52,3 +52,18 @@ class Plots(Base):
     area = relationship("Areas", back_populates="plots")
     sales = relationship("Sales", back_populates="plot")
     images = relationship("Images", back_populates="plots")
+
+
+# Serve the trigram search (`column ILIKE '%term%'` ranked by similarity)
+Index(
+    "ix_plots_dimensions_trgm",
+    Plots.dimensions,
+    postgresql_using="gin",
+    postgresql_ops={"dimensions": "gin_trgm_ops"},
+)
+Index(
+    "ix_plots_assigned_to_trgm",
+    Plots.assigned_to,
+    postgresql_using="gin",
+    postgresql_ops={"assigned_to": "gin_trgm_ops"},
+)
@@ -0,0 +1,80 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, ForeignKey, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.config.database import Base
+
+
+class SalesMonthlyRollup(Base):
+    """
+    Running sales totals per calendar month, maintained by the sales writers.
+
+    Attributes:
+        month (date): First day of the month (primary key).
+        total_sales (Decimal): Sum of sale amounts in the month.
+        sale_count (int): Number of sales in the month.
+    """
+
+    __tablename__ = "sales_monthly_rollup"
+
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    total_sales: Mapped[Decimal] = mapped_column(Numeric(15, 2), default=0)
+    sale_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class SalesAgentRollup(Base):
+    """
+    Running sales totals per sales associate, maintained by the sales writers.
+
+    Attributes:
+        associate_id (int): ID of the associate (primary key).
+        total_sales (Decimal): Sum of sale amounts handled by the associate.
+        sale_count (int): Number of sales handled by the associate.
+    """
+
+    __tablename__ = "sales_agent_rollup"
+
+    associate_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), primary_key=True
+    )
+    total_sales: Mapped[Decimal] = mapped_column(Numeric(15, 2), default=0)
+    sale_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class SalesAreaRollup(Base):
+    """
+    Running revenue totals per area, maintained by the sales writers.
+
+    Attributes:
+        area_id (int): ID of the area of the sold plots (primary key).
+        total_revenue (Decimal): Sum of sale amounts for plots in the area.
+        sale_count (int): Number of sales for plots in the area.
+    """
+
+    __tablename__ = "sales_area_rollup"
+
+    area_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("areas.id"), primary_key=True
+    )
+    total_revenue: Mapped[Decimal] = mapped_column(Numeric(15, 2), default=0)
+    sale_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class PaymentsMonthlyRollup(Base):
+    """
+    Running pending balances of active payments per calendar month,
+    maintained by the payment writers.
+
+    Attributes:
+        month (date): First day of the payment month (primary key).
+        pending_balance (Decimal): Sum of remaining balances of active payments.
+        payment_count (int): Number of active payments in the month.
+    """
+
+    __tablename__ = "payments_monthly_rollup"
+
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    pending_balance: Mapped[Decimal] = mapped_column(Numeric(15, 4), default=0)
+    payment_count: Mapped[int] = mapped_column(Integer, default=0)
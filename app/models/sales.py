@@ -1,7 +1,16 @@
 from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import Date, DateTime, ForeignKey, Integer, Numeric, String, func
+from sqlalchemy import (
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.config.database import Base
@@ -21,7 +30,8 @@ class Sales(Base):
         payment_timeframe (datetime): The expected payment timeframe for the sale.
         sale_date (date): The date the sale was made.
         create_dt (datetime): Timestamp when the record was created.
-        update_dt (datetime): Timestamp when the record was last updated.
+        update_dt (datetime): Timestamp when the record or one of its
+            payments was last updated.
         created_by (str | None): The user who created the sale record.
         updated_by (str | None): The user who last updated the sale record.
     """
@@ -29,13 +39,15 @@ class Sales(Base):
     __tablename__ = "sales"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    plot_id: Mapped[int] = mapped_column(Integer, ForeignKey("plots.id"))
-    associate_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
-    buyer_id: Mapped[int] = mapped_column(Integer, ForeignKey("buyers.id"))
+    plot_id: Mapped[int] = mapped_column(Integer, ForeignKey("plots.id"), index=True)
+    associate_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), index=True
+    )
+    buyer_id: Mapped[int] = mapped_column(Integer, ForeignKey("buyers.id"), index=True)
     sale_amount: Mapped[Decimal] = mapped_column(Numeric(15, 2))
     payment_mode: Mapped[str | None] = mapped_column(String, nullable=True)
     payment_timeframe: Mapped[datetime] = mapped_column(DateTime)
-    sale_date: Mapped[date] = mapped_column(Date)
+    sale_date: Mapped[date] = mapped_column(Date, index=True)
     create_dt: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     update_dt: Mapped[datetime] = mapped_column(
         DateTime, default=func.now(), onupdate=func.now()
@@ -48,3 +60,7 @@ class Sales(Base):
     user = relationship("Users", back_populates="sales")
     buyer = relationship("Buyers", back_populates="sales")
     payments = relationship("Payments", back_populates="sale")
+
+
+# Serve incremental ledger exports (`update_dt > :since ORDER BY update_dt, id`)
+Index("ix_sales_update_dt_id", Sales.update_dt, Sales.id)
@@ -21,7 +21,7 @@ class Roles(Base):
     __tablename__ = "roles"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    name: Mapped[str] = mapped_column(String)
+    name: Mapped[str] = mapped_column(String, unique=True)
 
     # Relationship with Users
     users = relationship("Users", back_populates="role")
@@ -42,7 +42,7 @@ class Designations(Base):
     __tablename__ = "designations"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    title: Mapped[str] = mapped_column(String)
+    title: Mapped[str] = mapped_column(String, unique=True)
 
     # Relationship with Users
     users = relationship("Users", back_populates="designation")
@@ -75,3 +75,16 @@ class Buyers(BuyersBase):
     update_dt: Optional[datetime] = Field(
         None, alias="updateDate", description="Timestamp of record last update."
     )
+
+
+class BuyersFilter(BaseModel):
+    """
+    Query filters for listing buyers. Unset fields are ignored.
+
+    Attributes:
+        name (Optional[str]): Case-insensitive name prefix.
+        contact (Optional[str]): Case-insensitive contact prefix.
+    """
+
+    name: Optional[str] = Field(None, description="Case-insensitive name prefix.")
+    contact: Optional[str] = Field(None, description="Case-insensitive contact prefix.")
@@ -0,0 +1,76 @@
+"""Schema for dashboard metrics."""
+
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class MonthlySales(BaseModel):
+    """
+    Sales total for a single calendar month.
+
+    Attributes:
+        month (date): First day of the month.
+        total_sales (float): Sum of sale amounts in the month.
+    """
+
+    month: date = Field(..., description="First day of the month.")
+    total_sales: float = Field(..., description="Total sale amount in the month.")
+
+
+class AgentSales(BaseModel):
+    """
+    Sales total for a single sales associate.
+
+    Attributes:
+        agent (Optional[str]): Full name of the associate.
+        total_sales (float): Sum of sale amounts handled by the associate.
+    """
+
+    agent: Optional[str] = Field(None, description="Full name of the associate.")
+    total_sales: float = Field(..., description="Total sale amount of the associate.")
+
+
+class LocationRevenue(BaseModel):
+    """
+    Revenue for a single area.
+
+    Attributes:
+        location (Optional[str]): Name of the area.
+        total_revenue (float): Sum of sale amounts for plots in the area.
+    """
+
+    location: Optional[str] = Field(None, description="Name of the area.")
+    total_revenue: float = Field(..., description="Total revenue of the area.")
+
+
+class DashboardSummary(BaseModel):
+    """
+    All dashboard metrics in one payload.
+
+    Attributes:
+        total_sales_amount (float): Sum of all sale amounts.
+        total_plots_sold (int): Number of distinct plots sold.
+        remaining_inventory (int): Number of plots still available.
+        pending_payments (float): Sum of remaining balances of active payments.
+        monthly_sales (List[MonthlySales]): Monthly sales trend.
+        sales_by_agent (List[AgentSales]): Sales per associate, highest first.
+        revenue_by_location (List[LocationRevenue]): Revenue per area, highest first.
+    """
+
+    total_sales_amount: float = Field(..., description="Sum of all sale amounts.")
+    total_plots_sold: int = Field(..., description="Number of distinct plots sold.")
+    remaining_inventory: int = Field(..., description="Number of available plots.")
+    pending_payments: float = Field(
+        ..., description="Sum of remaining balances of active payments."
+    )
+    monthly_sales: List[MonthlySales] = Field(
+        default_factory=list, description="Monthly sales trend."
+    )
+    sales_by_agent: List[AgentSales] = Field(
+        default_factory=list, description="Sales per associate, highest first."
+    )
+    revenue_by_location: List[LocationRevenue] = Field(
+        default_factory=list, description="Revenue per area, highest first."
+    )
@@ -1,6 +1,6 @@
 from datetime import date
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -54,3 +54,24 @@ class PaymentOut(PaymentBase):
     is_deleted: bool = Field(
         False, description="Flag indicating if the payment is soft-deleted."
     )
+
+
+class PaymentFilter(BaseModel):
+    """
+    Query filters for listing payments. Unset fields are ignored.
+    """
+
+    sale_id: Optional[List[int]] = Field(None, description="Match any sale ID.")
+    payment_mode: Optional[str] = Field(None, description="Exact payment mode.")
+    payment_date_from: Optional[date] = Field(
+        None, description="Earliest payment date (inclusive)."
+    )
+    payment_date_to: Optional[date] = Field(
+        None, description="Latest payment date (inclusive)."
+    )
+    amount_paid_min: Optional[Decimal] = Field(
+        None, description="Minimum amount paid (inclusive)."
+    )
+    amount_paid_max: Optional[Decimal] = Field(
+        None, description="Maximum amount paid (inclusive)."
+    )
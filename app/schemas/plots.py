@@ -1,7 +1,7 @@
 import logging
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -86,3 +86,61 @@ class Plot(PlotBase):
     class Config:
         populate_by_name = True
         from_attributes = True
+
+
+class PlotFilter(BaseModel):
+    """
+    Query filters for listing plots. Unset fields are ignored.
+
+    Attributes:
+        status (Optional[List[str]]): Match any of the given statuses.
+        area_id (Optional[List[int]]): Match any of the given area IDs.
+        price_min (Optional[Decimal]): Minimum price (inclusive).
+        price_max (Optional[Decimal]): Maximum price (inclusive).
+    """
+
+    status: Optional[List[str]] = Field(None, description="Match any status.")
+    area_id: Optional[List[int]] = Field(None, description="Match any area ID.")
+    price_min: Optional[Decimal] = Field(None, description="Minimum price.")
+    price_max: Optional[Decimal] = Field(None, description="Maximum price.")
+
+
+class PlotBulkUpdate(PlotUpdate):
+    """
+    One item of a bulk plot update: the plot ID and the fields to change.
+
+    Attributes:
+        id (int): ID of the plot to update.
+    """
+
+    id: int = Field(..., description="ID of the plot to update")
+
+
+class BulkPlotItem(BaseModel):
+    """
+    Outcome of one item of a bulk plot request.
+
+    Attributes:
+        index (int): Position of the item in the request.
+        id (Optional[int]): ID of the created or updated plot.
+        detail (Optional[str]): Why the item was rejected; None on success.
+    """
+
+    index: int = Field(..., description="Position of the item in the request.")
+    id: Optional[int] = Field(None, description="ID of the created or updated plot.")
+    detail: Optional[str] = Field(None, description="Why the item was rejected.")
+
+
+class BulkPlotResult(BaseModel):
+    """
+    Outcome of a bulk plot request.
+
+    Attributes:
+        succeeded (int): Number of plots created or updated.
+        items (List[BulkPlotItem]): One result per request item, in order.
+    """
+
+    succeeded: int = Field(..., description="Number of plots created or updated.")
+    items: List[BulkPlotItem] = Field(
+        default_factory=list, description="One result per request item."
+    )
@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -79,5 +79,32 @@ class Sales(SalesBase):
     update_dt: Optional[datetime] = Field(
         None,
         alias="updateDate",
-        description="Timestamp of the most recent update to this record.",
+        description="Timestamp of the most recent update to this record or to "
+        "any of its payments. Creating, updating or deleting a payment moves it "
+        "forward even though the sale's own fields are unchanged.",
+    )
+
+
+class SalesFilter(BaseModel):
+    """
+    Query filters for listing sales. Unset fields are ignored.
+    """
+
+    plot_id: Optional[List[int]] = Field(None, description="Match any plot ID.")
+    buyer_id: Optional[List[int]] = Field(None, description="Match any buyer ID.")
+    associate_id: Optional[List[int]] = Field(
+        None, description="Match any associate ID."
+    )
+    payment_mode: Optional[str] = Field(None, description="Exact payment mode.")
+    sale_date_from: Optional[date] = Field(
+        None, description="Earliest sale date (inclusive)."
+    )
+    sale_date_to: Optional[date] = Field(
+        None, description="Latest sale date (inclusive)."
+    )
+    sale_amount_min: Optional[Decimal] = Field(
+        None, description="Minimum sale amount (inclusive)."
+    )
+    sale_amount_max: Optional[Decimal] = Field(
+        None, description="Maximum sale amount (inclusive)."
     )
@@ -1,7 +1,7 @@
 """Schema for users."""
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -105,3 +105,44 @@ class UserLogin(BaseModel):
 
     username: str = Field(..., description="The username of the user.")
     password: str = Field(..., description="The password of the user.")
+
+
+class BulkUserError(BaseModel):
+    """
+    A row of a bulk user request that could not be created.
+
+    Attributes:
+        index (int): Position of the row in the request.
+        username (Optional[str]): Username of the row, when available.
+        detail (str): Why the row was rejected.
+    """
+
+    index: int = Field(..., description="Position of the row in the request.")
+    username: Optional[str] = Field(None, description="Username of the row.")
+    detail: str = Field(..., description="Why the row was rejected.")
+
+
+class BulkUserResult(BaseModel):
+    """
+    Outcome of a bulk user request.
+
+    Attributes:
+        created (int): Number of users created.
+        errors (List[BulkUserError]): Rows that were rejected.
+    """
+
+    created: int = Field(..., description="Number of users created.")
+    errors: List[BulkUserError] = Field(
+        default_factory=list, description="Rows that were rejected."
+    )
+
+
+class TokenRefresh(BaseModel):
+    """
+    Schema for exchanging or revoking a refresh token.
+
+    Attributes:
+        refresh_token (str): Refresh token returned at login (required).
+    """
+
+    refresh_token: str = Field(..., description="Refresh token returned at login.")
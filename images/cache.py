@@ -0,0 +1,171 @@
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, Iterable, List, Sequence
+
+# SQLite file holding cached layout and plot OCR results
+OCR_CACHE_DB = os.getenv("OCR_CACHE_DB", "ocr_cache.sqlite3")
+# Total size of cached values before the least recently used are evicted
+OCR_CACHE_MAX_BYTES = int(os.getenv("OCR_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Eviction frees space down to this fraction of the limit
+EVICT_TO = 0.9
+# Keys per SQL statement, well under SQLite's bound parameter limit
+KEY_BATCH = 500
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS ix_entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS counters (
+    namespace TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _batches(keys: Sequence[str]) -> Iterable[List[str]]:
+    for start in range(0, len(keys), KEY_BATCH):
+        yield list(keys[start : start + KEY_BATCH])
+
+
+class OcrCache:
+    """
+    Size-bounded cache of OCR results on local disk, shared by all processes.
+
+    Values are JSON strings grouped by namespace (whole layouts, single
+    plot crops). Once the values exceed `max_bytes`, the least recently
+    used entries are evicted. Hits and misses are counted per namespace.
+
+    Args:
+        db_path (str): Path of the SQLite cache file.
+        max_bytes (int): Maximum total size of the cached values.
+    """
+
+    def __init__(
+        self, db_path: str = OCR_CACHE_DB, max_bytes: int = OCR_CACHE_MAX_BYTES
+    ):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        with closing(self._connect()) as conn:
+            conn.executescript(CACHE_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get_many(self, namespace: str, keys: Sequence[str]) -> Dict[str, str]:
+        """
+        Look up many keys, counting hits and misses.
+
+        Args:
+            namespace (str): Cache namespace.
+            keys (Sequence[str]): Keys to look up.
+
+        Returns:
+            Dict[str, str]: Cached values of the keys that were found.
+        """
+        found: Dict[str, str] = {}
+        now = time.time()
+        with closing(self._connect()) as conn:
+            for batch in _batches(keys):
+                marks = ", ".join("?" * len(batch))
+                found.update(
+                    conn.execute(
+                        f"SELECT key, value FROM entries"
+                        f" WHERE namespace = ? AND key IN ({marks})",
+                        (namespace, *batch),
+                    ).fetchall()
+                )
+                conn.execute(
+                    f"UPDATE entries SET accessed = ?"
+                    f" WHERE namespace = ? AND key IN ({marks})",
+                    (now, namespace, *batch),
+                )
+            hits = sum(1 for key in keys if key in found)
+            conn.execute(
+                "INSERT INTO counters (namespace, hits, misses) VALUES (?, ?, ?)"
+                " ON CONFLICT (namespace) DO UPDATE SET"
+                " hits = hits + excluded.hits, misses = misses + excluded.misses",
+                (namespace, hits, len(keys) - hits),
+            )
+        return found
+
+    def set_many(self, namespace: str, items: Dict[str, str]) -> None:
+        """Store values, then evict the least recently used if over the limit."""
+        if not items:
+            return
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries"
+                " (namespace, key, value, size, accessed) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (namespace, key, value, len(value), now)
+                    for key, value in items.items()
+                ],
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * EVICT_TO)
+        victims = []
+        for namespace, key, size in conn.execute(
+            "SELECT namespace, key, size FROM entries ORDER BY accessed"
+        ):
+            victims.append((namespace, key))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", victims)
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Return size and hit-rate counters per namespace.
+
+        Returns:
+            Dict[str, dict]: Entries, bytes, hits, misses and hit rate.
+        """
+        with closing(self._connect()) as conn:
+            sizes = {
+                namespace: (entries, size)
+                for namespace, entries, size in conn.execute(
+                    "SELECT namespace, COUNT(*), SUM(size) FROM entries"
+                    " GROUP BY namespace"
+                )
+            }
+            counters = conn.execute(
+                "SELECT namespace, hits, misses FROM counters"
+            ).fetchall()
+        stats = {}
+        for namespace, hits, misses in counters:
+            entries, size = sizes.get(namespace, (0, 0))
+            stats[namespace] = {
+                "entries": entries,
+                "bytes": size,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            }
+        return stats
@@ -0,0 +1,333 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
+from typing import List, Optional
+
+from cache import OcrCache, file_digest
+from pipeline import extract_plots, layout_key
+
+# Layouts processed at once; each one already OCRs on every core
+# (`OCR_THREADS` in pipeline.py)
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "2"))
+# SQLite file holding the job queue and the extracted plots
+OCR_JOBS_DB = os.getenv("OCR_JOBS_DB", "jobs.sqlite3")
+# Minimum seconds between two progress writes of a running job
+PROGRESS_INTERVAL = 0.5
+# Seconds a running job may go without a heartbeat before it is requeued
+OCR_JOB_LEASE = float(os.getenv("OCR_JOB_LEASE", "60"))
+# Seconds between two heartbeats of a running job
+HEARTBEAT_INTERVAL = OCR_JOB_LEASE / 4
+# Times a job is started before a crash or an expired lease fails it
+MAX_ATTEMPTS = 2
+
+JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    image_path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    num_plots INTEGER,
+    plots TEXT,
+    error TEXT,
+    owner TEXT,
+    content_hash TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+# Columns added after the first release, created on stores that predate them
+JOB_MIGRATIONS = {
+    "owner": "TEXT",
+    "content_hash": "TEXT",
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+}
+JOB_FIELDS = "id, filename, status, progress, num_plots, error, created_at, updated_at"
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    existing = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+    for name, sql_type in JOB_MIGRATIONS.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {sql_type}")
+
+
+def _update_job(conn: sqlite3.Connection, job_id: str, owner: str, **fields) -> None:
+    # Only the current claim may write, not a worker whose lease was taken over
+    fields["updated_at"] = time.time()
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    conn.execute(
+        f"UPDATE jobs SET {assignments} WHERE id = ? AND owner = ?",
+        (*fields.values(), job_id, owner),
+    )
+
+
+def _heartbeat(db_path: str, job_id: str, owner: str, stop: threading.Event) -> None:
+    """Keep a running job's lease fresh until `stop` is set."""
+    with closing(_connect(db_path)) as conn:
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            conn.execute(
+                "UPDATE jobs SET updated_at = ?"
+                " WHERE id = ? AND owner = ? AND status = 'running'",
+                (time.time(), job_id, owner),
+            )
+
+
+def _requeue_running(
+    conn: sqlite3.Connection, condition: str, params: tuple, error: str
+) -> None:
+    """Requeue the running jobs matching `condition`; fail those out of attempts."""
+    now = time.time()
+    conn.execute(
+        "UPDATE jobs SET status = 'failed', error = ?, owner = NULL, updated_at = ?"
+        f" WHERE status = 'running' AND {condition} AND attempts >= ?",
+        (error, now, *params, MAX_ATTEMPTS),
+    )
+    conn.execute(
+        "UPDATE jobs SET status = 'queued', owner = NULL, progress = 0,"
+        f" updated_at = ? WHERE status = 'running' AND {condition}",
+        (now, *params),
+    )
+
+
+def run_job(
+    db_path: str, job_id: str, image_path: str, content_hash: str, cache: OcrCache
+) -> None:
+    """
+    Process one job inside a worker process.
+
+    The job is first claimed by switching it from queued to running under
+    a new owner token; if another process claimed it already, it is left
+    alone. While it runs, a heartbeat thread refreshes `updated_at` so the
+    claim is not taken for abandoned (see `JobQueue.start`). Progress and
+    the outcome are written straight to the job store, so the API process
+    only has to read it. The plots are also cached under the layout's
+    digest for later uploads of the same file.
+
+    Args:
+        db_path (str): Path of the SQLite job store.
+        job_id (str): ID of the job to run.
+        image_path (str): Path of the uploaded layout image.
+        content_hash (str): SHA-256 digest of the image file.
+        cache (OcrCache): Cache of layout and plot OCR results.
+    """
+    owner = f"{os.getpid()}-{uuid.uuid4().hex}"
+    with closing(_connect(db_path)) as conn:
+        claimed = conn.execute(
+            "UPDATE jobs SET status = 'running', owner = ?, progress = 0,"
+            " attempts = attempts + 1, updated_at = ?"
+            " WHERE id = ? AND status = 'queued'",
+            (owner, time.time(), job_id),
+        ).rowcount
+        if not claimed:
+            return
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=_heartbeat, args=(db_path, job_id, owner, stop), daemon=True
+        )
+        heartbeat.start()
+        last_write = 0.0
+
+        def on_progress(done: int, total: int) -> None:
+            nonlocal last_write
+            now = time.monotonic()
+            if now - last_write >= PROGRESS_INTERVAL:
+                last_write = now
+                progress = done / total if total else 1.0
+                _update_job(conn, job_id, owner, progress=progress)
+
+        try:
+            plots = extract_plots(image_path, on_progress, cache=cache)
+        except Exception as e:
+            _update_job(conn, job_id, owner, status="failed", error=str(e))
+            return
+        finally:
+            stop.set()
+            heartbeat.join()
+        result = json.dumps(plots)
+        cache.set_many("layouts", {layout_key(content_hash): result})
+        _update_job(
+            conn,
+            job_id,
+            owner,
+            status="done",
+            progress=1.0,
+            num_plots=len(plots),
+            plots=result,
+        )
+
+
+class JobQueue:
+    """
+    Layout extraction jobs run by a process pool and tracked in SQLite.
+
+    Jobs are claimed atomically by the worker that runs them, so several
+    API processes sharing the store never run a job twice. A running job
+    holds a lease that its worker renews every `HEARTBEAT_INTERVAL`. On
+    `start()`, queued jobs and running jobs whose lease expired
+    (`OCR_JOB_LEASE`) are resubmitted. The same happens to the running
+    jobs of a pool that breaks because a worker process died. A job is
+    started at most `MAX_ATTEMPTS` times. A layout whose plots are already
+    cached finishes as soon as it is submitted.
+
+    Args:
+        db_path (str): Path of the SQLite job store.
+        workers (int): Number of worker processes.
+        cache (Optional[OcrCache]): OCR result cache; the default cache
+            file when omitted.
+    """
+
+    def __init__(
+        self,
+        db_path: str = OCR_JOBS_DB,
+        workers: int = OCR_WORKERS,
+        cache: Optional[OcrCache] = None,
+    ):
+        self.db_path = db_path
+        self.workers = workers
+        self.cache = cache or OcrCache()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        with closing(_connect(db_path)) as conn:
+            conn.execute(JOBS_SCHEMA)
+            _migrate(conn)
+
+    def start(self) -> None:
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        with closing(_connect(self.db_path)) as conn:
+            # A worker that stopped renewing its lease died, possibly with
+            # the whole container; PIDs cannot tell, as they are reused
+            stale = (time.time() - OCR_JOB_LEASE,)
+            _requeue_running(conn, "updated_at < ?", stale, "Job lease expired")
+            pending = conn.execute(
+                "SELECT id, image_path, content_hash FROM jobs"
+                " WHERE status = 'queued' ORDER BY created_at"
+            ).fetchall()
+        for row in pending:
+            # Jobs queued before digests were stored hash their file once
+            content_hash = row["content_hash"] or file_digest(row["image_path"])
+            self._run(row["id"], row["image_path"], content_hash)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _run(self, job_id: str, image_path: str, content_hash: str) -> None:
+        args = (run_job, self.db_path, job_id, image_path, content_hash, self.cache)
+        with self._executor_lock:
+            try:
+                future = self._executor.submit(*args)
+            except BrokenProcessPool:
+                # A worker process died and took the pool down with it
+                self._executor.shutdown(wait=False)
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                future = self._executor.submit(*args)
+        future.add_done_callback(
+            lambda f: self._record_crash(job_id, image_path, content_hash, f)
+        )
+
+    def _record_crash(
+        self, job_id: str, image_path: str, content_hash: str, future: Future
+    ) -> None:
+        # Errors inside the pipeline are recorded by the worker itself; this
+        # catches the worker process dying. A dying worker breaks the whole
+        # pool, so the jobs of the other workers land here too: every running
+        # job gets another attempt, and only jobs out of attempts fail.
+        if future.cancelled() or future.exception() is None:
+            return
+        with closing(_connect(self.db_path)) as conn:
+            _requeue_running(conn, "id = ?", (job_id,), str(future.exception()))
+            # Jobs still waiting in the broken pool were never claimed
+            queued = conn.execute(
+                "SELECT 1 FROM jobs WHERE id = ? AND status = 'queued'", (job_id,)
+            ).fetchone()
+        if queued:
+            self._run(job_id, image_path, content_hash)
+
+    def submit(self, filename: str, image_path: str, content_hash: str) -> str:
+        """
+        Queue a layout image for extraction and return the job ID.
+
+        Args:
+            filename (str): Client file name.
+            image_path (str): Path of the stored layout image.
+            content_hash (str): SHA-256 digest of the image file.
+
+        Returns:
+            str: ID of the new job, already done if the layout was cached.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        key = layout_key(content_hash)
+        cached = self.cache.get_many("layouts", [key]).get(key)
+        with closing(_connect(self.db_path)) as conn:
+            if cached is not None:
+                conn.execute(
+                    "INSERT INTO jobs (id, filename, image_path, content_hash,"
+                    " status, progress, num_plots, plots, created_at, updated_at)"
+                    " VALUES (?, ?, ?, ?, 'done', 1, ?, ?, ?, ?)",
+                    (
+                        job_id,
+                        filename,
+                        image_path,
+                        content_hash,
+                        len(json.loads(cached)),
+                        cached,
+                        now,
+                        now,
+                    ),
+                )
+                return job_id
+            conn.execute(
+                "INSERT INTO jobs (id, filename, image_path, content_hash, status,"
+                " created_at, updated_at) VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                (job_id, filename, image_path, content_hash, now, now),
+            )
+        self._run(job_id, image_path, content_hash)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return the status of a job, or None if it does not exist."""
+        with closing(_connect(self.db_path)) as conn:
+            row = conn.execute(
+                f"SELECT {JOB_FIELDS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def plots(self, job_id: Optional[str] = None) -> Optional[List[dict]]:
+        """
+        Return the plots extracted by a finished job.
+
+        Args:
+            job_id (Optional[str]): Job to read; the latest finished job
+                when omitted.
+
+        Returns:
+            Optional[List[dict]]: The plots, or None if there is no such
+            finished job.
+        """
+        query = "SELECT plots FROM jobs WHERE status = 'done'"
+        params: tuple = ()
+        if job_id is not None:
+            query += " AND id = ?"
+            params = (job_id,)
+        with closing(_connect(self.db_path)) as conn:
+            row = conn.execute(
+                query + " ORDER BY updated_at DESC LIMIT 1", params
+            ).fetchone()
+        return json.loads(row["plots"]) if row else None
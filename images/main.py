@@ -1,77 +1,118 @@
+import hashlib
 import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import BinaryIO, Tuple
 
-import cv2
-import pytesseract
 import uvicorn
-from fastapi import FastAPI, File, UploadFile
+from fastapi import FastAPI, File, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
-app = FastAPI()
+from jobs import JobQueue
 
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
-# Store extracted plots in memory for now
-plot_data = []
+# Extraction runs in worker processes; jobs and results live in SQLite
+job_queue = JobQueue()
 
 
-@app.post("/upload/")
-async def upload_image(file: UploadFile = File(...)):
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_queue.start()
+    yield
+    job_queue.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
-    image = cv2.imread(file_path)
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-    edged = cv2.Canny(blurred, 50, 150)
 
-    contours, _ = cv2.findContours(edged, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+def save_upload(stream: BinaryIO, filename: str) -> Tuple[str, str]:
+    """
+    Copy an upload to disk in chunks, stored under its SHA-256 digest.
 
-    plots = []
-    for i, contour in enumerate(contours):
-        epsilon = 0.02 * cv2.arcLength(contour, True)
-        polygon = cv2.approxPolyDP(contour, epsilon, True)
+    Args:
+        stream (BinaryIO): The uploaded file.
+        filename (str): Client file name, only used for its extension.
 
-        area = cv2.contourArea(polygon)
-        if area < 500:  # Skip small areas (likely text or noise)
-            continue
+    Returns:
+        Tuple[str, str]: Path of the stored file and its hex digest.
+    """
+    digest = hashlib.sha256()
+    fd, part_path = tempfile.mkstemp(dir=UPLOAD_DIR, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while chunk := stream.read(UPLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        os.remove(part_path)
+        raise
 
-        if len(polygon) < 4:  # Skip shapes that are not polygonal
-            continue
+    extension = os.path.splitext(filename or "")[1].lower()
+    if not extension[1:].isalnum():
+        extension = ""
+    content_hash = digest.hexdigest()
+    file_path = os.path.join(UPLOAD_DIR, content_hash + extension)
+    os.replace(part_path, file_path)
+    return file_path, content_hash
 
-        x, y, w, h = cv2.boundingRect(polygon)
 
-        # ✅ Aspect ratio filtering
-        aspect_ratio = w / h if h != 0 else 0
-        if aspect_ratio < 0.5 or aspect_ratio > 2.0:
-            continue  # Skip very tall or very wide shapes
+def queue_upload(filename: str, file_path: str, content_hash: str) -> dict:
+    """
+    Submit a stored upload and report its job.
 
-        # Optionally skip near-square contours that are too small
-        if w < 50 or h < 50:
-            continue
+    Args:
+        filename (str): Client file name.
+        file_path (str): Path of the stored file.
+        content_hash (str): SHA-256 digest of the file.
 
-        roi = image[y : y + h, x : x + w]
-        text = pytesseract.image_to_string(roi, config="--psm 6")
+    Returns:
+        dict: Job status ("done" when the same layout was processed before)
+        and job ID.
+    """
+    job_id = job_queue.submit(filename, file_path, content_hash)
+    return {"status": job_queue.get(job_id)["status"], "job_id": job_id}
 
-        plots.append(
-            {
-                "plot_number": f"Plot_{i}",
-                "raw_text": text.strip(),
-                "polygon_coordinates": polygon[:, 0].tolist(),
-            }
-        )
 
-    global plot_data
-    plot_data = plots
+@app.post("/upload/", status_code=status.HTTP_202_ACCEPTED)
+async def upload_image(file: UploadFile = File(...)):
+    # Disk and SQLite work runs in the threadpool, off the event loop
+    file_path, content_hash = await run_in_threadpool(
+        save_upload, file.file, file.filename
+    )
+    return await run_in_threadpool(queue_upload, file.filename, file_path, content_hash)
+
 
-    return {"status": "success", "num_plots": len(plots)}
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/jobs/{job_id}/plots")
+def get_job_plots(job_id: str):
+    plots = job_queue.plots(job_id)
+    if plots is None:
+        raise HTTPException(status_code=404, detail="No finished job with this ID")
+    return JSONResponse(content=plots)
 
 
 @app.get("/plots/")
 def get_plots():
-    return JSONResponse(content=plot_data)
+    # Plots of the most recently finished upload
+    return JSONResponse(content=job_queue.plots() or [])
+
+
+@app.get("/cache/stats")
+def get_cache_stats():
+    # Entries, bytes and hit rate of the layout and plot caches
+    return job_queue.cache.stats()
 
 
 @app.get("/")
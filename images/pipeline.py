@@ -0,0 +1,357 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+import pytesseract
+
+from cache import OcrCache
+
+# Each Tesseract call gets one core; parallelism comes from running several
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+# Concurrent Tesseract processes per layout
+OCR_THREADS = int(os.getenv("OCR_THREADS", str(os.cpu_count() or 1)))
+# OCR many plots per Tesseract call by tiling them into one composite image
+OCR_TILE = os.getenv("OCR_TILE", "false").lower() in ("1", "true", "yes")
+# Plots per composite image and the composite's maximum width in pixels
+OCR_TILE_BATCH = int(os.getenv("OCR_TILE_BATCH", "64"))
+OCR_TILE_WIDTH = int(os.getenv("OCR_TILE_WIDTH", "2400"))
+# White margin around each tile so neighbouring plots' text never merges
+TILE_PADDING = 24
+# Longest side of the copy contours are detected on; OCR uses full resolution
+DETECT_MAX_SIDE = int(os.getenv("DETECT_MAX_SIDE", "4096"))
+# Tesseract setup the cached texts were produced with
+OCR_MODE = "tiled psm 11" if OCR_TILE else "psm 6"
+
+# Called with (plots OCRed, total plots) while a layout is processed
+ProgressCallback = Callable[[int, int], None]
+# Bounding box as x, y, width, height
+Box = Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class ContourFilter:
+    """
+    Thresholds a contour must meet to be treated as a plot.
+
+    Attributes:
+        epsilon (float): Polygon approximation tolerance, as a fraction of
+            the contour perimeter.
+        min_area (float): Minimum polygon area (smaller is text or noise).
+        min_vertices (int): Minimum polygon vertices.
+        min_aspect (float): Minimum width / height ratio.
+        max_aspect (float): Maximum width / height ratio.
+        min_width (int): Minimum bounding box width.
+        min_height (int): Minimum bounding box height.
+    """
+
+    epsilon: float = float(os.getenv("PLOT_EPSILON", "0.02"))
+    min_area: float = float(os.getenv("PLOT_MIN_AREA", "500"))
+    min_vertices: int = int(os.getenv("PLOT_MIN_VERTICES", "4"))
+    min_aspect: float = float(os.getenv("PLOT_MIN_ASPECT", "0.5"))
+    max_aspect: float = float(os.getenv("PLOT_MAX_ASPECT", "2.0"))
+    min_width: int = int(os.getenv("PLOT_MIN_WIDTH", "50"))
+    min_height: int = int(os.getenv("PLOT_MIN_HEIGHT", "50"))
+
+
+def shape_geometry(shapes: Sequence[np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Compute vertex counts, bounding boxes and areas of many shapes at once.
+
+    The points of all shapes are concatenated and reduced per shape, which
+    matches `cv2.boundingRect` and `cv2.contourArea` without a Python loop.
+
+    Args:
+        shapes (Sequence[np.ndarray]): Non-empty OpenCV point arrays.
+
+    Returns:
+        Dict[str, np.ndarray]: `vertices`, `left`, `top`, `width`, `height`
+        and `area`, one entry per shape.
+    """
+    counts = np.fromiter(map(len, shapes), dtype=np.intp, count=len(shapes))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    points = np.concatenate(shapes).reshape(-1, 2).astype(np.int64)
+    x, y = points[:, 0], points[:, 1]
+
+    left = np.minimum.reduceat(x, starts)
+    top = np.minimum.reduceat(y, starts)
+    width = np.maximum.reduceat(x, starts) - left + 1
+    height = np.maximum.reduceat(y, starts) - top + 1
+
+    # Shoelace formula, pairing each point with the next one of its shape
+    following = np.arange(1, len(points) + 1)
+    following[starts + counts - 1] = starts
+    cross = x * y[following] - x[following] * y
+    area = np.abs(np.add.reduceat(cross, starts)) / 2
+
+    return {
+        "vertices": counts,
+        "left": left,
+        "top": top,
+        "width": width,
+        "height": height,
+        "area": area,
+    }
+
+
+def select_plots(
+    contours: Sequence[np.ndarray], limits: ContourFilter = ContourFilter()
+) -> List[Tuple[int, np.ndarray, Box]]:
+    """
+    Pick the contours that look like plots and approximate them as polygons.
+
+    A polygon's vertices are a subset of its contour's points, so its box,
+    and therefore its area, is never larger than the contour's box. Contours
+    whose box is already too small are dropped before the per-contour
+    `cv2.approxPolyDP`; the remaining polygons are filtered as arrays.
+
+    Args:
+        contours (Sequence[np.ndarray]): Contours from `cv2.findContours`.
+        limits (ContourFilter): Filter thresholds.
+
+    Returns:
+        List[Tuple[int, np.ndarray, Box]]: Contour index, polygon and
+        bounding box of each plot.
+    """
+    if not contours:
+        return []
+    outer = shape_geometry(contours)
+    candidates = np.flatnonzero(
+        (outer["width"] >= limits.min_width)
+        & (outer["height"] >= limits.min_height)
+        & (outer["width"] * outer["height"] >= limits.min_area)
+    )
+    if not len(candidates):
+        return []
+
+    polygons = []
+    for i in candidates:
+        epsilon = limits.epsilon * cv2.arcLength(contours[i], True)
+        polygons.append(cv2.approxPolyDP(contours[i], epsilon, True))
+
+    shape = shape_geometry(polygons)
+    aspect = shape["width"] / shape["height"]
+    keep = (
+        (shape["area"] >= limits.min_area)
+        & (shape["vertices"] >= limits.min_vertices)
+        & (aspect >= limits.min_aspect)
+        & (aspect <= limits.max_aspect)
+        & (shape["width"] >= limits.min_width)
+        & (shape["height"] >= limits.min_height)
+    )
+    return [
+        (
+            int(candidates[j]),
+            polygons[j],
+            (
+                int(shape["left"][j]),
+                int(shape["top"][j]),
+                int(shape["width"][j]),
+                int(shape["height"][j]),
+            ),
+        )
+        for j in np.flatnonzero(keep)
+    ]
+
+
+def _ocr_roi(roi: np.ndarray) -> str:
+    return pytesseract.image_to_string(roi, config="--psm 6").strip()
+
+
+def _tile(rois: Sequence[np.ndarray]) -> Tuple[np.ndarray, List[Box]]:
+    """Pack ROIs row by row onto a white canvas; return it and the tile boxes."""
+    boxes: List[Box] = []
+    x = y = row_height = 0
+    for roi in rois:
+        h, w = roi.shape[:2]
+        if x and x + w + 2 * TILE_PADDING > OCR_TILE_WIDTH:
+            x, y, row_height = 0, y + row_height, 0
+        boxes.append((x + TILE_PADDING, y + TILE_PADDING, w, h))
+        x += w + 2 * TILE_PADDING
+        row_height = max(row_height, h + 2 * TILE_PADDING)
+
+    width = max(bx + w + TILE_PADDING for bx, _, w, _ in boxes)
+    canvas = np.full((y + row_height, width) + rois[0].shape[2:], 255, np.uint8)
+    for roi, (bx, by, w, h) in zip(rois, boxes):
+        canvas[by : by + h, bx : bx + w] = roi
+    return canvas, boxes
+
+
+def _ocr_tiled(rois: Sequence[np.ndarray]) -> List[str]:
+    """OCR ROIs in one Tesseract call and map the words back to their tile."""
+    canvas, boxes = _tile(rois)
+    data = pytesseract.image_to_data(
+        canvas, config="--psm 11", output_type=pytesseract.Output.DICT
+    )
+    lines: List[Dict[Tuple[int, int, int], List[str]]] = [{} for _ in rois]
+    for i, word in enumerate(data["text"]):
+        if not word.strip():
+            continue
+        cx = data["left"][i] + data["width"][i] / 2
+        cy = data["top"][i] + data["height"][i] / 2
+        for tile, (bx, by, w, h) in enumerate(boxes):
+            if bx <= cx < bx + w and by <= cy < by + h:
+                line = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+                lines[tile].setdefault(line, []).append(word)
+                break
+    return ["\n".join(" ".join(words) for words in tile.values()) for tile in lines]
+
+
+def _ocr_all(
+    rois: Sequence[np.ndarray], on_progress: Optional[ProgressCallback] = None
+) -> List[str]:
+    texts: List[str] = []
+    with ThreadPoolExecutor(max_workers=OCR_THREADS) as executor:
+        if OCR_TILE:
+            batches = [
+                rois[start : start + OCR_TILE_BATCH]
+                for start in range(0, len(rois), OCR_TILE_BATCH)
+            ]
+            results = executor.map(_ocr_tiled, batches)
+        else:
+            results = ([text] for text in executor.map(_ocr_roi, rois))
+        for batch_texts in results:
+            texts.extend(batch_texts)
+            if on_progress:
+                on_progress(len(texts), len(rois))
+    return texts
+
+
+def roi_key(roi: np.ndarray) -> str:
+    """Cache key of a plot crop: its pixels, shape and the OCR mode."""
+    digest = hashlib.sha256(f"{roi.shape}:{OCR_MODE}".encode())
+    digest.update(np.ascontiguousarray(roi).data)
+    return digest.hexdigest()
+
+
+def layout_key(content_hash: str, limits: ContourFilter = ContourFilter()) -> str:
+    """Cache key of a layout's plots: its file digest and every setting used."""
+    settings = repr((limits, DETECT_MAX_SIDE, OCR_MODE))
+    return hashlib.sha256(f"{content_hash}:{settings}".encode()).hexdigest()
+
+
+def ocr_rois(
+    rois: Sequence[np.ndarray],
+    on_progress: Optional[ProgressCallback] = None,
+    cache: Optional[OcrCache] = None,
+) -> List[str]:
+    """
+    OCR plot crops with up to `OCR_THREADS` Tesseract processes at once.
+
+    Tesseract runs as a subprocess, so a thread pool is enough to keep
+    every core busy. With `OCR_TILE` the crops are OCRed `OCR_TILE_BATCH`
+    at a time from composite images instead of one call per crop. With a
+    cache, crops whose pixels were OCRed before are not OCRed again, so an
+    edited layout only pays for the plots that changed.
+
+    Args:
+        rois (Sequence[np.ndarray]): Plot crops of the layout image.
+        on_progress (Optional[ProgressCallback]): Progress callback.
+        cache (Optional[OcrCache]): Cache of texts keyed by `roi_key`.
+
+    Returns:
+        List[str]: The text of each crop, in order.
+    """
+    if cache is None:
+        return _ocr_all(rois, on_progress)
+
+    keys = [roi_key(roi) for roi in rois]
+    cached = {
+        key: json.loads(text) for key, text in cache.get_many("rois", keys).items()
+    }
+    # Identical crops share a key, so each distinct one is OCRed once
+    missing = {key: roi for key, roi in zip(keys, rois) if key not in cached}
+
+    def progress(done: int, total: int) -> None:
+        if on_progress:
+            on_progress(len(rois) - total + done, len(rois))
+
+    texts = _ocr_all(list(missing.values()), progress)
+    cache.set_many("rois", {key: json.dumps(text) for key, text in zip(missing, texts)})
+    cached.update(zip(missing, texts))
+    return [cached[key] for key in keys]
+
+
+def load_image(image_path: str) -> np.ndarray:
+    """
+    Decode a layout as grayscale straight from a memory map of the file.
+
+    Grayscale is all edge detection and Tesseract use, and a third of the
+    size of a colour decode of a large scan.
+    """
+    if not os.path.getsize(image_path):
+        raise ValueError(f"Could not decode image: {image_path}")
+    data = np.memmap(image_path, dtype=np.uint8, mode="r")
+    image = cv2.imdecode(data, cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        raise ValueError(f"Could not decode image: {image_path}")
+    return image
+
+
+def find_contours(image: np.ndarray) -> List[np.ndarray]:
+    """
+    Find outer contours on a copy of the image at most `DETECT_MAX_SIDE` wide.
+
+    Edge detection on a large scan is the costliest full-resolution step,
+    so it runs on a downscaled copy and the contours are scaled back to
+    full-resolution coordinates.
+
+    Args:
+        image (np.ndarray): Full-resolution grayscale image.
+
+    Returns:
+        List[np.ndarray]: Contours in full-resolution pixel coordinates.
+    """
+    scale = min(1.0, DETECT_MAX_SIDE / max(image.shape[:2]))
+    if scale < 1.0:
+        image = cv2.resize(
+            image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+        )
+    blurred = cv2.GaussianBlur(image, (5, 5), 0)
+    edged = cv2.Canny(blurred, 50, 150)
+
+    contours, _ = cv2.findContours(edged, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if scale < 1.0:
+        contours = [np.rint(contour / scale).astype(np.int32) for contour in contours]
+    return list(contours)
+
+
+def extract_plots(
+    image_path: str,
+    on_progress: Optional[ProgressCallback] = None,
+    limits: ContourFilter = ContourFilter(),
+    cache: Optional[OcrCache] = None,
+) -> List[dict]:
+    """
+    Detect plot outlines in a layout image and OCR the text inside each one.
+
+    Args:
+        image_path (str): Path of the uploaded layout image.
+        on_progress (Optional[ProgressCallback]): Progress callback.
+        limits (ContourFilter): Thresholds deciding which contours are plots.
+        cache (Optional[OcrCache]): Cache of plot texts, see `ocr_rois`.
+
+    Returns:
+        List[dict]: One entry per plot with its number, text and polygon.
+    """
+    image = load_image(image_path)
+    contours = find_contours(image)
+    candidates = [
+        (i, polygon, image[y : y + h, x : x + w])
+        for i, polygon, (x, y, w, h) in select_plots(contours, limits)
+    ]
+
+    texts = ocr_rois([roi for _, _, roi in candidates], on_progress, cache)
+    return [
+        {
+            "plot_number": f"Plot_{i}",
+            "raw_text": text,
+            "polygon_coordinates": polygon[:, 0].tolist(),
+        }
+        for (i, polygon, _), text in zip(candidates, texts)
+    ]
@@ -0,0 +1,20 @@
+"""
+Fixtures for the layout extraction service tests.
+
+The service imports its modules as top-level siblings (it runs from the
+images directory), so that directory is put on the import path.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    from cache import OcrCache
+
+    return OcrCache(str(tmp_path / "cache.sqlite3"))
@@ -0,0 +1,133 @@
+import os
+import sqlite3
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import jobs
+from jobs import JobQueue, run_job
+
+
+@pytest.fixture
+def queue(tmp_path, cache, monkeypatch):
+    """A job queue whose submissions are recorded instead of run."""
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), workers=1, cache=cache)
+    queue.submitted = []
+    monkeypatch.setattr(queue, "_run", lambda *args: queue.submitted.append(args[0]))
+    yield queue
+    queue.shutdown()
+
+
+def _insert(db_path, job_id, status, updated_at, attempts=1, owner="1-old"):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, filename, image_path, content_hash, status,"
+            " owner, attempts, created_at, updated_at)"
+            " VALUES (?, 'a.png', 'a.png', 'hash', ?, ?, ?, ?, ?)",
+            (job_id, status, owner, attempts, updated_at, updated_at),
+        )
+
+
+def _status(db_path, job_id):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            "SELECT status FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()[0]
+
+
+def test_start_requeues_only_expired_leases(queue):
+    expired = time.time() - jobs.OCR_JOB_LEASE - 1
+    _insert(queue.db_path, "expired", "running", expired)
+    _insert(queue.db_path, "exhausted", "running", expired, attempts=2)
+    _insert(queue.db_path, "alive", "running", time.time())
+    _insert(queue.db_path, "waiting", "queued", expired, attempts=0, owner=None)
+
+    queue.start()
+
+    assert queue.submitted == ["expired", "waiting"]
+    assert _status(queue.db_path, "expired") == "queued"
+    assert _status(queue.db_path, "exhausted") == "failed"
+    assert _status(queue.db_path, "alive") == "running"
+
+
+def test_broken_pool_requeues_running_jobs_once(queue):
+    _insert(queue.db_path, "job", "running", time.time())
+    crashed = Future()
+    crashed.set_exception(BrokenProcessPool("worker died"))
+
+    queue._record_crash("job", "a.png", "hash", crashed)
+
+    assert _status(queue.db_path, "job") == "queued"
+    assert queue.submitted == ["job"]
+
+    with sqlite3.connect(queue.db_path) as conn:
+        conn.execute("UPDATE jobs SET status = 'running', attempts = 2")
+    queue._record_crash("job", "a.png", "hash", crashed)
+
+    assert _status(queue.db_path, "job") == "failed"
+    assert queue.submitted == ["job"]
+
+
+def test_worker_heartbeat_renews_the_lease(queue, cache, monkeypatch):
+    _insert(queue.db_path, "job", "queued", 0, attempts=0, owner=None)
+    monkeypatch.setattr(jobs, "HEARTBEAT_INTERVAL", 0.05)
+    seen = []
+
+    def slow_extract(image_path, on_progress, cache):
+        # A long step that reports no progress
+        for _ in range(3):
+            time.sleep(0.1)
+            with sqlite3.connect(queue.db_path) as conn:
+                seen.append(conn.execute("SELECT updated_at FROM jobs").fetchone()[0])
+        return []
+
+    monkeypatch.setattr(jobs, "extract_plots", slow_extract)
+    run_job(queue.db_path, "job", "a.png", "hash", cache)
+
+    assert seen == sorted(seen) and len(set(seen)) == 3
+    assert _status(queue.db_path, "job") == "done"
+
+
+def test_worker_that_lost_its_lease_does_not_overwrite(queue, cache, monkeypatch):
+    _insert(queue.db_path, "job", "queued", 0, attempts=0, owner=None)
+
+    def taken_over(image_path, on_progress, cache):
+        with sqlite3.connect(queue.db_path) as conn:
+            conn.execute("UPDATE jobs SET owner = 'someone-else'")
+        return []
+
+    monkeypatch.setattr(jobs, "extract_plots", taken_over)
+    run_job(queue.db_path, "job", "a.png", "hash", cache)
+
+    assert _status(queue.db_path, "job") == "running"
+
+
+def _die(image_path, on_progress, cache):
+    os._exit(1)
+
+
+def test_crashing_job_fails_after_its_retry(tmp_path, cache, monkeypatch):
+    # Forked workers inherit the patched pipeline
+    monkeypatch.setattr(jobs, "extract_plots", _die)
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), workers=1, cache=cache)
+    queue.start()
+    try:
+        job_id = queue.submit("a.png", "a.png", "hash")
+        deadline = time.time() + 20
+        while _status(queue.db_path, job_id) != "failed" and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        queue.shutdown()
+
+    job = queue.get(job_id)
+    assert job["status"] == "failed"
+    assert _job_attempts(queue.db_path, job_id) == jobs.MAX_ATTEMPTS
+
+
+def _job_attempts(db_path, job_id):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            "SELECT attempts FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()[0]
@@ -0,0 +1,84 @@
+import importlib
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import jobs
+import pipeline
+from jobs import JobQueue
+
+PLOTS = [{"plot_number": "1", "x": 0, "y": 0, "w": 10, "h": 10}]
+
+
+@pytest.fixture
+def client(tmp_path, cache, monkeypatch):
+    """The upload API running in `tmp_path`, with a one-worker job queue."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "static").mkdir()
+    (tmp_path / "uploads").mkdir()
+    main = importlib.import_module("main")
+    monkeypatch.setattr(
+        main, "job_queue", JobQueue(str(tmp_path / "jobs.sqlite3"), 1, cache)
+    )
+    with TestClient(main.app) as client:
+        yield client
+
+
+def _extract_counting_runs(image_path, on_progress, cache):
+    # Workers are forked, so runs are counted in a file
+    with open("extractions", "a") as f:
+        f.write(image_path + "\n")
+    return PLOTS
+
+
+def _wait_until_finished(client, job_id):
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.05)
+    pytest.fail(f"Job {job_id} did not finish")
+
+
+def test_reupload_is_answered_from_the_layout_cache(client, monkeypatch):
+    monkeypatch.setattr(jobs, "extract_plots", _extract_counting_runs)
+    layout = ("layout.png", b"the same layout bytes", "image/png")
+
+    first = client.post("/upload/", files={"file": layout}).json()
+    assert first["status"] == "queued"
+    assert _wait_until_finished(client, first["job_id"])["status"] == "done"
+
+    started = time.perf_counter()
+    second = client.post("/upload/", files={"file": layout}).json()
+    elapsed = time.perf_counter() - started
+
+    assert second["status"] == "done"
+    assert client.get(f"/jobs/{second['job_id']}/plots").json() == PLOTS
+    assert elapsed < 0.5
+    with open("extractions") as f:
+        assert len(f.readlines()) == 1
+
+
+def test_edited_layout_only_ocrs_the_changed_plots(cache, monkeypatch):
+    ocred = []
+
+    def fake_ocr(roi):
+        ocred.append(roi)
+        return str(int(roi[0, 0]))
+
+    monkeypatch.setattr(pipeline, "_ocr_roi", fake_ocr)
+    monkeypatch.setattr(pipeline, "OCR_TILE", False)
+    rois = [np.full((20, 30), value, np.uint8) for value in range(10, 50)]
+
+    assert pipeline.ocr_rois(rois, cache=cache) == [str(v) for v in range(10, 50)]
+    assert len(ocred) == len(rois)
+
+    ocred.clear()
+    rois[7] = np.full((20, 30), 99, np.uint8)
+    texts = pipeline.ocr_rois(rois, cache=cache)
+
+    assert texts[7] == "99"
+    assert len(ocred) == 1
@@ -0,0 +1,125 @@
+"""
+Shared fixtures for the API tests.
+
+The tests run against a real PostgreSQL database configured through the same
+POSTGRES_* variables as the app. Every test starts by truncating all tables,
+so the database name must end in "_test". If it does not, or the database
+cannot be reached, the tests are skipped.
+"""
+
+import os
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+TEST_DB_SUFFIX = "_test"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Check the test database is safe to use and create the schema."""
+    if not (os.getenv("POSTGRES_DB") or "").endswith(TEST_DB_SUFFIX):
+        pytest.skip(f"POSTGRES_DB must name a database ending in {TEST_DB_SUFFIX}")
+
+    from app.config.database import engine
+
+    try:
+        with engine.connect():
+            pass
+    except OperationalError as e:
+        pytest.skip(f"Test database is unreachable: {e.orig}")
+
+    # Importing the app creates the tables
+    import app.main  # noqa: F401
+
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def clean_tables(database):
+    """Empty every table and cache before each test."""
+    from app.config.database import Base
+    from app.crud.dashboard import dashboard_cache
+    from app.crud.lookups import LOOKUP_TABLES
+
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with database.begin() as conn:
+        conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    dashboard_cache.invalidate()
+    for table in LOOKUP_TABLES:
+        table.invalidate()
+
+
+@pytest.fixture
+def db():
+    """A plain session on the test database."""
+    from app.config.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def seed(db):
+    """
+    Insert one role, designation, user, area, buyer and plot.
+
+    Returns:
+        dict: IDs of the inserted rows keyed by table.
+    """
+    from app.models.areas import Areas
+    from app.models.buyers import Buyers
+    from app.models.plots import Plots
+    from app.models.users import Designations, Roles, Users
+
+    role = Roles(name="admin")
+    designation = Designations(title="Manager")
+    area = Areas(name="North", city="Pune", state="MH")
+    db.add_all([role, designation, area])
+    db.flush()
+    user = Users(
+        username="admin",
+        email="admin@example.com",
+        hashed_password="x",
+        role_id=role.id,
+        designation_id=designation.id,
+    )
+    buyer = Buyers(name="Asha", contact="9000000000")
+    plot = Plots(area_id=area.id, price=Decimal("1000"), status="available")
+    db.add_all([user, buyer, plot])
+    db.commit()
+    return {
+        "role": role.id,
+        "designation": designation.id,
+        "user": user.id,
+        "area": area.id,
+        "buyer": buyer.id,
+        "plot": plot.id,
+    }
+
+
+@pytest.fixture(scope="session")
+def client(database):
+    """
+    A TestClient shared by all tests, authenticated as an admin.
+
+    One client is kept for the session because the asyncio engine's pooled
+    connections are bound to the client's event loop.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.auth.auth import get_current_user
+    from app.auth.currentuser import CurrentUser
+    from app.main import app
+
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(
+        user_id=1, username="admin", role="admin"
+    )
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
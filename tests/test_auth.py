@@ -0,0 +1,47 @@
+import jwt
+from sqlalchemy import delete, update
+
+from app.auth.auth import ALGORITHM, SECRET_KEY, create_refresh_token
+from app.models.users import Roles, Users
+
+
+def _refresh_token(seed):
+    return create_refresh_token(
+        {"sub": "admin", "role": "admin", "user_id": seed["user"]}
+    )
+
+
+def test_refresh_issues_tokens_for_the_current_role(client, db, seed):
+    manager = Roles(name="manager")
+    db.add(manager)
+    db.flush()
+    db.execute(update(Users).values(role_id=manager.id))
+    db.commit()
+
+    response = client.post(
+        "/auth/refresh", json={"refresh_token": _refresh_token(seed)}
+    )
+
+    assert response.status_code == 200
+    claims = jwt.decode(
+        response.json()["access_token"], SECRET_KEY, algorithms=[ALGORITHM]
+    )
+    assert claims["role"] == "manager"
+    assert claims["user_id"] == seed["user"]
+
+
+def test_refresh_rejects_a_deleted_user(client, db, seed):
+    token = _refresh_token(seed)
+    db.execute(delete(Users))
+    db.commit()
+
+    response = client.post("/auth/refresh", json={"refresh_token": token})
+
+    assert response.status_code == 401
+
+
+def test_refresh_token_is_single_use(client, seed):
+    body = {"refresh_token": _refresh_token(seed)}
+
+    assert client.post("/auth/refresh", json=body).status_code == 200
+    assert client.post("/auth/refresh", json=body).status_code == 401
@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.models.areas import Areas
+from app.models.plots import Plots
+
+
+def _plot(area_id, **fields):
+    return {"area_id": area_id, "price": "1500", **fields}
+
+
+def test_bulk_create_checks_areas_and_images(client, db, seed):
+    unnamed = Areas(name=None)
+    db.add(unnamed)
+    db.commit()
+
+    response = client.post(
+        "/plots/bulk",
+        json=[
+            _plot(seed["area"], status="available"),
+            _plot(unnamed.id),
+            _plot(9999),
+            _plot(seed["area"], image_id=9999),
+        ],
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["succeeded"] == 2
+    details = [item["detail"] for item in result["items"]]
+    assert details == [None, None, "Area not found: 9999", "Image not found: 9999"]
+    created = [item["id"] for item in result["items"][:2]]
+    areas = db.execute(
+        select(Plots.id, Plots.area_id).where(Plots.id.in_(created)).order_by(Plots.id)
+    ).all()
+    assert [area_id for _, area_id in areas] == [seed["area"], unnamed.id]
+
+
+def test_bulk_update_writes_each_field_group(client, db, seed):
+    second = Plots(area_id=seed["area"], price=Decimal("2000"), status="available")
+    db.add(second)
+    db.commit()
+
+    response = client.patch(
+        "/plots/bulk",
+        json=[
+            {"id": seed["plot"], "price": "1100"},
+            {"id": second.id, "price": "2100", "status": "sold"},
+            {"id": seed["plot"], "price": "1200"},
+            {"id": 9999, "price": "1"},
+            {"id": second.id, "price": "1", "image_id": 9999},
+        ],
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["succeeded"] == 2
+    assert [item["detail"] for item in result["items"]] == [
+        None,
+        None,
+        f"Duplicate plot ID in request: {seed['plot']}",
+        "Plot not found",
+        f"Duplicate plot ID in request: {second.id}",
+    ]
+    rows = {
+        plot.id: plot
+        for plot in db.scalars(select(Plots).execution_options(populate_existing=True))
+    }
+    assert rows[seed["plot"]].price == Decimal("1100")
+    assert rows[seed["plot"]].status == "available"
+    assert rows[second.id].price == Decimal("2100")
+    assert rows[second.id].status == "sold"
+    assert rows[second.id].updated_by == "admin"
@@ -0,0 +1,25 @@
+from app.crud.users import _insert_user_batch
+from app.schemas.users import BulkUserError
+
+
+def _row(seed, username, email):
+    return {
+        "username": username,
+        "email": email,
+        "hashed_password": "x",
+        "role_id": seed["role"],
+        "designation_id": seed["designation"],
+    }
+
+
+def test_rejected_rows_do_not_leak_database_errors(db, seed):
+    batch = [
+        (0, _row(seed, "clerk", "clerk@example.com")),
+        (1, _row(seed, "admin2", "admin@example.com")),
+    ]
+    errors: list[BulkUserError] = []
+
+    assert _insert_user_batch(db, batch, errors) == 1
+
+    assert [(e.index, e.username) for e in errors] == [(1, "admin2")]
+    assert errors[0].detail == "Username or email already exists"
@@ -0,0 +1,52 @@
+import pytest
+
+CHECKOUTS = "X-DB-Checkouts"
+
+
+@pytest.mark.parametrize(
+    "method, path, body",
+    [
+        ("GET", "/plots/", None),
+        ("GET", "/plots/{plot}", None),
+        ("PUT", "/plots/{plot}", {"price": "1200"}),
+        ("POST", "/plots/", {"area_id": "{area}", "price": "900"}),
+        ("GET", "/buyers/", None),
+        ("GET", "/buyers/{buyer}", None),
+        ("GET", "/sales/", None),
+        ("GET", "/payments/", None),
+        ("GET", "/users/{user}", None),
+        ("GET", "/dashboard/summary", None),
+        ("GET", "/system/pool", None),
+    ],
+)
+def test_routes_use_at_most_one_connection(client, seed, method, path, body):
+    if body is not None:
+        body = {key: value.format(**seed) for key, value in body.items()}
+
+    response = client.request(method, path.format(**seed), json=body)
+
+    assert response.status_code < 300
+    assert int(response.headers[CHECKOUTS]) <= 1
+
+
+def test_cached_dashboard_routes_make_no_checkout(client, seed):
+    first = client.get("/dashboard/total-sales")
+    second = client.get("/dashboard/total-sales")
+
+    assert first.headers[CHECKOUTS] == "1"
+    assert second.headers[CHECKOUTS] == "0"
+    assert second.json() == first.json()
+
+
+def test_rejected_requests_make_no_checkout(client, seed):
+    response = client.post("/plots/", json={"price": "not a number"})
+
+    assert response.status_code == 422
+    assert response.headers[CHECKOUTS] == "0"
+
+
+def test_streamed_exports_carry_no_checkout_count(client, seed):
+    response = client.get("/buyers/export")
+
+    assert response.status_code == 200
+    assert CHECKOUTS not in response.headers
@@ -0,0 +1,65 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.auth.currentuser import CurrentUser
+from app.core.cache import QueryCache
+from app.crud.dashboard import dashboard_cache, remaining_inventory, total_sales_amount
+from app.crud.plots import update_plot
+from app.crud.sales import create_sale
+from app.schemas.plots import PlotUpdate
+from app.schemas.sales import SalesBase
+
+ADMIN = CurrentUser(user_id=1, username="admin", role="admin")
+
+
+def _counters():
+    stats = dashboard_cache.stats()
+    return stats["hits"], stats["misses"]
+
+
+def test_create_sale_invalidates_cached_totals(db, seed):
+    assert total_sales_amount(db) == 0.0
+    assert total_sales_amount(db) == 0.0
+    hits, misses = _counters()
+
+    sale = SalesBase(
+        plot_id=seed["plot"],
+        associate_id=seed["user"],
+        buyer_id=seed["buyer"],
+        sale_amount=Decimal("5000"),
+        payment_timeframe=datetime(2024, 6, 1),
+        sale_date=date(2024, 5, 1),
+    )
+    create_sale(db, sale, ADMIN)
+
+    assert float(total_sales_amount(db)) == 5000.0
+    assert _counters() == (hits, misses + 1)
+
+
+def test_update_plot_invalidates_cached_inventory(db, seed):
+    assert remaining_inventory(db) == 1
+    assert remaining_inventory(db) == 1
+    hits, misses = _counters()
+
+    update_plot(db, seed["plot"], PlotUpdate(price=Decimal("1000"), status="sold"), "a")
+
+    assert remaining_inventory(db) == 0
+    assert _counters() == (hits, misses + 1)
+
+
+def test_result_of_a_read_overlapping_a_write_is_not_stored():
+    cache = QueryCache("overlap", ttl=60)
+    calls = []
+
+    @cache.cached
+    def query(db):
+        # Read at generation N, then a write commits before it is stored
+        calls.append(db)
+        if len(calls) == 1:
+            cache.invalidate()
+        return len(calls)
+
+    assert query("first") == 1
+    assert query("second") == 2
+    assert query("third") == 2
+    assert cache.stats()["entries"] == 1
@@ -0,0 +1,70 @@
+import json
+import tracemalloc
+
+import pytest
+from sqlalchemy import text
+
+from app.crud.buyers import export_buyers_stmt
+from app.crud.export import (
+    COLUMNAR_BATCH_SIZE,
+    EXPORT_BATCH_SIZE,
+    stream_columnar,
+    stream_export,
+)
+
+BUYERS = 5 * COLUMNAR_BATCH_SIZE
+
+
+@pytest.fixture
+def many_buyers(database):
+    with database.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO buyers (name, contact, address, is_deleted, create_dt,"
+                " update_dt) SELECT 'Buyer ' || n, '9' || lpad(n::text, 9, '0'),"
+                " repeat('x', 60), false, now(), now()"
+                " FROM generate_series(1, :n) AS n"
+            ),
+            {"n": BUYERS},
+        )
+
+
+def _peak_while_streaming(chunks):
+    """Consume `chunks`, returning the bytes produced and the peak traced memory."""
+    total = 0
+    tracemalloc.start()
+    try:
+        for chunk in chunks:
+            total += len(chunk)
+        return total, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize(
+    "stream, fmt, batch_size",
+    [
+        (stream_export, "ndjson", EXPORT_BATCH_SIZE),
+        (stream_export, "csv", EXPORT_BATCH_SIZE),
+        (stream_columnar, "parquet", COLUMNAR_BATCH_SIZE),
+        (stream_columnar, "arrow", COLUMNAR_BATCH_SIZE),
+    ],
+)
+def test_export_memory_does_not_grow_with_the_row_count(
+    many_buyers, stream, fmt, batch_size
+):
+    stmt = export_buyers_stmt()
+    few_bytes, few_peak = _peak_while_streaming(stream(stmt.limit(2 * batch_size), fmt))
+    all_bytes, all_peak = _peak_while_streaming(stream(stmt, fmt))
+
+    assert all_bytes > 2 * few_bytes
+    assert all_peak < 1.5 * few_peak
+
+
+def test_export_endpoint_streams_every_row(client, many_buyers):
+    with client.stream("GET", "/buyers/export") as response:
+        assert response.status_code == 200
+        lines = list(response.iter_lines())
+
+    assert len(lines) == BUYERS
+    assert json.loads(lines[-1])["name"] == f"Buyer {BUYERS}"
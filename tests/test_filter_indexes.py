@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import inspect, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.config.database import Base
+from app.crud.buyers import BUYER_FILTERS
+from app.crud.filters import apply_filters
+from app.crud.payments import PAYMENT_FILTERS
+from app.crud.plots import PLOT_FILTERS
+from app.crud.sales import SALES_FILTERS
+from app.models.buyers import Buyers
+from app.models.payments import Payments
+from app.models.plots import Plots
+from app.models.sales import Sales
+from app.schemas.buyers import BuyersFilter
+from app.schemas.payments import PaymentFilter
+from app.schemas.plots import PlotFilter
+from app.schemas.sales import SalesFilter
+
+
+def _plan(db, stmt) -> str:
+    sql = stmt.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    # The test tables are tiny, so make the planner use any usable index
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    return "\n".join(db.scalars(text(f"EXPLAIN {sql}")))
+
+
+@pytest.mark.parametrize(
+    "model, spec, filters, index",
+    [
+        (Sales, SALES_FILTERS, SalesFilter(buyer_id=[1, 2]), "ix_sales_buyer_id"),
+        (Sales, SALES_FILTERS, SalesFilter(plot_id=[3]), "ix_sales_plot_id"),
+        (
+            Sales,
+            SALES_FILTERS,
+            SalesFilter(sale_date_from="2024-01-01"),
+            "ix_sales_sale_date",
+        ),
+        (Payments, PAYMENT_FILTERS, PaymentFilter(sale_id=[1]), "ix_payments_sale_id"),
+        (Plots, PLOT_FILTERS, PlotFilter(status=["sold"]), "ix_plots_status"),
+        (Plots, PLOT_FILTERS, PlotFilter(area_id=[1]), "ix_plots_area_id"),
+        (Buyers, BUYER_FILTERS, BuyersFilter(name="As_"), "ix_buyers_name_lower"),
+        (
+            Buyers,
+            BUYER_FILTERS,
+            BuyersFilter(contact="900"),
+            "ix_buyers_contact_lower",
+        ),
+    ],
+)
+def test_filters_use_their_index(db, model, spec, filters, index):
+    stmt = apply_filters(select(model), filters, spec)
+
+    assert index in _plan(db, stmt)
+
+
+def test_create_all_adds_indexes_to_existing_tables(database):
+    with database.begin() as conn:
+        conn.execute(text("DROP INDEX ix_sales_buyer_id"))
+        conn.execute(text("DROP INDEX ix_buyers_name_lower"))
+
+    Base.metadata.create_all(bind=database)
+
+    indexes = {
+        index["name"]
+        for table in ("sales", "buyers")
+        for index in inspect(database).get_indexes(table)
+    }
+    assert {"ix_sales_buyer_id", "ix_buyers_name_lower"} <= indexes
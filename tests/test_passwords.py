@@ -0,0 +1,21 @@
+import asyncio
+
+from app.core.passwords import (
+    _get_executor,
+    hash_passwords,
+    pwd_context,
+    verify_and_update_async,
+)
+
+
+def test_hashing_pool_spawns_its_workers():
+    assert _get_executor()._mp_context.get_start_method() == "spawn"
+
+
+def test_hashing_pool_hashes_and_verifies():
+    hashed = hash_passwords(["secret", "other"])
+
+    assert pwd_context.verify("secret", hashed[0])
+    assert pwd_context.verify("other", hashed[1])
+    assert asyncio.run(verify_and_update_async("secret", hashed[0])) == (True, None)
+    assert asyncio.run(verify_and_update_async("wrong", hashed[0]))[0] is False
@@ -0,0 +1,54 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.config.database import DATABASE_URL, ENGINE_OPTIONS
+from app.core.metrics import PoolMetrics
+
+
+def _small_engine(pool_timeout):
+    options = dict(ENGINE_OPTIONS, pool_size=2, max_overflow=0)
+    options["pool_timeout"] = pool_timeout
+    engine = create_engine(DATABASE_URL, **options)
+    return engine, PoolMetrics(engine)
+
+
+def _hold_connection(engine, seconds):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_sleep(:s)"), {"s": seconds})
+
+
+def test_saturated_pool_queues_checkouts_within_the_timeout():
+    engine, metrics = _small_engine(pool_timeout=5)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(_hold_connection, engine, 0.1) for _ in range(8)]
+            for future in futures:
+                future.result()
+
+        stats = metrics.snapshot()
+        assert stats["checkouts"] == stats["checkins"] == 8
+        assert stats["peak_checked_out"] == 2
+        assert stats["connects"] == 2
+        assert stats["checked_out"] == 0
+    finally:
+        engine.dispose()
+
+
+def test_checkout_fails_after_the_pool_timeout():
+    engine, metrics = _small_engine(pool_timeout=1)
+    try:
+        with engine.connect(), engine.connect():
+            started = time.monotonic()
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+            assert 1 <= time.monotonic() - started < 3
+
+        # The pool recovers once the connections are returned
+        _hold_connection(engine, 0)
+        assert metrics.snapshot()["checked_out"] == 0
+    finally:
+        engine.dispose()
@@ -0,0 +1,96 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
+
+from app.config.init_db import SEED_KEYS, ensure_seed_keys, seed_table
+from app.models.areas import Areas
+from app.models.plots import Plots
+from app.models.rollups import SalesAreaRollup
+from app.models.users import Designations, Roles, Users
+
+
+@pytest.fixture
+def without_seed_keys(database, db):
+    """Drop the unique keys, as on a database created before they existed."""
+    with database.begin() as conn:
+        for model, key in SEED_KEYS:
+            name = f"{model.__tablename__}_{key}_key"
+            conn.execute(
+                text(
+                    f"ALTER TABLE {model.__tablename__}"
+                    f" DROP CONSTRAINT IF EXISTS {name}"
+                )
+            )
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    yield
+    db.rollback()
+    ensure_seed_keys(db)
+    # Back to the schema create_all makes, for the other tests
+    with database.begin() as conn:
+        for model, key in SEED_KEYS:
+            name = f"{model.__tablename__}_{key}_key"
+            conn.execute(
+                text(
+                    f"ALTER TABLE {model.__tablename__}"
+                    f" ADD CONSTRAINT {name} UNIQUE USING INDEX {name}"
+                )
+            )
+
+
+def test_duplicates_are_merged_before_the_keys_are_added(db, seed, without_seed_keys):
+    role, designation, area = (
+        Roles(name="admin"),
+        Designations(title="Manager"),
+        (Areas(name="North")),
+    )
+    db.add_all([role, designation, area])
+    db.flush()
+    user = Users(
+        username="clerk",
+        email="clerk@example.com",
+        hashed_password="x",
+        role_id=role.id,
+        designation_id=designation.id,
+    )
+    plot = Plots(area_id=area.id, price=Decimal("10"), status="available")
+    rollup = SalesAreaRollup(area_id=area.id, total_revenue=Decimal("10"), sale_count=1)
+    db.add_all([user, plot, rollup])
+    db.commit()
+
+    ensure_seed_keys(db)
+
+    for model in (Roles, Designations, Areas):
+        assert db.scalar(select(func.count()).select_from(model)) == 1
+    db.refresh(user)
+    db.refresh(plot)
+    assert (user.role_id, user.designation_id) == (seed["role"], seed["designation"])
+    assert plot.area_id == seed["area"]
+    # No sales, so the rebuilt rollups are empty
+    assert db.scalar(select(func.count()).select_from(SalesAreaRollup)) == 0
+
+    db.add(Roles(name="admin"))
+    with pytest.raises(IntegrityError):
+        db.commit()
+
+
+def test_keys_are_added_once_and_back_the_seed_upserts(db, without_seed_keys):
+    ensure_seed_keys(db)
+    ensure_seed_keys(db)
+
+    assert seed_table(db, Roles, "name", [{"name": "admin"}]) == (1, 0)
+    assert seed_table(db, Roles, "name", [{"name": "admin"}]) == (0, 1)
+
+
+def test_keys_are_left_alone_where_the_constraints_exist(db, database):
+    ensure_seed_keys(db)
+
+    with database.connect() as conn:
+        indexes = conn.execute(
+            text("SELECT count(*) FROM pg_indexes WHERE indexname = 'roles_name_key'")
+        ).scalar()
+        constraints = conn.execute(
+            text("SELECT count(*) FROM pg_constraint WHERE conname = 'roles_name_key'")
+        ).scalar()
+    assert (indexes, constraints) == (1, 1)
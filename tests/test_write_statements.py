@@ -0,0 +1,135 @@
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.auth.currentuser import CurrentUser
+from app.crud.lookups import reload_lookups
+from app.crud.payments import create_payment
+from app.crud.sales import create_sale
+from app.schemas.payments import PaymentBase
+from app.schemas.sales import SalesBase
+
+ADMIN = CurrentUser(user_id=1, username="admin", role="admin")
+
+
+@contextmanager
+def recorded_statements(engine):
+    """Collect the SQL statements sent to the database through `engine`."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def ledger(db, seed):
+    """A sale with one payment, plus warm lookup caches."""
+    reload_lookups(db)
+    sale = create_sale(
+        db,
+        SalesBase(
+            plot_id=seed["plot"],
+            associate_id=seed["user"],
+            buyer_id=seed["buyer"],
+            sale_amount=Decimal("5000"),
+            payment_timeframe=datetime(2024, 6, 1),
+            sale_date=date(2024, 5, 1),
+        ),
+        ADMIN,
+    )
+    payment = create_payment(
+        db,
+        PaymentBase(
+            sale_id=sale.id,
+            amount_paid=Decimal("1000"),
+            payment_date=date(2024, 5, 2),
+            remaining_balance=Decimal("4000"),
+        ),
+        ADMIN,
+    )
+    return {**seed, "sale": sale.id, "payment": payment.id}
+
+
+# Plot, buyer and user writes are one INSERT/UPDATE ... RETURNING. Sale and
+# payment writes also upsert the dashboard rollups (a sale's area rollup
+# first reads the plot's area), updates first lock the row, and payment
+# writes move their sale's update_dt for the ledger export.
+@pytest.mark.parametrize(
+    "method, path, body, expected",
+    [
+        ("POST", "/plots/", {"area_id": "{area}", "price": "900"}, 1),
+        ("PUT", "/plots/{plot}", {"price": "1200", "status": "booked"}, 1),
+        ("POST", "/buyers/", {"name": "Ravi"}, 1),
+        ("PUT", "/buyers/{buyer}", {"name": "Asha K"}, 1),
+        (
+            "POST",
+            "/users/register",
+            {
+                "username": "new",
+                "email": "new@example.com",
+                "role": "admin",
+                "designation": "Manager",
+                "password": "secret",
+            },
+            1,
+        ),
+        (
+            "PUT",
+            "/users/{user}",
+            {
+                "username": "admin",
+                "email": "boss@example.com",
+                "role": "admin",
+                "designation": "Manager",
+                "password": "secret",
+            },
+            1,
+        ),
+        (
+            "POST",
+            "/sales/",
+            {
+                "plot_id": "{plot}",
+                "associate_id": "{user}",
+                "buyer_id": "{buyer}",
+                "sale_amount": "7000",
+                "payment_timeframe": "2024-07-01T00:00:00",
+                "sale_date": "2024-06-01",
+            },
+            5,
+        ),
+        ("PUT", "/sales/{sale}", {"payment_mode": "UPI"}, 2),
+        (
+            "POST",
+            "/payments/",
+            {
+                "sale_id": "{sale}",
+                "amount_paid": "500",
+                "payment_date": "2024-06-02",
+                "remaining_balance": "3500",
+            },
+            3,
+        ),
+        ("PUT", "/payments/{payment}", {"payment_mode": "Cash"}, 3),
+        ("PUT", "/payments/{payment}", {"remaining_balance": "3000"}, 5),
+        ("DELETE", "/payments/{payment}", None, 4),
+    ],
+)
+def test_write_statement_counts(client, database, ledger, method, path, body, expected):
+    if body is not None:
+        body = {key: value.format(**ledger) for key, value in body.items()}
+
+    with recorded_statements(database) as statements:
+        response = client.request(method, path.format(**ledger), json=body)
+
+    assert response.status_code < 300, response.text
+    assert len(statements) == expected, statements